@@ -0,0 +1,108 @@
+"""
+RootStatix Cuisine - Analytics
+Incrementally maintained feedback aggregates and streaming exports
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+RATINGS = (1, 2, 3, 4, 5)
+EXPORT_FIELDS = ('id', 'name', 'email', 'rating', 'comments', 'submitted_at')
+
+
+def normalize_rating(value):
+    """Return the rating as an int from 1 to 5, or None when missing or invalid"""
+    try:
+        rating = int(value)
+    except (TypeError, ValueError):
+        return None
+    return rating if rating in RATINGS else None
+
+
+def day_of(timestamp):
+    """ISO date of a datetime or ISO timestamp string"""
+    if isinstance(timestamp, datetime):
+        return timestamp.date().isoformat()
+    return str(timestamp)[:10]
+
+
+class FeedbackAggregates:
+    """Rating histogram, running mean and per-day counts, updated one entry at a time"""
+
+    def __init__(self):
+        self.total = 0
+        self.histogram = dict.fromkeys(RATINGS, 0)
+        # day -> {rating or None: count}
+        self.daily = {}
+
+    def add(self, day, rating, count=1):
+        """Fold `count` entries with the same day and rating into the aggregates"""
+        self.total += count
+        if rating is not None:
+            self.histogram[rating] += count
+        counts = self.daily.setdefault(day, {})
+        counts[rating] = counts.get(rating, 0) + count
+
+    def add_feedback(self, feedback):
+        """Fold one feedback dict into the aggregates"""
+        self.add(day_of(feedback['submitted_at']), normalize_rating(feedback.get('rating')))
+
+    @property
+    def rated(self):
+        return sum(self.histogram.values())
+
+    @property
+    def mean(self):
+        rated = self.rated
+        if not rated:
+            return None
+        return sum(rating * count for rating, count in self.histogram.items()) / rated
+
+    def summary(self):
+        """JSON-ready view of the aggregates"""
+        daily = []
+        for day in sorted(self.daily):
+            counts = self.daily[day]
+            rated = sum(count for rating, count in counts.items() if rating is not None)
+            total = sum(rating * count for rating, count in counts.items() if rating is not None)
+            daily.append({
+                'date': day,
+                'count': sum(counts.values()),
+                'mean_rating': round(total / rated, 3) if rated else None,
+            })
+        mean = self.mean
+        return {
+            'total': self.total,
+            'rated': self.rated,
+            'mean_rating': round(mean, 3) if mean is not None else None,
+            'histogram': {str(rating): count for rating, count in self.histogram.items()},
+            'daily': daily,
+        }
+
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_csv(rows):
+    """Yield a CSV document one line at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        writer.writerow([_export_value(row.get(field)) for field in EXPORT_FIELDS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, when there are no rows
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_ndjson(rows):
+    """Yield one JSON object per line"""
+    for row in rows:
+        yield json.dumps({field: _export_value(row.get(field)) for field in EXPORT_FIELDS},
+                         ensure_ascii=False) + '\n'
@@ -0,0 +1,194 @@
+"""
+RootStatix Cuisine - Asset Build Runner
+Runs asset jobs as a dependency graph on a process pool and skips jobs whose inputs are unchanged
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, '.asset-cache.json')
+
+
+class Job:
+    """One unit of asset work
+
+    `func` must be a module-level function so it can run in a worker process.
+    `inputs` are files whose contents feed the job, `outputs` the files it
+    writes, and `settings` any encoder options not already in `args`. The
+    source of `func`'s whole module is part of the cache key; `code` lists
+    other modules (or functions from them) the job calls into.
+    """
+
+    def __init__(self, name, func, args=(), kwargs=None, inputs=(), outputs=(), settings=None, deps=(),
+                 code=()):
+        self.name = name
+        self.func = func
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.settings = settings or {}
+        self.deps = tuple(deps)
+        self.code = tuple(code)
+
+
+_source_hashes = {}
+
+
+def _source_hash(obj):
+    """Hash of the source of the module a function (or module) comes from
+
+    The whole module, not just the function: editing a helper or a constant
+    the job uses must invalidate its outputs too.
+    """
+    module = obj if inspect.ismodule(obj) else sys.modules.get(obj.__module__)
+    name = getattr(module, '__name__', None) or obj.__module__
+    if name not in _source_hashes:
+        try:
+            _source_hashes[name] = _file_hash(inspect.getsourcefile(module))
+        except (OSError, TypeError):
+            _source_hashes[name] = hashlib.sha256(name.encode('utf-8')).hexdigest()
+    return _source_hashes[name]
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def job_key(job):
+    """Content hash of everything that determines a job's output"""
+    payload = {
+        'func': f'{job.func.__module__}.{job.func.__qualname__}',
+        'source': _source_hash(job.func),
+        'code': sorted(_source_hash(obj) for obj in job.code),
+        'args': job.args,
+        'kwargs': job.kwargs,
+        'settings': job.settings,
+        'inputs': {path: _file_hash(path) if os.path.exists(path) else None for path in job.inputs},
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=repr).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _load_cache(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, cache):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _timed_call(func, args, kwargs):
+    """Worker-side wrapper that reports how long the job itself took"""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+class BuildReport:
+    """Per-job outcome and timing for one build run"""
+
+    def __init__(self):
+        self.timings = {}
+        self.skipped = []
+        self.failed = {}
+        self.results = {}
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def print_summary(self, limit=10):
+        built = len(self.timings)
+        print(f"\n⏱️  {built} built, {len(self.skipped)} unchanged in {self.elapsed:.2f}s")
+        slowest = sorted(self.timings.items(), key=lambda item: item[1], reverse=True)[:limit]
+        for name, seconds in slowest:
+            print(f"   {seconds * 1000:8.1f} ms  {name}")
+        for name, error in self.failed.items():
+            print(f"❌ {name}: {error}")
+
+
+def run_jobs(jobs, namespace, workers=None, force=False, cache_path=CACHE_PATH):
+    """Run jobs in dependency order on a process pool; returns a BuildReport
+
+    Each build script passes its own `namespace` so their cache entries do
+    not evict each other.
+    """
+    jobs = {job.name: job for job in jobs}
+    stored = _load_cache(cache_path)
+    cache = {} if force else stored.get(namespace, {})
+    new_cache = {}
+    report = BuildReport()
+
+    pending = dict(jobs)
+    done = set()
+    running = {}
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        while pending or running:
+            # Keys are computed only once dependencies have finished writing their outputs
+            for name, job in list(pending.items()):
+                if any(dep not in done for dep in job.deps if dep in jobs):
+                    continue
+                del pending[name]
+                key = job_key(job)
+                cached = cache.get(name)
+                if (cached and cached['key'] == key
+                        and all(os.path.exists(path) for path in job.outputs)):
+                    report.skipped.append(name)
+                    report.results[name] = cached.get('result')
+                    new_cache[name] = cached
+                    done.add(name)
+                    continue
+                future = pool.submit(_timed_call, job.func, job.args, job.kwargs)
+                running[future] = (name, key)
+
+            if not running:
+                if pending:
+                    raise RuntimeError(f"Unresolvable job dependencies: {sorted(pending)}")
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, key = running.pop(future)
+                try:
+                    result, seconds = future.result()
+                except Exception as e:
+                    # Failed jobs are not cached, so the next run retries them
+                    report.failed[name] = f'{type(e).__name__}: {e}'
+                    done.add(name)
+                    continue
+                report.timings[name] = seconds
+                report.results[name] = result
+                new_cache[name] = {'key': key, 'result': result}
+                done.add(name)
+
+    # Entries for jobs that are no longer declared are dropped
+    stored[namespace] = new_cache
+    _save_cache(cache_path, stored)
+    report.elapsed = time.perf_counter() - report.started
+    return report
+
+
+def build_arguments(description):
+    """Command-line options shared by the asset build scripts"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--force', action='store_true', help='rebuild even when inputs are unchanged')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: all cores)')
+    return parser
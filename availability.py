@@ -0,0 +1,252 @@
+"""
+RootStatix Cuisine - Availability
+Table-capacity engine that keeps a per-day bitmap of occupied seatings
+"""
+
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+# Tables on the floor as (table_id, seats)
+DEFAULT_TABLES = (
+    ('T1', 2), ('T2', 2), ('T3', 2), ('T4', 2), ('T5', 2), ('T6', 2),
+    ('T7', 4), ('T8', 4), ('T9', 4), ('T10', 4), ('T11', 4), ('T12', 4),
+    ('T13', 6), ('T14', 6),
+    ('T15', 8),
+)
+
+
+def parse_time(value):
+    """Convert 'HH:MM' to minutes past midnight, or None when malformed"""
+    try:
+        hours, minutes = value.split(':')[:2]
+        hours, minutes = int(hours), int(minutes)
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def format_time(minutes):
+    """Convert minutes past midnight to 'HH:MM'"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class DayIndex:
+    """Occupied seatings for one date: one bitmask of slots per table"""
+
+    __slots__ = ('occupied', 'loaded_at', 'count', 'last_id')
+
+    def __init__(self, table_count):
+        self.occupied = [0] * table_count
+        self.loaded_at = time.monotonic()
+        # The bookings it was built from: bookings are only ever added, with rising ids
+        self.count = 0
+        self.last_id = 0
+
+    def copy(self):
+        day = DayIndex(0)
+        day.occupied = list(self.occupied)
+        day.count = self.count
+        day.last_id = self.last_id
+        return day
+
+
+class AvailabilityEngine:
+    """Answers 'do N guests fit at this time?' without scanning bookings"""
+
+    def __init__(self, store, tables=DEFAULT_TABLES, opening='11:00', last_seating='22:00',
+                 slot_minutes=30, seating_minutes=90, max_days=400, ttl=5.0, booking_days=365):
+        self.store = store
+        # Sorted by seats so the smallest suitable table can be found by bisection
+        self.tables = tuple(sorted(tables, key=lambda table: table[1]))
+        self.capacities = [seats for _table_id, seats in self.tables]
+        self.opening = parse_time(opening)
+        self.slot_minutes = slot_minutes
+        self.slot_count = (parse_time(last_seating) - self.opening) // slot_minutes + 1
+        self.seating_slots = -(-seating_minutes // slot_minutes)
+        self.max_days = max_days
+        self.ttl = ttl
+        self.booking_days = booking_days
+        self._days = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_party(self):
+        """Largest party that can be seated at a single table"""
+        return self.capacities[-1] if self.capacities else 0
+
+    @property
+    def first_seating(self):
+        """Earliest seating time as 'HH:MM'"""
+        return format_time(self.opening)
+
+    @property
+    def last_seating(self):
+        """Latest seating time as 'HH:MM'"""
+        return format_time(self.opening + (self.slot_count - 1) * self.slot_minutes)
+
+    @property
+    def large_party(self):
+        """Form value for parties too big for any table, e.g. '9+', arranged by phone"""
+        return f'{self.max_party + 1}+'
+
+    def slot_for(self, time_value):
+        """Return the slot index a 'HH:MM' time falls into, or None outside service hours"""
+        minutes = parse_time(time_value)
+        if minutes is None or minutes < self.opening:
+            return None
+        slot = (minutes - self.opening) // self.slot_minutes
+        return slot if slot < self.slot_count else None
+
+    def slot_times(self):
+        """All seating start times as 'HH:MM' strings"""
+        return [format_time(self.opening + i * self.slot_minutes) for i in range(self.slot_count)]
+
+    def _mask(self, slot):
+        return ((1 << self.seating_slots) - 1) << slot
+
+    def _find_table(self, day, guests, mask):
+        """Index of the smallest free table seating at least `guests`, or None"""
+        start = bisect.bisect_left(self.capacities, guests)
+        for index in range(start, len(self.tables)):
+            if not day.occupied[index] & mask:
+                return index
+        return None
+
+    def _place(self, day, reservation):
+        """Replay one stored booking into the index"""
+        day.count += 1
+        day.last_id = max(day.last_id, reservation['id'])
+        guests = _guest_count(reservation.get('guests'))
+        slot = self.slot_for(reservation.get('time'))
+        if guests is None or slot is None:
+            return
+        mask = self._mask(slot)
+        index = self._find_table(day, guests, mask)
+        if index is not None:
+            day.occupied[index] |= mask
+
+    def _replay(self, bookings, day=None):
+        """Index the bookings, or only those newer than `day` on a copy of it
+
+        Bookings are placed in id order, so table assignment is deterministic
+        and extending an index gives the same tables as rebuilding it.
+        """
+        if day is not None:
+            new = [reservation for reservation in bookings if reservation['id'] > day.last_id]
+            if len(bookings) - len(new) == day.count:
+                day, bookings = day.copy(), new
+            else:
+                day = None
+        if day is None:
+            day = DayIndex(len(self.tables))
+        for reservation in sorted(bookings, key=lambda r: r['id']):
+            self._place(day, reservation)
+        return day
+
+    def _remember(self, date, day):
+        with self._lock:
+            current = self._days.get(date)
+            # A slower read that finished later must not replace a newer index
+            if current is None or day.count >= current.count:
+                self._days[date] = day
+            self._days.move_to_end(date)
+            while len(self._days) > self.max_days:
+                self._days.popitem(last=False)
+            return self._days[date]
+
+    def _cached(self, date):
+        with self._lock:
+            day = self._days.get(date)
+            if day is not None:
+                self._days.move_to_end(date)
+            return day
+
+    def _day(self, date):
+        day = self._cached(date)
+        if day is not None and time.monotonic() - day.loaded_at <= self.ttl:
+            return day
+        # Read outside the lock so lookups for other dates never wait on the database
+        return self._remember(date, self._replay(self.store.for_date(date)))
+
+    def fits(self, date, time_value, guests):
+        """Whether a party of `guests` can be seated at the given date and time"""
+        slot = self.slot_for(time_value)
+        if slot is None:
+            return False
+        return self._find_table(self._day(date), guests, self._mask(slot)) is not None
+
+    def free_slots(self, date, guests):
+        """Seating start times on `date` where a party of `guests` still fits"""
+        day = self._day(date)
+        times = self.slot_times()
+        return [times[slot] for slot in range(self.slot_count)
+                if self._find_table(day, guests, self._mask(slot)) is not None]
+
+    def validate(self, reservation, today=None):
+        """Messages for whatever makes a reservation's date, time or party size unbookable"""
+        errors = []
+        today = today or datetime.now().date()
+        try:
+            day = datetime.strptime(reservation.get('date') or '', '%Y-%m-%d').date()
+        except ValueError:
+            errors.append('Please choose a valid date.')
+        else:
+            if day < today:
+                errors.append('Please choose a date from today onwards.')
+            elif (day - today).days > self.booking_days:
+                errors.append(f'We take reservations up to {self.booking_days} days ahead.')
+        if self.slot_for(reservation.get('time')) is None:
+            errors.append(f'Please choose a time between {self.first_seating} and {self.last_seating}.')
+        guests = reservation.get('guests')
+        if guests != self.large_party:
+            count = _guest_count(guests)
+            if count is None or not 1 <= count <= self.max_party:
+                errors.append(f'Please choose between 1 and {self.max_party} guests, '
+                              f'or {self.large_party} for larger parties.')
+        return errors
+
+    def book(self, reservation, notifications=()):
+        """Store a validated reservation if a table is free; return it, or None when full
+
+        Large parties that no single table can seat are stored without a table
+        so the team can arrange seating by phone. `notifications` are queued
+        in the store's outbox together with the reservation.
+        """
+        guests = _guest_count(reservation.get('guests'))
+        if guests is None or guests > self.max_party:
+            return self.store.add(reservation, notifications)
+        slot = self.slot_for(reservation.get('time'))
+        if slot is None:
+            return None
+        mask = self._mask(slot)
+        cached = self._cached(reservation['date'])
+        checked = []
+
+        def admit(bookings):
+            # Runs under the store's write lock with the date's current bookings, so
+            # bookings from other workers are counted and none can slip in between.
+            # Only those the cached index has not seen are placed, keeping the lock short.
+            day = self._replay(bookings, cached)
+            checked.append(day)
+            return self._find_table(day, guests, mask) is not None
+
+        stored = self.store.add(reservation, notifications, admit=admit)
+        if checked:
+            day = checked[0]
+            if stored is not None:
+                self._place(day, stored)
+            self._remember(reservation['date'], day)
+        return stored
+
+
+def _guest_count(value):
+    """Parse the guests form value; '9+' style values count as unseatable online"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,328 @@
+"""
+RootStatix Cuisine - Benchmarks
+Micro-benchmarks through the Flask test client and a multi-worker HTTP load test,
+compared against a stored baseline so regressions fail the run
+
+    python benchmarks/bench.py micro
+    python benchmarks/bench.py load --clients 8 --duration 20
+    python benchmarks/bench.py all --save-baseline
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# Benchmarks must never write to the real reservation database, and their repeated
+# form posts would otherwise be answered by the rate limiter
+BENCH_ENV = {'RESERVATION_STORE': 'memory://', 'FEEDBACK_STORE': 'memory://', 'RATE_LIMIT_ENABLED': '0'}
+
+OPENING_TIMES = [f'{hour:02d}:{minute:02d}' for hour in range(11, 22) for minute in (0, 30)]
+
+
+def reservation_form(n):
+    """A distinct, bookable reservation for the n-th request"""
+    day = date.today() + timedelta(days=1 + n // len(OPENING_TIMES) % 300)
+    return {
+        'name': f'Guest {n}',
+        'email': f'guest{n}@example.com',
+        'phone': '+91 90000 00000',
+        'date': day.isoformat(),
+        'time': OPENING_TIMES[n % len(OPENING_TIMES)],
+        'guests': str(2 + n % 3),
+        'special_requests': '',
+    }
+
+
+def feedback_form(n):
+    return {'name': f'Guest {n}', 'email': f'guest{n}@example.com',
+            'rating': str(1 + n % 5), 'comments': 'Lovely evening, great service.'}
+
+
+# name -> (method, path, form factory)
+ROUTES = {
+    'index': ('GET', '/', None),
+    'about': ('GET', '/about', None),
+    'menu': ('GET', '/menu', None),
+    'gallery': ('GET', '/gallery', None),
+    'cuisine': ('GET', '/cuisine', None),
+    'why_us': ('GET', '/why-us', None),
+    'contact': ('GET', '/contact', None),
+    'reservation_form': ('GET', '/reservation', None),
+    'feedback_form': ('GET', '/feedback', None),
+    'api_menu': ('GET', '/api/menu?q=chick&dietary=spicy', None),
+    'api_availability': ('GET', f'/api/availability?date={date.today() + timedelta(days=7)}&guests=4', None),
+    'not_found': ('GET', '/no-such-page', None),
+    'reservation_post': ('POST', '/reservation', reservation_form),
+    'feedback_post': ('POST', '/feedback', feedback_form),
+}
+
+# Relative request mix for the load test, roughly what real traffic looks like
+LOAD_MIX = {
+    'index': 20, 'menu': 15, 'gallery': 10, 'cuisine': 5, 'contact': 5, 'about': 5, 'why_us': 3,
+    'reservation_form': 5, 'feedback_form': 2, 'api_menu': 5, 'api_availability': 8,
+    'not_found': 2, 'reservation_post': 3, 'feedback_post': 2,
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+def summarize(latencies, elapsed, errors=0, alloc_bytes=None):
+    latencies = sorted(latencies)
+    result = {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+    if alloc_bytes is not None:
+        result['alloc_kb'] = alloc_bytes / 1024
+    return result
+
+
+# ========================================
+# MICRO-BENCHMARKS (Flask test client)
+# ========================================
+
+def run_micro(iterations, warmup, alloc_samples):
+    os.environ.update(BENCH_ENV)
+    sys.path.insert(0, ROOT)
+    from app import app
+
+    client = app.test_client(use_cookies=False)
+    counter = itertools.count()
+    results = {}
+
+    def call(method, path, form):
+        if form is None:
+            return client.open(path, method=method)
+        return client.open(path, method=method, data=form(next(counter)))
+
+    for name, (method, path, form) in ROUTES.items():
+        for _ in range(warmup):
+            call(method, path, form)
+
+        latencies = []
+        errors = 0
+        started = time.perf_counter()
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            response = call(method, path, form)
+            latencies.append(time.perf_counter() - t0)
+            if response.status_code >= 500:
+                errors += 1
+        elapsed = time.perf_counter() - started
+
+        # Allocation pass is separate because tracing slows every allocation down
+        peaks = []
+        for _ in range(alloc_samples):
+            tracemalloc.start()
+            call(method, path, form)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        peaks.sort()
+        results[name] = summarize(latencies, elapsed, errors, peaks[len(peaks) // 2] if peaks else None)
+        print(f"  {name:<18} {results[name]['throughput']:9.0f} req/s  "
+              f"p50 {results[name]['p50_ms']:7.2f} ms  p99 {results[name]['p99_ms']:7.2f} ms  "
+              f"peak {results[name].get('alloc_kb', 0):8.1f} KB")
+    return results
+
+
+# ========================================
+# LOAD TEST (real HTTP server)
+# ========================================
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def default_server(workers):
+    """serve.py with preloaded, forked workers, as in production"""
+    return [sys.executable, os.path.join(ROOT, 'serve.py'), '--bind', '127.0.0.1:{port}',
+            '--workers', str(workers), '--graceful-timeout', '5']
+
+
+def start_server(command, port, timeout=15.0):
+    """Start the app in a subprocess and wait until it accepts connections"""
+    env = dict(os.environ, **BENCH_ENV)
+    process = subprocess.Popen(command + [str(port)] if '{port}' not in ' '.join(command)
+                               else [part.replace('{port}', str(port)) for part in command],
+                               cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with code {process.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError('Server did not start in time')
+
+
+def _load_client(port, duration, seed):
+    """One client process: sends the weighted mix over a keep-alive connection"""
+    schedule = [name for name, weight in LOAD_MIX.items() for _ in range(weight)]
+    latencies = {name: [] for name in LOAD_MIX}
+    errors = {name: 0 for name in LOAD_MIX}
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    deadline = time.perf_counter() + duration
+    n = seed * 1000000
+    while time.perf_counter() < deadline:
+        name = schedule[n % len(schedule)]
+        method, path, form = ROUTES[name]
+        body, headers = None, {}
+        if form is not None:
+            body = urlencode(form(n))
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        n += 7  # Coprime with the schedule length, so every client walks the whole mix
+        t0 = time.perf_counter()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            ok = response.status < 500
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            ok = False
+        latencies[name].append(time.perf_counter() - t0)
+        if not ok:
+            errors[name] += 1
+    connection.close()
+    return latencies, errors
+
+
+def run_load(clients, duration, server_command):
+    port = free_port()
+    process = start_server(server_command, port)
+    try:
+        with ProcessPoolExecutor(max_workers=clients) as pool:
+            started = time.perf_counter()
+            outcomes = list(pool.map(_load_client, [port] * clients, [duration] * clients, range(clients)))
+            elapsed = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    results = {}
+    everything, total_errors = [], 0
+    for name in LOAD_MIX:
+        latencies = [value for client_latencies, _ in outcomes for value in client_latencies[name]]
+        errors = sum(client_errors[name] for _, client_errors in outcomes)
+        results[name] = summarize(latencies, elapsed, errors)
+        everything += latencies
+        total_errors += errors
+    results['_total'] = summarize(everything, elapsed, total_errors)
+    for name, result in results.items():
+        print(f"  {name:<18} {result['throughput']:9.0f} req/s  p50 {result['p50_ms']:7.2f} ms  "
+              f"p95 {result['p95_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  errors {result['errors']}")
+    return results
+
+
+# ========================================
+# BASELINE COMPARISON
+# ========================================
+
+def compare(results, baseline, tolerance):
+    """Regressions beyond `tolerance` against the baseline, as readable strings"""
+    regressions = []
+    for suite, routes in results.items():
+        for name, current in routes.items():
+            previous = baseline.get(suite, {}).get(name)
+            if previous is None:
+                continue
+            if current['errors'] > previous.get('errors', 0):
+                regressions.append(f"{suite}/{name}: {current['errors']} errors (baseline {previous['errors']})")
+            # p99 is reported but too noisy on shared machines to gate on
+            for key in ('p50_ms', 'p95_ms', 'alloc_kb'):
+                if key in current and key in previous and previous[key] > 0 \
+                        and current[key] > previous[key] * (1 + tolerance):
+                    regressions.append(f"{suite}/{name}: {key} {current[key]:.2f} vs {previous[key]:.2f}")
+            if previous['throughput'] > 0 and current['throughput'] < previous['throughput'] * (1 - tolerance):
+                regressions.append(f"{suite}/{name}: throughput {current['throughput']:.0f} "
+                                   f"vs {previous['throughput']:.0f} req/s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark every route of the RootStatix app')
+    parser.add_argument('suite', nargs='?', choices=('micro', 'load', 'all'), default='all')
+    parser.add_argument('--iterations', type=int, default=300, help='timed requests per route (micro)')
+    parser.add_argument('--warmup', type=int, default=30, help='untimed requests per route (micro)')
+    parser.add_argument('--alloc-samples', type=int, default=20, help='traced requests per route (micro)')
+    parser.add_argument('--clients', type=int, default=os.cpu_count() or 4, help='client processes (load)')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per load test')
+    parser.add_argument('--server', default=None,
+                        help='server command; "{port}" is replaced, otherwise the port is appended '
+                             '(default: serve.py with --workers workers)')
+    parser.add_argument('--workers', type=int, default=max(2, os.cpu_count() or 1),
+                        help='worker processes of the default server (load)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown before failing')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--output', help='also write results to this JSON file')
+    args = parser.parse_args(argv)
+
+    results = {}
+    if args.suite in ('micro', 'all'):
+        print('🔬 Micro-benchmarks (Flask test client)')
+        results['micro'] = run_micro(args.iterations, args.warmup, args.alloc_samples)
+    if args.suite in ('load', 'all'):
+        server = args.server.split() if args.server else default_server(args.workers)
+        print(f'\n🚦 Load test: {args.clients} clients for {args.duration:.0f}s')
+        results['load'] = run_load(args.clients, args.duration, server)
+
+    report = {'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                          'cpus': os.cpu_count()}, **results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'\n📄 Baseline written to {os.path.relpath(args.baseline, ROOT)}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('\nNo baseline to compare against; run with --save-baseline first')
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('machine', {}).get('platform') != report['machine']['platform']:
+        print('\n⚠️  Baseline was recorded on a different machine; comparisons are indicative only')
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f'❌ {line}')
+    if not regressions:
+        print(f'\n✅ No regressions beyond {args.tolerance:.0%} of the baseline')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
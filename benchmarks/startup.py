@@ -0,0 +1,141 @@
+"""
+RootStatix Cuisine - Cold Start Profile
+Import-time profile (python -X importtime) and first-request latency of a fresh
+interpreter, compared against a stored baseline so startup regressions fail the run
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --save-baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'startup-baseline.json')
+
+BENCH_ENV = {'RESERVATION_STORE': 'memory://', 'FEEDBACK_STORE': 'memory://'}
+
+COLD_PATHS = ('/', '/menu', '/gallery', '/reservation')
+
+# Runs in the fresh interpreter: time the import, then the first and second request per page
+COLD_START = """
+import json, sys, time
+started = time.perf_counter()
+from app import app
+imported = time.perf_counter()
+client = app.test_client(use_cookies=False)
+first, second = {}, {}
+for path in sys.argv[1:]:
+    t0 = time.perf_counter()
+    client.get(path)
+    first[path] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    client.get(path)
+    second[path] = time.perf_counter() - t0
+print(json.dumps({'import': imported - started, 'first': first, 'second': second}))
+"""
+
+
+def _env(**extra):
+    env = dict(os.environ, **BENCH_ENV)
+    env.update(extra)
+    return env
+
+
+def import_profile():
+    """{module: (self µs, cumulative µs)} for one `import app` in a fresh interpreter"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=ROOT, env=_env(), capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def cold_start(template_cache):
+    """Seconds to import the app and serve each cold page in a fresh interpreter"""
+    env = _env() if template_cache else _env(TEMPLATE_CACHE_DIR='')
+    result = subprocess.run([sys.executable, '-c', COLD_START, *COLD_PATHS],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def profile(runs):
+    """Median cold-start numbers over `runs` fresh interpreters, in milliseconds"""
+    report = {}
+    for label, use_cache in (('bytecode_cache', True), ('no_cache', False)):
+        samples = [cold_start(use_cache) for _ in range(runs)]
+        report[label] = {
+            'import_ms': statistics.median(s['import'] for s in samples) * 1000,
+            'first_request_ms': {path: statistics.median(s['first'][path] for s in samples) * 1000
+                                 for path in COLD_PATHS},
+            'warm_request_ms': {path: statistics.median(s['second'][path] for s in samples) * 1000
+                                for path in COLD_PATHS},
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Profile the cold start of the RootStatix app')
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per configuration')
+    parser.add_argument('--top', type=int, default=15, help='slowest imports to list')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown before failing')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--output', help='also write the results and full import profile to this JSON file')
+    args = parser.parse_args(argv)
+
+    modules = import_profile()
+    app_self, app_total, _ = modules.get('app', (0, 0, 0))
+    print(f"📦 import app: {app_total / 1000:.1f} ms ({app_self / 1000:.1f} ms in app.py itself)")
+    for name, (self_us, cumulative_us, depth) in sorted(
+            modules.items(), key=lambda item: -item[1][1])[1:args.top + 1]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+    report = profile(args.runs)
+    for label, numbers in report.items():
+        print(f"\n❄️  Cold start ({label.replace('_', ' ')}): import {numbers['import_ms']:.1f} ms")
+        for path in COLD_PATHS:
+            print(f"  {path:<14} first {numbers['first_request_ms'][path]:7.1f} ms  "
+                  f"warm {numbers['warm_request_ms'][path]:6.1f} ms")
+    report['import_app_ms'] = app_total / 1000
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(dict(report, imports={name: {'self_us': s, 'cumulative_us': c}
+                                            for name, (s, c, _) in modules.items()}), f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Baseline written to {os.path.relpath(args.baseline, ROOT)}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print('\nNo baseline to compare against; run with --save-baseline first')
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    current = report['bytecode_cache']
+    previous = baseline.get('bytecode_cache', {})
+    checks = [('import', current['import_ms'], previous.get('import_ms'))]
+    checks += [(f'first {path}', current['first_request_ms'][path],
+                previous.get('first_request_ms', {}).get(path)) for path in COLD_PATHS]
+    regressions = [f'{name}: {value:.1f} ms vs {before:.1f} ms' for name, value, before in checks
+                   if before and value > before * (1 + args.tolerance)]
+    for line in regressions:
+        print(f'❌ {line}')
+    if not regressions:
+        print(f'\n✅ No cold-start regressions beyond {args.tolerance:.0%} of the baseline')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
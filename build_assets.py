@@ -0,0 +1,177 @@
+"""
+Static Asset Builder for RootStatix Cuisine
+Fingerprints every file under static/, minifies CSS/JS and writes .gz/.br siblings
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; browsers fall back to gzip
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+# Text formats worth precompressing; images are already compressed
+COMPRESSIBLE = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.xml', '.ico', '.map'}
+SKIP_SUFFIXES = ('.part', '.tmp')
+
+
+# Quoted strings and url() are copied verbatim; comments are dropped
+CSS_VERBATIM = re.compile(r"""
+    "(?:\\.|[^"\\])*" | '(?:\\.|[^'\\])*'
+  | url\(\s*(?:"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|[^)]*)\s*\)
+  | (?P<comment>/\*.*?\*/)
+""", re.S | re.I | re.X)
+
+
+def minify_css(source):
+    """Strip comments and redundant whitespace without touching selector semantics"""
+    verbatim = []
+
+    def set_aside(match):
+        if match.group('comment'):
+            return ''
+        verbatim.append(match.group())
+        return f'\0{len(verbatim) - 1}\0'
+
+    source = CSS_VERBATIM.sub(set_aside, source)
+    source = re.sub(r'\s+', ' ', source)
+    # Only punctuation where surrounding spaces never matter; ':' keeps its leading space
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    source = re.sub(r':\s+', ':', source)
+    source = source.replace(';}', '}')
+    source = re.sub(r'\0(\d+)\0', lambda match: verbatim[int(match.group(1))], source)
+    return source.strip() + '\n'
+
+
+def minify_js(source):
+    """Conservative JS minifier: drops indentation, blank lines and whole-line comments
+
+    Lines are kept separate so automatic semicolon insertion is unaffected,
+    and the inside of multi-line template literals is left untouched.
+    """
+    lines = []
+    in_template = False
+    in_comment = False
+    for line in source.splitlines():
+        if in_template:
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if in_comment:
+                if '*/' in stripped:
+                    in_comment = False
+                    stripped = stripped.split('*/', 1)[1].strip()
+                else:
+                    continue
+            if stripped.startswith('/*') and '`' not in stripped:
+                if '*/' not in stripped:
+                    in_comment = True
+                    continue
+                stripped = stripped.split('*/', 1)[1].strip()
+            if not stripped or stripped.startswith('//'):
+                continue
+            lines.append(stripped)
+        if len(re.findall(r'(?<!\\)`', line)) % 2:
+            in_template = not in_template
+    return '\n'.join(lines) + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def source_files():
+    """Every file under static/ except build output and temporary files"""
+    for root, dirs, files in os.walk(STATIC_DIR):
+        if os.path.abspath(root) == os.path.abspath(STATIC_DIR) and 'dist' in dirs:
+            dirs.remove('dist')
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in sorted(files):
+            if name.startswith('.') or name.endswith(SKIP_SUFFIXES):
+                continue
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, STATIC_DIR).replace(os.sep, '/'), path
+
+
+def fingerprinted_name(relpath, content):
+    """style.css -> style.<hash>.css"""
+    stem, ext = os.path.splitext(relpath)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+
+
+def write_compressed(path, content):
+    """Write .gz and .br siblings when they are smaller than the original"""
+    written = []
+    gz = gzip.compress(content, compresslevel=9, mtime=0)
+    if len(gz) < len(content):
+        with open(path + '.gz', 'wb') as f:
+            f.write(gz)
+        written.append('gzip')
+    if brotli is not None:
+        br = brotli.compress(content, quality=11)
+        if len(br) < len(content):
+            with open(path + '.br', 'wb') as f:
+                f.write(br)
+            written.append('br')
+    return written
+
+
+def place(source_path, target_path, content=None):
+    """Write minified content, or hard-link unchanged files to avoid duplicating images"""
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    if os.path.exists(target_path):
+        return
+    if content is not None:
+        with open(target_path, 'wb') as f:
+            f.write(content)
+        return
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        shutil.copy2(source_path, target_path)
+
+
+def build_assets():
+    """Fingerprint all static files into static/dist and write the manifest"""
+    os.makedirs(DIST_DIR, exist_ok=True)
+    manifest = {}
+    original_bytes = built_bytes = 0
+
+    for relpath, path in source_files():
+        ext = os.path.splitext(relpath)[1].lower()
+        with open(path, 'rb') as f:
+            raw = f.read()
+        content = raw
+        if ext in MINIFIERS:
+            content = MINIFIERS[ext](raw.decode('utf-8')).encode('utf-8')
+        hashed = fingerprinted_name(relpath, content)
+        target = os.path.join(DIST_DIR, hashed)
+        place(path, target, content if content is not raw else None)
+        encodings = write_compressed(target, content) if ext in COMPRESSIBLE else []
+        manifest[relpath] = {'path': hashed, 'encodings': encodings}
+
+        if ext in MINIFIERS:
+            original_bytes += len(raw)
+            built_bytes += len(content)
+            print(f"✅ {relpath} -> dist/{hashed} ({len(raw) // 1024} KB -> {len(content) // 1024} KB"
+                  f"{', ' + '/'.join(encodings) if encodings else ''})")
+
+    tmp_path = MANIFEST_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+    print(f"\n📦 {len(manifest)} assets fingerprinted, CSS/JS {original_bytes // 1024} KB -> {built_bytes // 1024} KB")
+    print(f"📄 Manifest written to {os.path.relpath(MANIFEST_PATH, BASE_DIR)}")
+
+
+if __name__ == "__main__":
+    build_assets()
@@ -0,0 +1,220 @@
+"""
+Critical CSS Builder for RootStatix Cuisine
+Extracts the style.css rules each page needs above the fold so they can be inlined
+"""
+
+import os
+import re
+import sys
+
+from asset_build import Job, build_arguments, run_jobs
+from build_assets import minify_css
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
+STYLESHEET = os.path.join(BASE_DIR, 'static', 'css', 'style.css')
+OUTPUT_DIR = os.path.join(BASE_DIR, 'build', 'critical')
+BASE_TEMPLATE = 'base.html'
+
+# Rules that style the document itself apply to every page
+ALWAYS_SELECTORS = {':root', '*', 'html', 'body'}
+
+# Content sections rendered before the fold; the rest of the page loads with the full stylesheet
+FOLD_SECTIONS = 1
+
+
+def parse_css(source):
+    """Split a stylesheet into (prelude, body) pairs; at-rule bodies are parsed recursively"""
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    rules = []
+    pos = 0
+    while True:
+        start = source.find('{', pos)
+        if start == -1:
+            break
+        prelude = source[pos:start].strip()
+        depth = 1
+        end = start + 1
+        while depth and end < len(source):
+            if source[end] == '{':
+                depth += 1
+            elif source[end] == '}':
+                depth -= 1
+            end += 1
+        body = source[start + 1:end - 1]
+        if prelude.startswith('@media') or prelude.startswith('@supports'):
+            rules.append((prelude, parse_css(body)))
+        else:
+            rules.append((prelude, body.strip()))
+        pos = end
+    return rules
+
+
+def _strip_jinja(markup):
+    """Drop Jinja expressions but keep the literal text between control tags"""
+    markup = re.sub(r'{#.*?#}', ' ', markup, flags=re.S)
+    markup = re.sub(r'{{.*?}}', ' ', markup, flags=re.S)
+    return re.sub(r'{%.*?%}', ' ', markup, flags=re.S)
+
+
+def above_the_fold(template_source, sections=FOLD_SECTIONS):
+    """Markup of the first `sections` sections of a page's content block"""
+    match = re.search(r'{%\s*block content\s*%}(.*?){%\s*endblock', template_source, flags=re.S)
+    content = match.group(1) if match else template_source
+    end = 0
+    for _ in range(sections):
+        close = content.find('</section>', end)
+        if close == -1:
+            return content
+        end = close + len('</section>')
+    return content[:end]
+
+
+def base_chrome(base_source):
+    """Navigation and flash messages from the base template, which precede every page's content"""
+    start = base_source.find('<body')
+    end = base_source.find('{% block content', start)
+    return base_source[start:end if end != -1 else None]
+
+
+def used_tokens(markup):
+    """Tag names, classes and ids appearing in template markup, including icon() output"""
+    icons = re.findall(r"""\bicon\(\s*['"]([\w-]+)['"]([^)]*)\)""", markup)
+    markup = _strip_jinja(markup)
+    tags = {tag.lower() for tag in re.findall(r'<([a-zA-Z][\w-]*)', markup)}
+    classes = set()
+    for name, rest in icons:
+        prefix = re.search(r"""prefix\s*=\s*['"](\w+)['"]""", rest)
+        extra = re.search(r"""class_\s*=\s*['"]([^'"]*)['"]""", rest)
+        tags.update(('i', 'svg', 'use'))
+        classes.update(('icon', prefix.group(1) if prefix else 'fas', 'fa-' + name))
+        if extra:
+            classes.update(extra.group(1).split())
+    for value in re.findall(r'\bclass\s*=\s*["\']([^"\']*)["\']', markup):
+        classes.update(value.split())
+    ids = set(re.findall(r'\bid\s*=\s*["\']([^"\']+)["\']', markup))
+    return tags, classes, ids
+
+
+def selector_matches(selector, tags, classes, ids):
+    """Whether every tag, class and id a selector names occurs in the markup
+
+    Pseudo-classes and attribute selectors are ignored, so states such as
+    :hover come along with their base rule.
+    """
+    selector = selector.strip()
+    if selector in ALWAYS_SELECTORS:
+        return True
+    simple = re.sub(r'::?[\w-]+(\([^)]*\))?', '', selector)
+    simple = re.sub(r'\[[^\]]*\]', '', simple)
+    if not all(name in classes for name in re.findall(r'\.([\w-]+)', simple)):
+        return False
+    if not all(name in ids for name in re.findall(r'#([\w-]+)', simple)):
+        return False
+    names = re.findall(r'(?:^|[\s>+~(])([a-zA-Z][\w-]*)', simple)
+    return all(name.lower() in tags for name in names)
+
+
+def select_rules(rules, tags, classes, ids):
+    """Rules (and media blocks) that apply to the given markup tokens"""
+    selected = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            inner = select_rules(body, tags, classes, ids)
+            if inner:
+                selected.append((prelude, inner))
+        elif prelude.startswith('@'):
+            continue
+        elif any(selector_matches(part, tags, classes, ids) for part in prelude.split(',')):
+            selected.append((prelude, body))
+    return selected
+
+
+def _keyframes_used(rules):
+    names = set()
+    for _, body in rules:
+        if isinstance(body, list):
+            names |= _keyframes_used(body)
+        else:
+            for value in re.findall(r'animation(?:-name)?\s*:\s*([^;]+)', body):
+                names.update(re.findall(r'[a-zA-Z_][\w-]*', value))
+    return names
+
+
+def serialize(rules):
+    return '\n'.join(
+        f"{prelude} {{\n{serialize(body) if isinstance(body, list) else body}\n}}"
+        for prelude, body in rules
+    )
+
+
+def extract_critical(template_path, output_path, base_path=None, stylesheet=STYLESHEET):
+    """Write the minified critical CSS for one page template; returns its size in bytes"""
+    base_path = base_path or os.path.join(TEMPLATE_DIR, BASE_TEMPLATE)
+    with open(stylesheet, encoding='utf-8') as f:
+        rules = parse_css(f.read())
+    with open(base_path, encoding='utf-8') as f:
+        chrome = base_chrome(f.read())
+    with open(template_path, encoding='utf-8') as f:
+        fold = above_the_fold(f.read())
+
+    tags, classes, ids = used_tokens(chrome + fold)
+    selected = select_rules(rules, tags, classes, ids)
+    animations = _keyframes_used(selected)
+    # Keyframes are appended after the rules that reference them; order does not matter for @keyframes
+    selected += [(prelude, body) for prelude, body in rules
+                 if prelude.startswith('@keyframes') and prelude.split()[1] in animations]
+
+    css = minify_css(serialize(selected))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(css)
+    os.replace(tmp_path, output_path)
+    return len(css.encode('utf-8'))
+
+
+def page_templates():
+    """Templates that extend the base layout"""
+    for name in sorted(os.listdir(TEMPLATE_DIR)):
+        if not name.endswith('.html') or name == BASE_TEMPLATE:
+            continue
+        with open(os.path.join(TEMPLATE_DIR, name), encoding='utf-8') as f:
+            if '{% extends "base.html" %}' in f.read():
+                yield name
+
+
+def critical_path(template_name):
+    return os.path.join(OUTPUT_DIR, os.path.splitext(template_name)[0] + '.css')
+
+
+def critical_job(template_name):
+    template_path = os.path.join(TEMPLATE_DIR, template_name)
+    base_path = os.path.join(TEMPLATE_DIR, BASE_TEMPLATE)
+    output = critical_path(template_name)
+    return Job(
+        name=template_name,
+        func=extract_critical,
+        args=(template_path, output, base_path, STYLESHEET),
+        inputs=(template_path, base_path, STYLESHEET),
+        outputs=(output,),
+        code=(minify_css,),
+    )
+
+
+def build_critical_css(force=False, workers=None):
+    """Extract critical CSS for every page template; returns True when all succeeded"""
+    print("🎨 Extracting critical CSS...\n")
+    jobs = [critical_job(name) for name in page_templates()]
+    report = run_jobs(jobs, 'build_critical_css', workers=workers, force=force)
+    for name in sorted(report.results):
+        if report.results[name] is not None:
+            print(f"✅ {name}: {report.results[name] / 1024:.1f} KB inline")
+    report.print_summary()
+    print(f"\n📁 Critical CSS written to {os.path.relpath(OUTPUT_DIR, BASE_DIR)}")
+    return not report.failed
+
+
+if __name__ == "__main__":
+    args = build_arguments('Extract above-the-fold CSS for each page template').parse_args()
+    sys.exit(0 if build_critical_css(force=args.force, workers=args.jobs) else 1)
@@ -0,0 +1,212 @@
+"""
+Responsive Image Builder for RootStatix Cuisine
+Creates resized WebP/AVIF variants and progressive JPEG fallbacks for catalog images
+and records them in a manifest used by the picture() template helper
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+
+from PIL import Image, features
+
+from asset_build import Job, build_arguments, run_jobs
+from catalog import catalogs
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(BASE_DIR, 'static', 'images')
+OUTPUT_DIR = os.path.join(IMAGES_DIR, 'responsive')
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, 'manifest.json')
+
+# Target widths in pixels; sources are never upscaled
+WIDTHS = (320, 480, 640, 960, 1280, 1920)
+
+# Width of the inline low-quality placeholder shown while an image is deferred
+PLACEHOLDER_WIDTH = 16
+
+# Encoder settings per output format
+ENCODERS = {
+    'avif': {'format': 'AVIF', 'ext': 'avif', 'options': {'quality': 55}},
+    'webp': {'format': 'WEBP', 'ext': 'webp', 'options': {'quality': 78, 'method': 6}},
+    'jpeg': {'format': 'JPEG', 'ext': 'jpg', 'options': {'quality': 80, 'optimize': True, 'progressive': True}},
+}
+
+
+def can_encode_avif():
+    """Pillow 11.2+ has native AVIF; older releases need the pillow-avif-plugin package"""
+    if 'avif' in features.get_supported_modules():
+        return features.check('avif')
+    try:
+        import pillow_avif  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats():
+    """Output formats this Pillow build can encode, best first"""
+    formats = []
+    if can_encode_avif():
+        formats.append('avif')
+    if features.check('webp'):
+        formats.append('webp')
+    formats.append('jpeg')
+    return formats
+
+
+def catalog_images():
+    """Every image file referenced by the menu, gallery and cuisine data of all locations"""
+    names = []
+    for location in [catalogs.get(slug) for slug in [None] + catalogs.slugs()]:
+        names += [dish.image for dish in location.dishes]
+        names += [image.src for image in location.gallery]
+        names += [cuisine.image for cuisine in location.cuisines]
+    return list(dict.fromkeys(names))
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def target_widths(source_width):
+    """Widths to generate for a source image, always including one at or below its own width"""
+    widths = [width for width in WIDTHS if width < source_width]
+    widths.append(min(source_width, WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def build_variant(image, width, fmt, stem):
+    """Resize and encode one variant, returning its manifest entry"""
+    encoder = ENCODERS[fmt]
+    height = round(image.height * width / image.width)
+    resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+    filename = f"{stem}-{width}.{encoder['ext']}"
+    path = os.path.join(OUTPUT_DIR, filename)
+    resized.save(path, encoder['format'], **encoder['options'])
+    return {
+        'src': f'images/responsive/{filename}',
+        'width': width,
+        'height': height,
+        'bytes': os.path.getsize(path),
+    }
+
+
+def build_placeholder(image, formats):
+    """A tiny blurred-up preview as a data URI, small enough to inline in the page"""
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    tiny = image.resize((PLACEHOLDER_WIDTH, height), Image.BOX)
+    buffer = io.BytesIO()
+    if 'webp' in formats:
+        tiny.save(buffer, 'WEBP', quality=30)
+        mime = 'image/webp'
+    else:
+        tiny.save(buffer, 'JPEG', quality=30)
+        mime = 'image/jpeg'
+    return f"data:{mime};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+def build_image(filename, formats):
+    """Generate all variants of one source image"""
+    source = os.path.join(IMAGES_DIR, filename)
+    stem = os.path.splitext(filename)[0]
+    with Image.open(source) as image:
+        image = image.convert('RGB')
+        entry = {
+            'width': image.width,
+            'height': image.height,
+            'sha256': file_hash(source),
+            'bytes': os.path.getsize(source),
+            'variants': {},
+            'placeholder': build_placeholder(image, formats),
+        }
+        for fmt in formats:
+            entry['variants'][fmt] = [build_variant(image, width, fmt, stem)
+                                      for width in target_widths(image.width)]
+    return entry
+
+
+def load_manifest():
+    """The current manifest, or an empty one when it is missing or unreadable"""
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(manifest):
+    """Write the manifest atomically so running servers never read half a file"""
+    tmp_path = MANIFEST_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def image_job(filename, formats):
+    """Describe the variants of one source image as a build job"""
+    source = os.path.join(IMAGES_DIR, filename)
+    stem = os.path.splitext(filename)[0]
+    with Image.open(source) as image:
+        widths = target_widths(image.width)
+    outputs = [os.path.join(OUTPUT_DIR, f"{stem}-{width}.{ENCODERS[fmt]['ext']}")
+               for fmt in formats for width in widths]
+    return Job(
+        filename,
+        build_image,
+        args=(filename, formats),
+        inputs=[source],
+        outputs=outputs,
+        settings={'widths': WIDTHS, 'encoders': {fmt: ENCODERS[fmt] for fmt in formats}},
+    )
+
+
+def build_all(filenames=None, force=False, workers=None):
+    """Build variants for the given images (default: everything in the catalog)
+
+    With explicit filenames only their manifest entries are replaced; a full
+    build rewrites the manifest, dropping images no longer in the catalog.
+    """
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    formats = available_formats()
+    partial = bool(filenames)
+    filenames = filenames or catalog_images()
+
+    print(f"Building responsive images ({', '.join(formats)})...")
+    jobs = []
+    for filename in filenames:
+        if not os.path.exists(os.path.join(IMAGES_DIR, filename)):
+            print(f"⚠️  Missing: {filename}")
+            continue
+        jobs.append(image_job(filename, formats))
+
+    report = run_jobs(jobs, 'build_images', workers=workers, force=force)
+    # A partial build updates its images' entries and keeps everyone else's
+    manifest = load_manifest() if partial else {}
+    for job in jobs:
+        entry = report.results.get(job.name)
+        if entry is None:
+            continue
+        manifest[job.name] = entry
+        if job.name in report.timings:
+            smallest = min(variant['bytes'] for variant in entry['variants'][formats[0]])
+            print(f"✅ {job.name}: {entry['bytes'] // 1024} KB -> {smallest // 1024} KB smallest {formats[0]}")
+
+    write_manifest(manifest)
+    report.print_summary()
+    print(f"\n📄 Manifest written to {os.path.relpath(MANIFEST_PATH, BASE_DIR)}")
+    return not report.failed
+
+
+if __name__ == "__main__":
+    parser = build_arguments("Build responsive image variants")
+    parser.add_argument('images', nargs='*', help='image filenames (default: all catalog images)')
+    args = parser.parse_args()
+    if not build_all(args.images, force=args.force, workers=args.jobs):
+        raise SystemExit(1)
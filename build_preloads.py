@@ -0,0 +1,105 @@
+"""
+Preload Registry Builder for RootStatix Cuisine
+Finds the template each page renders and the image above its fold (its LCP element),
+and records what preload.py should hint for every endpoint
+"""
+
+import json
+import os
+import re
+
+from flask import template_rendered
+
+from asset_build import build_arguments
+from build_critical_css import above_the_fold
+from preload import MANIFEST_PATH
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
+BASE_TEMPLATE = 'base.html'
+
+# Every page loads the full stylesheet, render-blocking when there is no critical CSS
+STYLESHEETS = ('css/style.css',)
+
+STATIC_IMG = re.compile(r"""<img\b[^>]*?\bsrc=["']\{\{\s*url_for\(\s*['"]static['"]\s*,\s*"""
+                        r"""filename\s*=\s*['"]([^'"]+)['"]\s*\)\s*\}\}""")
+
+
+def page_templates(app):
+    """{endpoint: template} for every argument-free GET page that renders a full HTML page"""
+    rendered = []
+
+    def record(sender, template, context, **extra):
+        rendered.append(template.name)
+
+    pages = {}
+    client = app.test_client(use_cookies=False)
+    template_rendered.connect(record, app)
+    try:
+        for rule in app.url_map.iter_rules():
+            if rule.arguments or 'GET' not in rule.methods or rule.endpoint in pages:
+                continue
+            del rendered[:]
+            response = client.get(rule.rule)
+            if response.status_code == 200 and response.mimetype == 'text/html' and rendered:
+                pages[rule.endpoint] = rendered[0]
+    finally:
+        template_rendered.disconnect(record, app)
+    return pages
+
+
+def extends_base(source):
+    return re.search(r"""{%\s*extends\s+['"]""" + re.escape(BASE_TEMPLATE) + """['"]""", source) is not None
+
+
+def lcp_image(source):
+    """Static filename of the first image above the fold, or None"""
+    match = STATIC_IMG.search(above_the_fold(source))
+    return match.group(1) if match else None
+
+
+def page_assets(image):
+    """The LCP image first, then the stylesheets"""
+    assets = []
+    if image:
+        assets.append({'filename': image, 'as': 'image'})
+    assets += [{'filename': filename, 'as': 'style'} for filename in STYLESHEETS]
+    return assets
+
+
+def write_registry(registry, path=MANIFEST_PATH):
+    """Write the registry atomically so running servers never read half a file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(registry, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def build_preloads():
+    """Derive the per-endpoint preload registry from the templates; returns True on success"""
+    # Rendering must never touch the real reservation database
+    os.environ.setdefault('RESERVATION_STORE', 'memory://')
+    from app import app
+
+    print("🔗 Finding each page's preloads...\n")
+    registry = {}
+    for endpoint, template in sorted(page_templates(app).items()):
+        with open(os.path.join(TEMPLATE_DIR, template), encoding='utf-8') as f:
+            source = f.read()
+        if not extends_base(source):
+            continue
+        image = lcp_image(source)
+        registry[endpoint] = {'template': template, 'assets': page_assets(image)}
+        print(f"{'✅' if image else '⚠️ '} {endpoint}: {image or 'no image above the fold'}")
+
+    write_registry(registry)
+    print(f"\n📄 {len(registry)} pages written to {os.path.relpath(MANIFEST_PATH, BASE_DIR)}")
+    return True
+
+
+if __name__ == "__main__":
+    build_arguments('Build the per-page preload registry for Link headers and Early Hints').parse_args()
+    if not build_preloads():
+        raise SystemExit(1)
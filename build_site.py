@@ -0,0 +1,48 @@
+"""
+Site Build for RootStatix Cuisine
+Runs every asset build in dependency order and freezes the site for a CDN deploy
+
+    python build_site.py && vercel deploy --prod --local-config build/vercel.json
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+from asset_build import build_arguments
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (script, accepts --force/--jobs); each step reads the outputs of the ones before it
+STEPS = (
+    ('build_images.py', True),        # responsive variants, referenced by the asset manifest
+    ('build_webfonts.py', True),      # font subsets and icon sprite
+    ('build_assets.py', False),       # fingerprints everything under static/
+    ('build_critical_css.py', True),
+    ('build_templates.py', True),
+    ('build_preloads.py', True),      # links to the fingerprinted LCP images and stylesheet
+    ('freeze.py', True),              # renders pages with all of the above; writes build/vercel.json
+)
+
+
+def build_site(force=False, workers=None):
+    """Run every build step, stopping at the first failure; returns True on success"""
+    started = time.perf_counter()
+    for script, takes_arguments in STEPS:
+        command = [sys.executable, os.path.join(BASE_DIR, script)]
+        if takes_arguments:
+            command += ['--force'] if force else []
+            command += ['--jobs', str(workers)] if workers else []
+        print(f"\n▶️  {script}")
+        if subprocess.run(command, cwd=BASE_DIR).returncode != 0:
+            print(f"\n❌ {script} failed; the site was not fully built")
+            return False
+    print(f"\n🚀 Site built in {time.perf_counter() - started:.1f}s")
+    return True
+
+
+if __name__ == "__main__":
+    args = build_arguments('Build all assets and freeze the site for deployment').parse_args()
+    if not build_site(force=args.force, workers=args.jobs):
+        raise SystemExit(1)
@@ -0,0 +1,40 @@
+"""
+Template Compiler for RootStatix Cuisine
+Precompiles every Jinja template into the bytecode cache shipped with the deploy
+"""
+
+import os
+import sys
+
+from asset_build import build_arguments
+from template_cache import CACHE_DIR, compile_templates
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def build_templates(force=False):
+    """Compile the app's templates with its own Jinja environment; returns True on success"""
+    # Templates must compile with the app's exact environment settings; importing
+    # it must not open the real database
+    os.environ.setdefault('RESERVATION_STORE', 'memory://')
+    from app import app
+
+    print("🧩 Compiling Jinja templates...\n")
+    try:
+        results = compile_templates(app.jinja_env, CACHE_DIR, force=force)
+    except Exception as e:
+        print(f"❌ {type(e).__name__}: {e}")
+        return False
+    for name, size in sorted(results.items()):
+        if size is not None:
+            print(f"✅ {name}: {size / 1024:.1f} KB bytecode")
+    print(f"\n{len(results)} templates, {sum(size is not None for size in results.values())} recompiled "
+          f"for Python {sys.version_info.major}.{sys.version_info.minor}")
+    print(f"📁 Bytecode written to {os.path.relpath(CACHE_DIR, BASE_DIR)}")
+    return True
+
+
+if __name__ == "__main__":
+    args = build_arguments('Precompile Jinja templates into a bytecode cache').parse_args()
+    if not build_templates(force=args.force):
+        raise SystemExit(1)
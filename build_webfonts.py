@@ -0,0 +1,280 @@
+"""
+Web Font and Icon Builder for RootStatix Cuisine
+Subsets the site fonts to the characters the pages use and packs the icons
+the templates reference into one SVG sprite, so nothing loads from third-party CDNs
+"""
+
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from urllib.parse import quote
+
+from asset_build import Job, build_arguments, run_jobs
+from catalog import DATA_FILE
+from downloader import download_images
+
+try:
+    from fontTools import subset as font_subset
+except ImportError:  # fontTools is optional; pages keep using Google Fonts without it
+    font_subset = None
+
+try:
+    import brotli  # noqa: F401  (fontTools needs it to write WOFF2)
+except ImportError:
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
+SCRIPT_DIR = os.path.join(BASE_DIR, 'static', 'js')
+OUTPUT_DIR = os.path.join(BASE_DIR, 'static', 'fonts')
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, 'manifest.json')
+SPRITE_PATH = os.path.join(OUTPUT_DIR, 'icons.svg')
+SOURCE_DIR = os.path.join(BASE_DIR, 'build', 'sources')
+
+GOOGLE_FONTS = 'https://github.com/google/fonts/raw/main/ofl/'
+FONT_AWESOME = 'https://raw.githubusercontent.com/FortAwesome/Font-Awesome/6.4.0/svgs/'
+
+# Families and weights from the old Google Fonts URL; preloaded faces render above the fold
+FONTS = (
+    {'family': 'Playfair Display', 'weight': '400 700', 'source': 'playfairdisplay/PlayfairDisplay[wght].ttf',
+     'preload': True},
+    {'family': 'Poppins', 'weight': '300', 'source': 'poppins/Poppins-Light.ttf'},
+    {'family': 'Poppins', 'weight': '400', 'source': 'poppins/Poppins-Regular.ttf', 'preload': True},
+    {'family': 'Poppins', 'weight': '500', 'source': 'poppins/Poppins-Medium.ttf'},
+    {'family': 'Poppins', 'weight': '600', 'source': 'poppins/Poppins-SemiBold.ttf'},
+    {'family': 'Poppins', 'weight': '700', 'source': 'poppins/Poppins-Bold.ttf'},
+)
+
+# Always kept so form input echoed back on the confirmation page still renders
+BASE_CHARACTERS = {chr(code) for code in range(0x20, 0x7f)} | set(' ‘’“”–—…₹')
+
+# Icon prefix -> Font Awesome SVG directory
+ICON_STYLES = {'fas': 'solid', 'fab': 'brands', 'far': 'regular'}
+
+# Font Awesome 5 names used in the templates that were renamed in 6
+ICON_ALIASES = {
+    'balance-scale': 'scale-balanced',
+    'birthday-cake': 'cake-candles',
+    'check-circle': 'circle-check',
+    'cocktail': 'martini-glass-citrus',
+    'comment-alt': 'message',
+    'concierge-bell': 'bell-concierge',
+    'globe-asia': 'earth-asia',
+    'home': 'house',
+    'info-circle': 'circle-info',
+    'magic': 'wand-magic-sparkles',
+    'map-marker-alt': 'location-dot',
+    'parking': 'square-parking',
+    'phone-alt': 'phone-flip',
+    'redo': 'arrow-rotate-right',
+    'search-plus': 'magnifying-glass-plus',
+    'shield-alt': 'shield-halved',
+    'smile': 'face-smile',
+    'smile-beam': 'face-smile-beam',
+    'ticket-alt': 'ticket-simple',
+    'users-cog': 'users-gear',
+}
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+ICON_CALL = re.compile(r"""\bicon\(\s*['"]([\w-]+)['"]([^)]*)\)""")
+ICON_PREFIX = re.compile(r"""prefix\s*=\s*['"](\w+)['"]""")
+
+
+def _page_sources():
+    for directory, suffix in ((TEMPLATE_DIR, '.html'), (SCRIPT_DIR, '.js')):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(suffix):
+                with open(os.path.join(directory, name), encoding='utf-8') as f:
+                    yield f.read()
+
+
+def used_icons():
+    """{name: prefix} for every icon('name', ...) call in the templates and scripts"""
+    icons = {}
+    for source in _page_sources():
+        for name, rest in ICON_CALL.findall(source):
+            prefix = ICON_PREFIX.search(rest)
+            icons[name] = prefix.group(1) if prefix else 'fas'
+    return icons
+
+
+def _catalog_strings(value):
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _catalog_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _catalog_strings(item)
+    elif isinstance(value, str):
+        yield value
+
+
+def used_characters():
+    """Characters in template text, scripts and catalog data, plus printable ASCII"""
+    characters = set(BASE_CHARACTERS)
+    for source in _page_sources():
+        characters.update(source)
+    with open(DATA_FILE, encoding='utf-8') as f:
+        for text in _catalog_strings(json.load(f)):
+            characters.update(text)
+    return ''.join(sorted(c for c in characters if c.isprintable() or c == ' '))
+
+
+def font_filename(font):
+    return f"{font['family'].lower().replace(' ', '-')}-{font['weight'].replace(' ', '-')}.woff2"
+
+
+def subset_font(source_path, output_path, text):
+    """Write a WOFF2 subset containing only the glyphs for `text`; returns its size in bytes"""
+    options = font_subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['kern', 'liga', 'calt', 'ccmp', 'locl', 'mark', 'mkmk']
+    options.name_IDs = [1, 2]
+    options.notdef_outline = True
+    font = font_subset.load_font(source_path, options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    tmp_path = output_path + '.tmp'
+    font_subset.save_font(font, tmp_path, options)
+    font.close()
+    os.replace(tmp_path, output_path)
+    return os.path.getsize(output_path)
+
+
+def icon_source(name, prefix):
+    return os.path.join(SOURCE_DIR, 'icons', ICON_STYLES.get(prefix, 'solid'), name + '.svg')
+
+
+def build_sprite(icons, output_path):
+    """Combine the icon sources into one <symbol> sprite; returns {name: {prefix, viewBox}}"""
+    ET.register_namespace('', SVG_NS)
+    sprite = ET.Element(f'{{{SVG_NS}}}svg')
+    entries = {}
+    for name, prefix in sorted(icons.items()):
+        path = icon_source(name, prefix)
+        if not os.path.exists(path):
+            continue
+        source = ET.parse(path).getroot()
+        symbol = ET.SubElement(sprite, f'{{{SVG_NS}}}symbol', id='icon-' + name,
+                               viewBox=source.get('viewBox'))
+        symbol.extend(list(source))
+        entries[name] = {'prefix': prefix, 'viewBox': source.get('viewBox')}
+
+    body = ET.tostring(sprite, encoding='unicode')
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('<!-- Icons: Font Awesome Free 6.4.0 by @fontawesome, CC BY 4.0, https://fontawesome.com/license/free -->\n')
+        f.write(body)
+    os.replace(tmp_path, output_path)
+    return entries
+
+
+def fetch_sources(icons, fonts):
+    """Download icon SVGs and font files not already cached under build/sources"""
+    by_dir = {}
+    for name, prefix in icons.items():
+        style = ICON_STYLES.get(prefix, 'solid')
+        remote = ICON_ALIASES.get(name, name)
+        by_dir.setdefault(os.path.join(SOURCE_DIR, 'icons', style), {})[name + '.svg'] = (
+            f'{FONT_AWESOME}{style}/{remote}.svg')
+    for font in fonts:
+        family_dir, filename = font['source'].split('/')
+        by_dir.setdefault(os.path.join(SOURCE_DIR, 'fonts', family_dir), {})[filename] = (
+            GOOGLE_FONTS + quote(font['source']))
+
+    for dest_dir, images in by_dir.items():
+        missing = {filename: url for filename, url in images.items()
+                   if not os.path.exists(os.path.join(dest_dir, filename))}
+        if missing:
+            download_images(missing, dest_dir)
+
+
+def write_manifest(manifest):
+    tmp_path = MANIFEST_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def build_webfonts(force=False, workers=None):
+    """Subset fonts and build the icon sprite; returns True when every job succeeded
+
+    A sprite lacking any icon the templates use counts as a failure.
+    """
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    icons = used_icons()
+    can_subset = font_subset is not None and brotli is not None
+    fonts = FONTS if can_subset else ()
+    if not can_subset:
+        print("⚠️  fontTools and brotli are needed for WOFF2 subsets; keeping Google Fonts")
+
+    print(f"🔤 Building web fonts and a sprite of {len(icons)} icons...\n")
+    fetch_sources(icons, fonts)
+
+    text = used_characters()
+    jobs = [Job(
+        name='icons.svg',
+        func=build_sprite,
+        args=(icons, SPRITE_PATH),
+        inputs=[icon_source(name, prefix) for name, prefix in sorted(icons.items())],
+        outputs=(SPRITE_PATH,),
+    )]
+    for font in fonts:
+        source = os.path.join(SOURCE_DIR, 'fonts', font['source'])
+        if not os.path.exists(source):
+            print(f"⚠️  Missing font source: {font['source']}")
+            continue
+        output = os.path.join(OUTPUT_DIR, font_filename(font))
+        jobs.append(Job(
+            name=font_filename(font),
+            func=subset_font,
+            args=(source, output, text),
+            inputs=(source,),
+            outputs=(output,),
+        ))
+
+    report = run_jobs(jobs, 'build_webfonts', workers=workers, force=force)
+    icon_entries = report.results.get('icons.svg') or {}
+    missing_icons = sorted(set(icons) - set(icon_entries))
+    incomplete_sprite = bool(missing_icons and icon_entries)
+    if incomplete_sprite:
+        # With a sprite the CDN stylesheet is dropped, so these would render as empty boxes
+        for name in missing_icons:
+            print(f"❌ Icon {name} is used by a template but missing from the sprite")
+        print("⚠️  Keeping the Font Awesome CDN until every icon is in the sprite")
+        icon_entries = {}
+    else:
+        for name in missing_icons:
+            print(f"⚠️  No icon source for {name}")
+
+    manifest = {'fonts': [], 'icons': icon_entries,
+                'sprite': 'fonts/icons.svg' if icon_entries else None}
+    for font in fonts:
+        filename = font_filename(font)
+        size = report.results.get(filename)
+        if size is None:
+            # A partial set would leave some weights synthesized; keep Google Fonts instead
+            print(f"⚠️  {filename} was not built; keeping Google Fonts")
+            manifest['fonts'] = []
+            break
+        manifest['fonts'].append({
+            'family': font['family'],
+            'weight': font['weight'],
+            'src': 'fonts/' + filename,
+            'preload': font.get('preload', False),
+        })
+        if filename in report.timings:
+            print(f"✅ {filename}: {size / 1024:.1f} KB")
+
+    write_manifest(manifest)
+    report.print_summary()
+    print(f"\n📄 Manifest written to {os.path.relpath(MANIFEST_PATH, BASE_DIR)}")
+    return not report.failed and not incomplete_sprite
+
+
+if __name__ == "__main__":
+    args = build_arguments('Subset web fonts and build the icon sprite').parse_args()
+    if not build_webfonts(force=args.force, workers=args.jobs):
+        raise SystemExit(1)
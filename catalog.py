@@ -0,0 +1,373 @@
+"""
+RootStatix Cuisine - Catalog
+Loads the menu, gallery, cuisine and contact data at import time, and
+other outlets' data on demand, through a registry that reloads edited files
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import NamedTuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(BASE_DIR, 'data', 'catalog.json')
+LOCATIONS_DIR = os.path.join(BASE_DIR, 'data', 'locations')
+
+LOCATION_SLUG = re.compile(r'^[a-z0-9][a-z0-9-]*$')
+
+# What a half-written, malformed or vanished data file raises while loading
+LOAD_ERRORS = (OSError, ValueError, KeyError, TypeError)
+
+logger = logging.getLogger(__name__)
+
+
+class Dish(NamedTuple):
+    """A single menu item"""
+    name: str
+    description: str
+    price: str
+    image: str
+    category: str
+    dietary: tuple = ()
+    special: bool = False
+
+
+def price_amount(price):
+    """Numeric value of a display price such as '₹380'"""
+    digits = re.sub(r'[^\d.]', '', price)
+    return float(digits) if digits else 0.0
+
+
+def tokenize(text):
+    """Lower-case, accent-folded words for search"""
+    folded = unicodedata.normalize('NFKD', text.lower())
+    folded = ''.join(c for c in folded if not unicodedata.combining(c))
+    return re.findall(r'\w+', folded)
+
+
+class GalleryImage(NamedTuple):
+    """A photo shown on the gallery page"""
+    src: str
+    category: str
+    alt: str
+
+
+class GalleryPage(NamedTuple):
+    """One page of gallery images, optionally limited to a category"""
+    images: tuple
+    category: str
+    number: int
+    pages: int
+    total: int
+
+    @property
+    def previous(self):
+        return self.number - 1 if self.number > 1 else None
+
+    @property
+    def next(self):
+        return self.number + 1 if self.number < self.pages else None
+
+
+class Cuisine(NamedTuple):
+    """A cuisine type shown on the cuisine page"""
+    name: str
+    description: str
+    image: str
+    specialties: tuple = ()
+
+
+class MenuIndex:
+    """Inverted index over the dishes for filtered and full-text menu queries
+
+    Dishes are referred to by their position in `dishes`, so every filter is
+    a set of positions and a query is their intersection, returned in menu
+    order.
+    """
+
+    def __init__(self, dishes):
+        self.dishes = dishes
+        postings = {}
+        for position, dish in enumerate(dishes):
+            for word in set(tokenize(dish.name) + tokenize(dish.description)):
+                postings.setdefault(word, set()).add(position)
+        self.postings = {word: frozenset(positions) for word, positions in postings.items()}
+        # Sorted vocabulary: all words sharing a prefix form one contiguous run
+        self.vocabulary = sorted(self.postings)
+
+        self.by_category = self._group(lambda dish: (dish.category,))
+        self.by_dietary = self._group(lambda dish: dish.dietary)
+        self.specials = frozenset(i for i, dish in enumerate(dishes) if dish.special)
+
+        by_price = sorted((price_amount(dish.price), i) for i, dish in enumerate(dishes))
+        self.prices = [amount for amount, _ in by_price]
+        self.price_order = [i for _, i in by_price]
+
+    def _group(self, keys):
+        groups = {}
+        for position, dish in enumerate(self.dishes):
+            for key in keys(dish):
+                groups.setdefault(key, set()).add(position)
+        return {key: frozenset(positions) for key, positions in groups.items()}
+
+    def matching(self, term):
+        """Positions of dishes with a word starting with `term`"""
+        start = bisect_left(self.vocabulary, term)
+        positions = set()
+        for word in self.vocabulary[start:]:
+            if not word.startswith(term):
+                break
+            positions |= self.postings[word]
+        return positions
+
+    def price_range(self, low=None, high=None):
+        start = 0 if low is None else bisect_left(self.prices, low)
+        end = len(self.prices) if high is None else bisect_right(self.prices, high)
+        return set(self.price_order[start:end])
+
+    def search(self, query='', category=None, dietary=(), special=None, min_price=None, max_price=None):
+        """Dishes matching every given filter; each query word matches as a prefix"""
+        filters = []
+        if category is not None:
+            filters.append(self.by_category.get(category, frozenset()))
+        for tag in dietary:
+            filters.append(self.by_dietary.get(tag, frozenset()))
+        if special is not None:
+            filters.append(self.specials if special
+                           else frozenset(range(len(self.dishes))) - self.specials)
+        if min_price is not None or max_price is not None:
+            filters.append(self.price_range(min_price, max_price))
+        for term in tokenize(query or ''):
+            filters.append(self.matching(term))
+
+        if not filters:
+            return self.dishes
+        # Intersect from the smallest set so the work is bounded by the most selective filter
+        filters.sort(key=len)
+        positions = set(filters[0])
+        for other in filters[1:]:
+            positions &= other
+            if not positions:
+                return ()
+        return tuple(self.dishes[i] for i in sorted(positions))
+
+
+def _freeze(value):
+    """Recursively turn dicts and lists into read-only equivalents"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class Catalog:
+    """Immutable snapshot of the restaurant data with precomputed indexes"""
+
+    __slots__ = ('menu', 'dishes', 'by_name', 'by_dietary', 'specials', 'menu_index',
+                 'gallery', 'gallery_by_category', 'cuisines', 'contact')
+
+    def __init__(self, data):
+        menu = {}
+        by_dietary = {}
+        for category, items in data['menu'].items():
+            menu[category] = tuple(
+                Dish(
+                    name=item['name'],
+                    description=item['description'],
+                    price=item['price'],
+                    image=item['image'],
+                    category=category,
+                    dietary=tuple(item.get('dietary', ())),
+                    special=bool(item.get('special', False)),
+                )
+                for item in items
+            )
+
+        self.menu = MappingProxyType(menu)
+        self.dishes = tuple(dish for items in menu.values() for dish in items)
+        self.by_name = MappingProxyType({dish.name: dish for dish in self.dishes})
+
+        for dish in self.dishes:
+            for tag in dish.dietary:
+                by_dietary.setdefault(tag, []).append(dish)
+        self.by_dietary = MappingProxyType({tag: tuple(items) for tag, items in by_dietary.items()})
+        self.specials = tuple(dish for dish in self.dishes if dish.special)
+        self.menu_index = MenuIndex(self.dishes)
+
+        self.gallery = tuple(GalleryImage(**image) for image in data['gallery'])
+        by_category = {}
+        for image in self.gallery:
+            by_category.setdefault(image.category, []).append(image)
+        self.gallery_by_category = MappingProxyType(
+            {category: tuple(images) for category, images in by_category.items()})
+        self.cuisines = tuple(
+            Cuisine(
+                name=item['name'],
+                description=item['description'],
+                image=item['image'],
+                specialties=tuple(item.get('specialties', ())),
+            )
+            for item in data['cuisines']
+        )
+        self.contact = _freeze(data['contact'])
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"Catalog is read-only, cannot reassign '{name}'")
+        object.__setattr__(self, name, value)
+
+    def dishes_with(self, tag):
+        """Return every dish carrying the given dietary tag"""
+        return self.by_dietary.get(tag, ())
+
+    def gallery_page(self, category=None, page=1, per_page=12):
+        """A page of gallery images, or None for an unknown category or out-of-range page"""
+        if category is None:
+            images = self.gallery
+        elif category in self.gallery_by_category:
+            images = self.gallery_by_category[category]
+        else:
+            return None
+        pages = max(1, -(-len(images) // per_page))
+        if not 1 <= page <= pages:
+            return None
+        start = (page - 1) * per_page
+        return GalleryPage(images[start:start + per_page], category, page, pages, len(images))
+
+
+def load_catalog(path=DATA_FILE):
+    """Read a catalog data file into a Catalog"""
+    with open(path, encoding='utf-8') as f:
+        return Catalog(json.load(f))
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class CatalogRegistry:
+    """Per-location catalogs, loaded on first access and kept in a bounded LRU
+
+    The default location is always resident. Each other outlet lives in
+    data/locations/<slug>.json and inherits any top-level section (menu,
+    gallery, cuisines, contact) it does not define from the default data.
+    Every entry, the default one included, is re-checked against its files
+    every `ttl` seconds (or on the next access after clear()), so edits are
+    picked up without a restart, and at most `max_entries` outlets are held
+    per process however many exist.
+    """
+
+    def __init__(self, default, default_path=DATA_FILE, locations_dir=LOCATIONS_DIR,
+                 max_entries=8, ttl=60.0):
+        self.default = default
+        self.default_path = default_path
+        self.locations_dir = locations_dir
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # (signature, checked at) of the default catalog, like the entries' own
+        self._default_state = (_mtime(default_path), time.monotonic())
+
+    def path_for(self, slug):
+        return os.path.join(self.locations_dir, slug + '.json')
+
+    def exists(self, slug):
+        return bool(LOCATION_SLUG.match(slug)) and os.path.isfile(self.path_for(slug))
+
+    def slugs(self):
+        """Every configured outlet, without loading any of them"""
+        try:
+            names = os.listdir(self.locations_dir)
+        except OSError:
+            return []
+        return sorted(name[:-len('.json')] for name in names
+                      if name.endswith('.json') and LOCATION_SLUG.match(name[:-len('.json')]))
+
+    def _signature(self, slug):
+        return (_mtime(self.default_path), _mtime(self.path_for(slug)))
+
+    def _load(self, slug):
+        with open(self.default_path, encoding='utf-8') as f:
+            data = json.load(f)
+        with open(self.path_for(slug), encoding='utf-8') as f:
+            data.update(json.load(f))
+        return Catalog(data)
+
+    def get(self, slug=None):
+        """Catalog for an outlet (the default one for None); KeyError if it does not exist"""
+        now = time.monotonic()
+        if slug is None:
+            return self._get_default(now)
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is not None:
+                self._entries.move_to_end(slug)
+                if now - entry[2] < self.ttl:
+                    return entry[0]
+
+        if not self.exists(slug):
+            with self._lock:
+                self._entries.pop(slug, None)
+            raise KeyError(slug)
+        signature = self._signature(slug)
+        if entry is not None and entry[1] == signature:
+            catalog = entry[0]
+        else:
+            try:
+                catalog = self._load(slug)
+            except LOAD_ERRORS as e:
+                if entry is None:
+                    logger.error('Cannot load the catalog for %s: %s', slug, e)
+                    raise KeyError(slug) from e
+                # Half-written mid-edit: keep serving the last good data and look again after the TTL
+                logger.warning('Keeping the previous catalog for %s: %s', slug, e)
+                catalog, signature = entry[0], entry[1]
+
+        with self._lock:
+            self._entries[slug] = (catalog, signature, now)
+            self._entries.move_to_end(slug)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return catalog
+
+    def _get_default(self, now):
+        signature, checked = self._default_state
+        if now - checked < self.ttl:
+            return self.default
+        current = _mtime(self.default_path)
+        if current != signature:
+            try:
+                default = load_catalog(self.default_path)
+            except LOAD_ERRORS as e:
+                # Half-written or removed mid-edit: keep serving the last good data and look again later
+                logger.warning('Keeping the previous default catalog: %s', e)
+                current = signature
+            else:
+                with self._lock:
+                    self.default = default
+        self._default_state = (current, now)
+        return self.default
+
+    def clear(self):
+        """Drop the outlets and make the next access re-check the default catalog's file"""
+        with self._lock:
+            self._entries.clear()
+            # No signature: reload even when the edit fell within the file's mtime resolution
+            self._default_state = (None, float('-inf'))
+
+
+# The data as of import; code that must see later edits goes through catalogs.get()
+catalog = load_catalog()
+catalogs = CatalogRegistry(catalog)
@@ -0,0 +1,161 @@
+"""
+Image Integrity Checker for RootStatix Cuisine
+Verifies every image the catalogs and templates reference: that it exists, decodes,
+has the format its extension promises, the shape its slot expects and fits its byte budget
+"""
+
+import json
+import os
+import re
+import sys
+
+from PIL import Image, UnidentifiedImageError
+
+from asset_build import Job, build_arguments, run_jobs
+from catalog import catalogs
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(BASE_DIR, 'static', 'images')
+TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
+REPORT_PATH = os.path.join(BASE_DIR, 'build', 'image-report.json')
+
+# What each kind of image slot needs: aspect ratio (width / height) the cards
+# crop to, the smallest width that stays sharp there, and a byte budget
+ROLES = {
+    'dish': {'aspect': 3 / 2, 'min_width': 600, 'max_kb': 300},
+    'gallery': {'aspect': 4 / 3, 'min_width': 800, 'max_kb': 400},
+    'cuisine': {'aspect': 4 / 3, 'min_width': 800, 'max_kb': 400},
+    'page': {'aspect': None, 'min_width': 200, 'max_kb': 600},
+}
+ASPECT_TOLERANCE = 0.02
+
+FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.webp': 'WEBP', '.avif': 'AVIF'}
+
+STATIC_IMAGE = re.compile(r"""url_for\(\s*['"]static['"]\s*,\s*filename\s*=\s*['"]images/([^'"]+)['"]\s*\)""")
+
+
+def referenced_images():
+    """{filename: [(role, referrer), ...]} for the catalogs of every location and all templates"""
+    references = {}
+
+    def add(filename, role, referrer):
+        references.setdefault(filename, [])
+        if (role, referrer) not in references[filename]:
+            references[filename].append((role, referrer))
+
+    for slug in [None] + catalogs.slugs():
+        location = catalogs.get(slug)
+        source = 'catalog' if slug is None else f'locations/{slug}'
+        for dish in location.dishes:
+            add(dish.image, 'dish', f'{source}: menu')
+        for image in location.gallery:
+            add(image.src, 'gallery', f'{source}: gallery')
+        for cuisine in location.cuisines:
+            add(cuisine.image, 'cuisine', f'{source}: cuisines')
+
+    for root, _dirs, files in os.walk(TEMPLATE_DIR):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            with open(path, encoding='utf-8') as f:
+                source = f.read()
+            for match in STATIC_IMAGE.finditer(source):
+                add(match.group(1), 'page', os.path.relpath(path, BASE_DIR).replace(os.sep, '/'))
+    return references
+
+
+def expectations(roles):
+    """Combined requirements of every slot an image fills"""
+    rules = [ROLES[role] for role in roles]
+    return {
+        'aspects': sorted({rule['aspect'] for rule in rules if rule['aspect']}),
+        'min_width': max(rule['min_width'] for rule in rules),
+        'max_bytes': min(rule['max_kb'] for rule in rules) * 1024,
+    }
+
+
+def check_image(path, expected):
+    """Inspect one image file; returns its properties and a list of problems"""
+    result = {'format': None, 'width': None, 'height': None, 'bytes': None, 'problems': []}
+    problems = result['problems']
+    if not os.path.isfile(path):
+        problems.append('missing')
+        return result
+
+    result['bytes'] = os.path.getsize(path)
+    if result['bytes'] > expected['max_bytes']:
+        problems.append(f"{result['bytes'] / 1024:.0f} KB is over the {expected['max_bytes'] // 1024} KB budget")
+    try:
+        with Image.open(path) as image:
+            result['format'] = image.format
+            result['width'], result['height'] = image.size
+            # Decoding every pixel catches truncated files that open() alone accepts
+            image.load()
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError) as e:
+        problems.append(f'does not decode: {e}')
+        return result
+
+    expected_format = FORMATS.get(os.path.splitext(path)[1].lower())
+    if result['format'] != expected_format:
+        problems.append(f"{result['format']} data in a file named for {expected_format or 'an unknown format'}")
+    if result['width'] < expected['min_width']:
+        problems.append(f"{result['width']}px wide, below the {expected['min_width']}px its slot needs")
+    aspect = result['width'] / result['height']
+    for wanted in expected['aspects']:
+        if abs(aspect - wanted) / wanted > ASPECT_TOLERANCE:
+            problems.append(f"{result['width']}x{result['height']} does not fit a {wanted:.2f}:1 slot")
+    return result
+
+
+def check_job(filename, roles):
+    expected = expectations(roles)
+    path = os.path.join(IMAGES_DIR, filename)
+    # The expectations are job arguments, so tightening a rule rechecks every image it affects
+    return Job(filename, check_image, args=(path, expected), inputs=[path],
+               settings={'tolerance': ASPECT_TOLERANCE, 'formats': FORMATS})
+
+
+def write_report(report, path):
+    if path == '-':
+        print(json.dumps(report, indent=2))
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def check_all(force=False, workers=None, report_path=REPORT_PATH):
+    """Check every referenced image; returns True when all of them pass"""
+    # With the report on stdout, progress goes to stderr so the JSON stays parseable
+    log = sys.stderr if report_path == '-' else sys.stdout
+    print("🔍 Checking referenced images...\n", file=log)
+    references = referenced_images()
+    jobs = [check_job(filename, {role for role, _referrer in refs}) for filename, refs in sorted(references.items())]
+    build = run_jobs(jobs, 'check_images', workers=workers, force=force)
+
+    images = {}
+    for job in jobs:
+        result = build.results.get(job.name)
+        if result is None:
+            result = {'problems': [f'check failed: {build.failed.get(job.name)}']}
+        images[job.name] = dict(result, referenced_by=[referrer for _role, referrer in references[job.name]])
+        for problem in result['problems']:
+            print(f"❌ {job.name}: {problem}", file=log)
+
+    failed = sorted(name for name, image in images.items() if image['problems'])
+    write_report({'checked': len(images), 'failed': failed, 'images': images}, report_path)
+    print(f"\n{'✅' if not failed else '⚠️ '} {len(images) - len(failed)}/{len(images)} images passed "
+          f"({len(build.skipped)} unchanged since the last check)", file=log)
+    if report_path != '-':
+        print(f"📄 Report written to {os.path.relpath(report_path, BASE_DIR)}")
+    return not failed
+
+
+if __name__ == "__main__":
+    parser = build_arguments('Check that every referenced image exists, decodes and fits its slot')
+    parser.add_argument('--report', default=REPORT_PATH, help='JSON report path, or - for stdout')
+    args = parser.parse_args()
+    if not check_all(force=args.force, workers=args.jobs, report_path=args.report):
+        raise SystemExit(1)
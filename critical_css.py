@@ -0,0 +1,50 @@
+"""
+RootStatix Cuisine - Critical CSS
+Inlines the above-the-fold rules from build_critical_css.py into each rendered page
+"""
+
+import os
+import threading
+
+from flask import before_render_template
+from markupsafe import Markup
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CRITICAL_DIR = os.path.join(BASE_DIR, 'build', 'critical')
+
+
+class CriticalCSS:
+    """Per-template critical CSS, read on first use and re-read when the build replaces a file"""
+
+    def __init__(self, directory=CRITICAL_DIR):
+        self.directory = directory
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, template_name):
+        """Critical CSS for a template as Markup, or None when it has not been built"""
+        path = os.path.join(self.directory, os.path.splitext(template_name)[0] + '.css')
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        cached = self._entries.get(template_name)
+        if cached is None or cached[0] != mtime:
+            with self._lock:
+                with open(path, encoding='utf-8') as f:
+                    cached = (mtime, Markup(f.read().strip()))
+                self._entries[template_name] = cached
+        return cached[1] or None
+
+
+critical = CriticalCSS()
+
+
+def init_app(app):
+    """Expose `critical_css` to every template rendered through render_template"""
+
+    def inject_critical_css(sender, template, context, **extra):
+        if template.name and 'critical_css' not in context:
+            context['critical_css'] = critical.get(template.name)
+
+    before_render_template.connect(inject_critical_css, app, weak=False)
@@ -3,29 +3,9 @@ Download Real Food & Restaurant Images for Chill Pill Café
 Uses Foodish API and specific food image sources
 """
 
-import urllib.request
-import os
 from pathlib import Path
-import time
 
-def download_image(url, filepath):
-    """Download an image from URL to filepath"""
-    try:
-        req = urllib.request.Request(
-            url,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-        )
-        with urllib.request.urlopen(req, timeout=10) as response:
-            with open(filepath, 'wb') as out_file:
-                out_file.write(response.read())
-        print(f"✓ Downloaded: {os.path.basename(filepath)}")
-        time.sleep(0.5)  # Be respectful to the server
-        return True
-    except Exception as e:
-        print(f"✗ Failed {os.path.basename(filepath)}: {str(e)}")
-        return False
+from downloader import download_images
 
 # Create images directory
 images_dir = Path("static/images")
@@ -122,15 +102,9 @@ images = {
 }
 
 # Download all images
-success_count = 0
-failed_count = 0
-
-for filename, url in images.items():
-    filepath = images_dir / filename
-    if download_image(url, filepath):
-        success_count += 1
-    else:
-        failed_count += 1
+results = download_images(images, str(images_dir))
+failed_count = sum(1 for status in results.values() if status == 'failed')
+success_count = len(results) - failed_count
 
 print(f"\n{'='*60}")
 print(f"✅ Successfully downloaded: {success_count} images")
@@ -4,8 +4,8 @@ Uses Unsplash API and Placeholder services for realistic restaurant images
 """
 
 import os
-import urllib.request
-from pathlib import Path
+
+from downloader import download_images
 
 def create_image_directory():
     """Create images directory if it doesn't exist"""
@@ -14,17 +14,6 @@ def create_image_directory():
         os.makedirs(img_dir)
     return img_dir
 
-def download_image(url, filename, img_dir):
-    """Download image from URL"""
-    try:
-        filepath = os.path.join(img_dir, filename)
-        urllib.request.urlretrieve(url, filepath)
-        print(f"✅ Downloaded: {filename}")
-        return True
-    except Exception as e:
-        print(f"❌ Failed to download {filename}: {str(e)}")
-        return False
-
 def download_all_images():
     """Download all restaurant images from placeholder services"""
     img_dir = create_image_directory()
@@ -108,13 +97,10 @@ def download_all_images():
         'insta_6.jpg': 'https://picsum.photos/500/500?random=52',
     }
     
-    success_count = 0
+    results = download_images(images, img_dir)
+    success_count = sum(1 for status in results.values() if status != 'failed')
     total = len(images)
     
-    for filename, url in images.items():
-        if download_image(url, filename, img_dir):
-            success_count += 1
-    
     print(f"\n{'='*50}")
     print(f"✅ Successfully downloaded {success_count}/{total} images")
     print(f"📁 Images saved in: {img_dir}")
@@ -0,0 +1,302 @@
+"""
+RootStatix Cuisine - Image Downloader
+Concurrent, resumable downloads shared by the download_*.py scripts
+"""
+
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+MANIFEST_NAME = '.downloads.json'
+CHUNK_SIZE = 64 * 1024
+MAX_REDIRECTS = 5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class DownloadError(Exception):
+    """A download that should not be retried, or that ran out of retries"""
+
+
+class RetryableError(Exception):
+    """A transient failure; `delay` overrides the backoff when the server asked for one"""
+
+    def __init__(self, message, delay=None):
+        super().__init__(message)
+        self.delay = delay
+
+
+class HostLimiter:
+    """Spaces out request starts to the same host by at least `min_interval` seconds"""
+
+    def __init__(self, min_interval=0.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = {}
+
+    def wait(self, host):
+        if not self.min_interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class Downloader:
+    """Fetches many URLs over reused keep-alive connections with conditional requests"""
+
+    def __init__(self, dest_dir, workers=8, min_interval=0.1, retries=3,
+                 backoff=0.5, timeout=15, manifest_path=None):
+        self.dest_dir = dest_dir
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = HostLimiter(min_interval)
+        self.manifest_path = manifest_path or os.path.join(dest_dir, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+        self._manifest_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with self._manifest_lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+
+    def _connection(self, scheme, netloc):
+        """This thread's keep-alive connection to a host, opened on first use"""
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        key = (scheme, netloc)
+        if key not in connections:
+            cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            connections[key] = cls(netloc, timeout=self.timeout)
+        return connections[key]
+
+    def _drop_connection(self, scheme, netloc):
+        connection = getattr(self._local, 'connections', {}).pop((scheme, netloc), None)
+        if connection is not None:
+            connection.close()
+
+    def _request(self, url, headers):
+        """Send a GET, following redirects; returns (response, final_url)"""
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            path = parts.path or '/'
+            if parts.query:
+                path += '?' + parts.query
+            self.limiter.wait(parts.netloc)
+            connection = self._connection(parts.scheme, parts.netloc)
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+            except (http.client.HTTPException, OSError) as e:
+                self._drop_connection(parts.scheme, parts.netloc)
+                raise RetryableError(f'{type(e).__name__}: {e}')
+
+            if response.status in (301, 302, 303, 307, 308):
+                location = response.getheader('Location')
+                response.read()
+                if not location:
+                    raise DownloadError(f'HTTP {response.status} without Location')
+                url = urljoin(url, location)
+                continue
+            if response.getheader('Connection', '').lower() == 'close':
+                # The server will not reuse this socket; close it once the body is read
+                # (the response keeps its own reference) and open a fresh one next time
+                self._drop_connection(parts.scheme, parts.netloc)
+            return response, url
+        raise DownloadError('Too many redirects')
+
+    def _fetch_once(self, filename, url):
+        dest = os.path.join(self.dest_dir, filename)
+        part = dest + '.part'
+        entry = self.manifest.get(filename, {})
+        partial = _read_partial(part)
+        headers = {'User-Agent': USER_AGENT, 'Accept-Encoding': 'identity'}
+
+        offset = os.path.getsize(part) if os.path.exists(part) and partial.get('url') == url else 0
+        if offset and partial.get('validator'):
+            # Resume only if the remote file is still the one we started
+            headers['Range'] = f'bytes={offset}-'
+            headers['If-Range'] = partial['validator']
+        else:
+            offset = 0
+            if entry.get('url') == url and os.path.exists(dest):
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    headers['If-Modified-Since'] = entry['last_modified']
+
+        response, final_url = self._request(url, headers)
+        status = response.status
+        if status == 304:
+            response.read()
+            return 'not_modified'
+        if status in RETRY_STATUSES:
+            response.read()
+            raise RetryableError(f'HTTP {status}', _retry_after(response.getheader('Retry-After')))
+        if status not in (200, 206):
+            response.read()
+            raise DownloadError(f'HTTP {status}')
+
+        etag = response.getheader('ETag')
+        last_modified = response.getheader('Last-Modified')
+        resumed = status == 206 and offset > 0
+        if resumed and _range_start(response.getheader('Content-Range')) != offset:
+            response.read()
+            _discard_partial(part)
+            raise RetryableError(f"Range mismatch: asked for byte {offset}, "
+                                 f"got {response.getheader('Content-Range')!r}")
+        if not resumed:
+            # Recorded before the first byte lands, so a killed run can still resume
+            # If-Range only accepts strong validators; a weak ETag falls back to Last-Modified
+            validator = etag if etag and not etag.startswith('W/') else last_modified
+            _write_partial(part, url, validator)
+
+        mode = 'ab' if resumed else 'wb'
+        received = offset if resumed else 0
+        try:
+            with open(part, mode) as f:
+                while True:
+                    chunk = response.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    received += len(chunk)
+        except (http.client.HTTPException, OSError) as e:
+            parts = urlsplit(final_url)
+            self._drop_connection(parts.scheme, parts.netloc)
+            raise RetryableError(f'Interrupted after {received} bytes: {e}')
+
+        length = response.getheader('Content-Length')
+        if length is not None and received - (offset if resumed else 0) != int(length):
+            parts = urlsplit(final_url)
+            self._drop_connection(parts.scheme, parts.netloc)
+            raise RetryableError(f'Short read: got {received} bytes')
+
+        os.replace(part, dest)
+        _discard_partial(part)
+        with self._manifest_lock:
+            self.manifest[filename] = {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'bytes': received,
+            }
+        return 'resumed' if resumed else 'downloaded'
+
+    def fetch(self, filename, url):
+        """Download one file with retries; returns (filename, status, detail)"""
+        for attempt in range(self.retries + 1):
+            try:
+                return filename, self._fetch_once(filename, url), None
+            except RetryableError as e:
+                if attempt == self.retries:
+                    return filename, 'failed', str(e)
+                delay = e.delay if e.delay is not None else self.backoff * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, self.backoff))
+            except DownloadError as e:
+                return filename, 'failed', str(e)
+        return filename, 'failed', 'retries exhausted'
+
+    def download_all(self, images, on_result=None):
+        """Download a {filename: url} mapping concurrently; returns {filename: status}"""
+        os.makedirs(self.dest_dir, exist_ok=True)
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self.fetch, filename, url) for filename, url in images.items()]
+            for future in as_completed(futures):
+                filename, status, detail = future.result()
+                results[filename] = status
+                if status in ('downloaded', 'resumed'):
+                    # Record each file as it lands, so an interrupted run does not fetch it again
+                    self._save_manifest()
+                if on_result:
+                    on_result(filename, status, detail)
+        return results
+
+
+def _partial_path(part):
+    return part + '.json'
+
+
+def _read_partial(part):
+    """{'url': ..., 'validator': ...} saved when a .part file was started, or {}"""
+    try:
+        with open(_partial_path(part), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_partial(part, url, validator):
+    tmp_path = _partial_path(part) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'url': url, 'validator': validator}, f)
+    os.replace(tmp_path, _partial_path(part))
+
+
+def _discard_partial(part):
+    for path in (part, _partial_path(part)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _range_start(value):
+    """First byte position of a `Content-Range: bytes start-end/total` header, or None"""
+    try:
+        unit, _, spec = value.partition(' ')
+        return int(spec.split('-', 1)[0]) if unit == 'bytes' else None
+    except (AttributeError, ValueError):
+        return None
+
+
+def _retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def print_result(filename, status, detail):
+    """Console reporter in the style of the download scripts"""
+    if status == 'failed':
+        print(f"✗ Failed {filename}: {detail}")
+    elif status == 'not_modified':
+        print(f"= Unchanged: {filename}")
+    else:
+        print(f"✓ Downloaded: {filename}" + (" (resumed)" if status == 'resumed' else ""))
+
+
+def download_images(images, dest_dir='static/images', **options):
+    """Download a {filename: url} mapping and print progress; returns {filename: status}"""
+    return Downloader(dest_dir, **options).download_all(images, on_result=print_result)
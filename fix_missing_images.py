@@ -1,21 +1,7 @@
 """Fix failed images with alternative URLs"""
-import urllib.request
-import os
 from pathlib import Path
-import time
 
-def download_image(url, filepath):
-    try:
-        req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-        with urllib.request.urlopen(req, timeout=10) as response:
-            with open(filepath, 'wb') as out_file:
-                out_file.write(response.read())
-        print(f"✓ Downloaded: {os.path.basename(filepath)}")
-        time.sleep(0.5)
-        return True
-    except Exception as e:
-        print(f"✗ Failed {os.path.basename(filepath)}: {str(e)}")
-        return False
+from downloader import download_images
 
 images_dir = Path("static/images")
 
@@ -32,8 +18,6 @@ failed_images = {
 
 print("\n🔄 Downloading missing images...\n")
 
-for filename, url in failed_images.items():
-    filepath = images_dir / filename
-    download_image(url, filepath)
+download_images(failed_images, str(images_dir))
 
 print("\n✅ All missing images downloaded!")
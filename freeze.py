@@ -0,0 +1,228 @@
+"""
+Static Site Freezer for RootStatix Cuisine
+Pre-renders the read-only pages to HTML for a CDN and routes everything else to the Flask function
+"""
+
+import json
+import os
+import re
+
+from flask import url_for
+from jinja2 import meta
+
+import critical_css
+import preload
+import responsive
+import static_assets
+import webfonts
+from asset_build import Job, build_arguments, run_jobs
+from catalog import DATA_FILE, catalogs
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
+OUTPUT_DIR = os.path.join(BASE_DIR, 'build', 'site')
+# The committed config serves everything from Flask and works from a plain git checkout; the
+# CDN config routing to the frozen pages is generated next to them, since build/ is not committed
+VERCEL_CONFIG = os.path.join(BASE_DIR, 'vercel.json')
+DEPLOY_CONFIG = os.path.join(BASE_DIR, 'build', 'vercel.json')
+
+# Endpoints whose output depends only on bundled data, and the template each renders
+FROZEN_ENDPOINTS = {
+    'index': 'index.html',
+    'about': 'about.html',
+    'menu': 'menu.html',
+    'gallery': 'gallery.html',
+    'cuisine': 'cuisine.html',
+    'why_us': 'why_us.html',
+    'contact': 'contact.html',
+}
+NOT_FOUND_TEMPLATE = '404.html'
+NOT_FOUND_PATH = '/__frozen-404__'
+
+# Code every page is rendered through; changing any of it refreezes the site
+RUNTIME_MODULES = ('app.py', 'catalog.py', 'responsive.py', 'static_assets.py', 'critical_css.py',
+                   'webfonts.py', 'render_cache.py')
+
+# Query strings on these endpoints select other content, so those requests still reach Python
+QUERY_ENDPOINTS = {'gallery': ('category', 'page')}
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+_client = None
+
+
+def _app():
+    # Rendering must never touch the real reservation database
+    os.environ.setdefault('RESERVATION_STORE', 'memory://')
+    from app import app
+    return app
+
+
+def output_path(url_path):
+    """File a page is frozen to, mirroring its URL (/about -> about/index.html)"""
+    if url_path == NOT_FOUND_PATH:
+        return os.path.join(OUTPUT_DIR, '404.html')
+    return os.path.join(OUTPUT_DIR, *url_path.strip('/').split('/'), 'index.html')
+
+
+def freeze_page(url_path, output, expected_status=200):
+    """Render one page through the app and write it; returns its size in bytes"""
+    global _client
+    if _client is None:
+        _client = _app().test_client(use_cookies=False)
+    response = _client.get(url_path)
+    if response.status_code != expected_status:
+        raise RuntimeError(f'{url_path} returned {response.status_code}, expected {expected_status}')
+    body = response.get_data()
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    tmp_path = output + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_path, output)
+    return len(body)
+
+
+def template_dependencies(env, name, seen=None):
+    """A template plus every template it extends, includes or imports"""
+    seen = set() if seen is None else seen
+    if name in seen:
+        return seen
+    seen.add(name)
+    source = env.loader.get_source(env, name)[0]
+    for referenced in meta.find_referenced_templates(env.parse(source)):
+        if referenced:
+            template_dependencies(env, referenced, seen)
+    return seen
+
+
+def frozen_pages(app):
+    """(url path, endpoint, template, location) for every page to freeze, default outlet first"""
+    pages = []
+    with app.test_request_context():
+        for location in [None] + catalogs.slugs():
+            for endpoint, template in FROZEN_ENDPOINTS.items():
+                url = url_for(endpoint, location=location) if location else url_for(endpoint)
+                pages.append((url, endpoint, template, location))
+    pages.append((NOT_FOUND_PATH, None, NOT_FOUND_TEMPLATE, None))
+    return pages
+
+
+def page_job(app, url_path, template, location):
+    templates = sorted(template_dependencies(app.jinja_env, template))
+    inputs = [os.path.join(TEMPLATE_DIR, name) for name in templates]
+    inputs += [DATA_FILE, responsive.MANIFEST_PATH, static_assets.MANIFEST_PATH, webfonts.MANIFEST_PATH,
+               os.path.join(critical_css.CRITICAL_DIR, os.path.splitext(template)[0] + '.css')]
+    inputs += [os.path.join(BASE_DIR, name) for name in RUNTIME_MODULES]
+    if location:
+        inputs.append(catalogs.path_for(location))
+    output = output_path(url_path)
+    return Job(
+        name=url_path if url_path != NOT_FOUND_PATH else '404',
+        func=freeze_page,
+        args=(url_path, output, 404 if url_path == NOT_FOUND_PATH else 200),
+        inputs=inputs,
+        outputs=(output,),
+    )
+
+
+def _site_path(path):
+    return '/' + os.path.relpath(path, BASE_DIR).replace(os.sep, '/')
+
+
+def _literal(path):
+    return re.sub(r'([.^$*+?()\[\]{}|\\])', r'\\\1', path)
+
+
+def _rule_pattern(rule):
+    """Vercel route regex for a Werkzeug rule such as /api/menu/<category>"""
+    return '^' + '[^/]+'.join(_literal(part) for part in re.split(r'<[^>]+>', rule)) + '/?$'
+
+
+def vercel_routes(app, pages):
+    """Static files and frozen pages from the CDN; everything else from the Flask function"""
+    routes = [
+        {'src': '^/static/dist/(.*)$', 'headers': {'Cache-Control': IMMUTABLE}, 'dest': '/static/dist/$1'},
+        {'src': '^/static/(.*)$', 'dest': '/static/$1'},
+    ]
+    # Variants selected by query string are not frozen
+    for url, endpoint, _template, _location in pages:
+        for key in QUERY_ENDPOINTS.get(endpoint, ()):
+            routes.append({'src': f'^{_literal(url)}/?$', 'has': [{'type': 'query', 'key': key}],
+                           'dest': 'app.py'})
+    for url, endpoint, _template, _location in pages:
+        if url != NOT_FOUND_PATH:
+            pattern = '^/$' if url == '/' else f'^{_literal(url)}/?$'
+            route = {'src': pattern, 'dest': _site_path(output_path(url))}
+            # The CDN sends the same preload hints the app adds to its responses
+            with app.test_request_context(url):
+                links = preload.links(endpoint)
+            if links:
+                route['headers'] = {'Link': ', '.join(links)}
+            routes.append(route)
+
+    frozen = set(FROZEN_ENDPOINTS) | {'static'}
+    dynamic = sorted({rule.rule for rule in app.url_map.iter_rules() if rule.endpoint not in frozen})
+    routes += [{'src': _rule_pattern(rule), 'dest': 'app.py'} for rule in dynamic]
+    routes.append({'src': '/.*', 'status': 404, 'dest': _site_path(output_path(NOT_FOUND_PATH))})
+    return routes
+
+
+def write_vercel_config(routes, source=VERCEL_CONFIG, path=DEPLOY_CONFIG):
+    """The committed config with CDN builds and the generated routes, for `vercel deploy --local-config`"""
+    with open(source, encoding='utf-8') as f:
+        config = json.load(f)
+    builds = [build for build in config.get('builds', []) if build.get('use') != '@vercel/static']
+    builds += [{'src': 'static/**', 'use': '@vercel/static'},
+               {'src': _site_path(OUTPUT_DIR).lstrip('/') + '/**', 'use': '@vercel/static'}]
+    config['builds'] = builds
+    config['routes'] = routes
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def prune(keep):
+    """Remove frozen pages that no longer exist, e.g. of a closed outlet"""
+    removed = 0
+    for root, _dirs, files in os.walk(OUTPUT_DIR, topdown=False):
+        for name in files:
+            path = os.path.join(root, name)
+            if path not in keep:
+                os.remove(path)
+                removed += 1
+        if root != OUTPUT_DIR and not os.listdir(root):
+            os.rmdir(root)
+    return removed
+
+
+def freeze(force=False, workers=None):
+    """Freeze every read-only page and write the deploy config; returns True when all succeeded"""
+    app = _app()
+    if not os.path.exists(static_assets.MANIFEST_PATH):
+        print("⚠️  static/dist has not been built; frozen pages will reference unhashed assets\n")
+
+    print("🧊 Freezing read-only pages...\n")
+    pages = frozen_pages(app)
+    jobs = [page_job(app, url, template, location) for url, _endpoint, template, location in pages]
+    report = run_jobs(jobs, 'freeze', workers=workers, force=force)
+    for name in sorted(report.timings):
+        print(f"✅ {name}: {report.results[name] / 1024:.1f} KB")
+    removed = prune({job.outputs[0] for job in jobs})
+    if removed:
+        print(f"🗑️  Removed {removed} stale pages")
+    report.print_summary()
+    if report.failed:
+        return False
+
+    write_vercel_config(vercel_routes(app, pages))
+    print(f"\n📁 Site written to {os.path.relpath(OUTPUT_DIR, BASE_DIR)}; deploy it with "
+          f"`vercel deploy --prod --local-config {os.path.relpath(DEPLOY_CONFIG, BASE_DIR)}`")
+    return True
+
+
+if __name__ == "__main__":
+    args = build_arguments('Pre-render the read-only pages to static HTML').parse_args()
+    if not freeze(force=args.force, workers=args.jobs):
+        raise SystemExit(1)
@@ -6,27 +6,67 @@ Creates placeholder images with gradients and text for the restaurant website
 from PIL import Image, ImageDraw, ImageFont
 import os
 
+from asset_build import Job, build_arguments, run_jobs
+
+IMG_DIR = 'static/images'
+
 def create_image_directory():
     """Create images directory if it doesn't exist"""
-    img_dir = 'static/images'
+    img_dir = IMG_DIR
     if not os.path.exists(img_dir):
         os.makedirs(img_dir)
     return img_dir
 
-def create_gradient_image(width, height, color1, color2, filename, text=""):
+def _normalize_stops(stops):
+    """Accept plain colours (evenly spaced) or (position, colour) pairs"""
+    if not stops:
+        raise ValueError("A gradient needs at least one colour stop")
+    if all(len(stop) == 2 for stop in stops):
+        return sorted((float(position), tuple(color)) for position, color in stops)
+    last = len(stops) - 1
+    # A single colour is a solid fill
+    return [(i / last if last else 0.0, tuple(color)) for i, color in enumerate(stops)]
+
+def gradient_color(stops, ratio):
+    """Colour at `ratio` (0..1) along normalized stops, truncated like the original renderer"""
+    for (start, color1), (end, color2) in zip(stops, stops[1:]):
+        if ratio <= end or end == stops[-1][0]:
+            local = (ratio - start) / (end - start) if end > start else 0.0
+            local = min(max(local, 0.0), 1.0)
+            return tuple(int(a * (1 - local) + b * local) for a, b in zip(color1, color2))
+    return stops[-1][1]
+
+def render_gradient(width, height, stops, direction='vertical'):
+    """Render a gradient image in a single pass
+
+    `stops` is a sequence of RGB colours, or of (position, colour) pairs with
+    positions from 0 to 1. `direction` is 'vertical', 'horizontal' or
+    'diagonal' (top-left to bottom-right).
+    """
+    stops = _normalize_stops(stops)
+    if direction not in ('vertical', 'horizontal', 'diagonal'):
+        raise ValueError(f"Unknown gradient direction: {direction!r}")
+    if len(stops) == 1:
+        return Image.new('RGB', (width, height), stops[0][1])
+    if direction in ('vertical', 'horizontal'):
+        # One exact colour per row (or column), stretched across the image
+        length = height if direction == 'vertical' else width
+        strip = b''.join(bytes(gradient_color(stops, i / length)) for i in range(length))
+        size = (1, length) if direction == 'vertical' else (length, 1)
+        return Image.frombytes('RGB', size, strip).resize((width, height), Image.NEAREST)
+    # Diagonal: the colour depends only on x + y, so every row is a window onto one
+    # strip running from the top-left pixel (0) to the bottom-right one (1)
+    span = (width - 1) + (height - 1)
+    strip = b''.join(bytes(gradient_color(stops, i / span if span else 0.0)) for i in range(span + 1))
+    rows = b''.join(strip[3 * y:3 * (y + width)] for y in range(height))
+    return Image.frombytes('RGB', (width, height), rows)
+
+def create_gradient_image(width, height, color1, color2, filename, text="", direction='vertical'):
     """Create a beautiful gradient image with optional text"""
     img_dir = create_image_directory()
-    image = Image.new('RGB', (width, height))
+    image = render_gradient(width, height, (color1, color2), direction)
     draw = ImageDraw.Draw(image)
     
-    # Create gradient
-    for y in range(height):
-        ratio = y / height
-        r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-        g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-        b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-        draw.rectangle([(0, y), (width, y + 1)], fill=(r, g, b))
-    
     # Add text if provided
     if text:
         try:
@@ -95,8 +135,18 @@ def create_logo():
     image.save(filepath, 'PNG')
     print(f"Created: {filepath}")
 
-def generate_all_images():
+def gradient_job(width, height, color1, color2, filename, text=""):
+    """Describe one create_gradient_image call as a build job"""
+    return Job(
+        filename,
+        create_gradient_image,
+        args=(width, height, color1, color2, filename, text),
+        outputs=[os.path.join(IMG_DIR, filename)],
+    )
+
+def generate_all_images(force=False, workers=None):
     """Generate all required images for the website"""
+    jobs = []
     
     # Color schemes
     green_brown = ((44, 95, 45), (139, 69, 19))
@@ -108,78 +158,86 @@ def generate_all_images():
     print("Generating images for Chill Pill Café...")
     
     # Create logo
-    create_logo()
+    jobs.append(Job('logo.png', create_logo, outputs=[os.path.join(IMG_DIR, 'logo.png')]))
     
     # Hero and Header Images
-    create_gradient_image(1920, 1080, green_brown[0], green_brown[1], 'hero_ambience.jpg', '')
-    create_gradient_image(1920, 600, green_brown[0], green_brown[1], 'about_header.jpg', 'About Us')
-    create_gradient_image(1920, 600, cool_green[0], cool_green[1], 'menu_header.jpg', 'Our Menu')
-    create_gradient_image(1920, 600, warm_earth[0], warm_earth[1], 'reservation_header.jpg', 'Reserve')
-    create_gradient_image(1920, 600, elegant_gray[0], elegant_gray[1], 'gallery_header.jpg', 'Gallery')
-    create_gradient_image(1920, 600, green_brown[0], green_brown[1], 'cuisine_header.jpg', 'Cuisines')
-    create_gradient_image(1920, 600, cool_green[0], cool_green[1], 'whyus_header.jpg', 'Why Us')
-    create_gradient_image(1920, 600, warm_earth[0], warm_earth[1], 'contact_header.jpg', 'Contact')
-    create_gradient_image(1920, 600, green_brown[0], green_brown[1], 'feedback_header.jpg', 'Feedback')
+    jobs.append(gradient_job(1920, 1080, green_brown[0], green_brown[1], 'hero_ambience.jpg', ''))
+    jobs.append(gradient_job(1920, 600, green_brown[0], green_brown[1], 'about_header.jpg', 'About Us'))
+    jobs.append(gradient_job(1920, 600, cool_green[0], cool_green[1], 'menu_header.jpg', 'Our Menu'))
+    jobs.append(gradient_job(1920, 600, warm_earth[0], warm_earth[1], 'reservation_header.jpg', 'Reserve'))
+    jobs.append(gradient_job(1920, 600, elegant_gray[0], elegant_gray[1], 'gallery_header.jpg', 'Gallery'))
+    jobs.append(gradient_job(1920, 600, green_brown[0], green_brown[1], 'cuisine_header.jpg', 'Cuisines'))
+    jobs.append(gradient_job(1920, 600, cool_green[0], cool_green[1], 'whyus_header.jpg', 'Why Us'))
+    jobs.append(gradient_job(1920, 600, warm_earth[0], warm_earth[1], 'contact_header.jpg', 'Contact'))
+    jobs.append(gradient_job(1920, 600, green_brown[0], green_brown[1], 'feedback_header.jpg', 'Feedback'))
     
     # Food Images - Starters
-    create_gradient_image(600, 400, food_warm[0], food_warm[1], 'bruschetta.jpg', 'Bruschetta')
-    create_gradient_image(600, 400, (230, 126, 34), (211, 84, 0), 'paneer_tikka.jpg', 'Paneer Tikka')
-    create_gradient_image(600, 400, (192, 57, 43), (142, 68, 173), 'chicken_wings.jpg', 'Wings')
-    create_gradient_image(600, 400, warm_earth[0], warm_earth[1], 'mezze_platter.jpg', 'Mezze')
+    jobs.append(gradient_job(600, 400, food_warm[0], food_warm[1], 'bruschetta.jpg', 'Bruschetta'))
+    jobs.append(gradient_job(600, 400, (230, 126, 34), (211, 84, 0), 'paneer_tikka.jpg', 'Paneer Tikka'))
+    jobs.append(gradient_job(600, 400, (192, 57, 43), (142, 68, 173), 'chicken_wings.jpg', 'Wings'))
+    jobs.append(gradient_job(600, 400, warm_earth[0], warm_earth[1], 'mezze_platter.jpg', 'Mezze'))
     
     # Food Images - Main Course
-    create_gradient_image(600, 400, (231, 76, 60), (230, 126, 34), 'butter_chicken.jpg', 'Butter Chicken')
-    create_gradient_image(600, 400, (241, 196, 15), (243, 156, 18), 'risotto.jpg', 'Risotto')
-    create_gradient_image(600, 400, (52, 152, 219), (41, 128, 185), 'seabass.jpg', 'Sea Bass')
-    create_gradient_image(600, 400, (211, 84, 0), (230, 126, 34), 'dal_makhani.jpg', 'Dal Makhani')
-    create_gradient_image(600, 400, elegant_gray[0], elegant_gray[1], 'truffle_pasta.jpg', 'Truffle Pasta')
+    jobs.append(gradient_job(600, 400, (231, 76, 60), (230, 126, 34), 'butter_chicken.jpg', 'Butter Chicken'))
+    jobs.append(gradient_job(600, 400, (241, 196, 15), (243, 156, 18), 'risotto.jpg', 'Risotto'))
+    jobs.append(gradient_job(600, 400, (52, 152, 219), (41, 128, 185), 'seabass.jpg', 'Sea Bass'))
+    jobs.append(gradient_job(600, 400, (211, 84, 0), (230, 126, 34), 'dal_makhani.jpg', 'Dal Makhani'))
+    jobs.append(gradient_job(600, 400, elegant_gray[0], elegant_gray[1], 'truffle_pasta.jpg', 'Truffle Pasta'))
     
     # Food Images - Desserts
-    create_gradient_image(600, 400, (155, 89, 182), (142, 68, 173), 'tiramisu.jpg', 'Tiramisu')
-    create_gradient_image(600, 400, warm_earth[0], warm_earth[1], 'gulab_jamun_cheesecake.jpg', 'Fusion Dessert')
-    create_gradient_image(600, 400, (52, 73, 94), (44, 62, 80), 'lava_cake.jpg', 'Lava Cake')
+    jobs.append(gradient_job(600, 400, (155, 89, 182), (142, 68, 173), 'tiramisu.jpg', 'Tiramisu'))
+    jobs.append(gradient_job(600, 400, warm_earth[0], warm_earth[1], 'gulab_jamun_cheesecake.jpg', 'Fusion Dessert'))
+    jobs.append(gradient_job(600, 400, (52, 73, 94), (44, 62, 80), 'lava_cake.jpg', 'Lava Cake'))
     
     # Food Images - Beverages
-    create_gradient_image(600, 400, (241, 196, 15), (243, 156, 18), 'latte.jpg', 'Latte')
-    create_gradient_image(600, 400, (211, 84, 0), (230, 126, 34), 'masala_chai.jpg', 'Chai')
-    create_gradient_image(600, 400, (46, 204, 113), (39, 174, 96), 'lime_soda.jpg', 'Lime Soda')
-    create_gradient_image(600, 400, (255, 195, 0), (251, 140, 0), 'mango_lassi.jpg', 'Mango Lassi')
+    jobs.append(gradient_job(600, 400, (241, 196, 15), (243, 156, 18), 'latte.jpg', 'Latte'))
+    jobs.append(gradient_job(600, 400, (211, 84, 0), (230, 126, 34), 'masala_chai.jpg', 'Chai'))
+    jobs.append(gradient_job(600, 400, (46, 204, 113), (39, 174, 96), 'lime_soda.jpg', 'Lime Soda'))
+    jobs.append(gradient_job(600, 400, (255, 195, 0), (251, 140, 0), 'mango_lassi.jpg', 'Mango Lassi'))
     
     # Gallery Images
-    create_gradient_image(800, 600, cool_green[0], cool_green[1], 'gallery_ambience_1.jpg', 'Ambience')
-    create_gradient_image(800, 600, green_brown[0], green_brown[1], 'gallery_ambience_2.jpg', 'Interior')
-    create_gradient_image(800, 600, elegant_gray[0], elegant_gray[1], 'gallery_ambience_3.jpg', 'Seating')
-    create_gradient_image(800, 600, food_warm[0], food_warm[1], 'gallery_food_1.jpg', 'Food Art')
-    create_gradient_image(800, 600, (230, 126, 34), (192, 57, 43), 'gallery_food_2.jpg', 'Fresh')
-    create_gradient_image(800, 600, (155, 89, 182), (142, 68, 173), 'gallery_food_3.jpg', 'Desserts')
-    create_gradient_image(800, 600, warm_earth[0], warm_earth[1], 'gallery_interior_1.jpg', 'Bar')
-    create_gradient_image(800, 600, green_brown[0], green_brown[1], 'gallery_interior_2.jpg', 'Dining')
-    create_gradient_image(800, 600, (52, 152, 219), (41, 128, 185), 'gallery_event_1.jpg', 'Events')
-    create_gradient_image(800, 600, (231, 76, 60), (192, 57, 43), 'gallery_event_2.jpg', 'Celebration')
+    jobs.append(gradient_job(800, 600, cool_green[0], cool_green[1], 'gallery_ambience_1.jpg', 'Ambience'))
+    jobs.append(gradient_job(800, 600, green_brown[0], green_brown[1], 'gallery_ambience_2.jpg', 'Interior'))
+    jobs.append(gradient_job(800, 600, elegant_gray[0], elegant_gray[1], 'gallery_ambience_3.jpg', 'Seating'))
+    jobs.append(gradient_job(800, 600, food_warm[0], food_warm[1], 'gallery_food_1.jpg', 'Food Art'))
+    jobs.append(gradient_job(800, 600, (230, 126, 34), (192, 57, 43), 'gallery_food_2.jpg', 'Fresh'))
+    jobs.append(gradient_job(800, 600, (155, 89, 182), (142, 68, 173), 'gallery_food_3.jpg', 'Desserts'))
+    jobs.append(gradient_job(800, 600, warm_earth[0], warm_earth[1], 'gallery_interior_1.jpg', 'Bar'))
+    jobs.append(gradient_job(800, 600, green_brown[0], green_brown[1], 'gallery_interior_2.jpg', 'Dining'))
+    jobs.append(gradient_job(800, 600, (52, 152, 219), (41, 128, 185), 'gallery_event_1.jpg', 'Events'))
+    jobs.append(gradient_job(800, 600, (231, 76, 60), (192, 57, 43), 'gallery_event_2.jpg', 'Celebration'))
     
     # About Page Images
-    create_gradient_image(800, 600, green_brown[0], green_brown[1], 'founders.jpg', 'Founders')
-    create_gradient_image(800, 600, elegant_gray[0], elegant_gray[1], 'interior_elegant.jpg', 'Elegant Interior')
-    create_gradient_image(600, 600, warm_earth[0], warm_earth[1], 'chef_vikram.jpg', 'Chef Vikram')
-    create_gradient_image(600, 600, cool_green[0], cool_green[1], 'meera_kapoor.jpg', 'Meera Kapoor')
-    create_gradient_image(600, 600, food_warm[0], food_warm[1], 'pastry_chef.jpg', 'Pastry Chef')
+    jobs.append(gradient_job(800, 600, green_brown[0], green_brown[1], 'founders.jpg', 'Founders'))
+    jobs.append(gradient_job(800, 600, elegant_gray[0], elegant_gray[1], 'interior_elegant.jpg', 'Elegant Interior'))
+    jobs.append(gradient_job(600, 600, warm_earth[0], warm_earth[1], 'chef_vikram.jpg', 'Chef Vikram'))
+    jobs.append(gradient_job(600, 600, cool_green[0], cool_green[1], 'meera_kapoor.jpg', 'Meera Kapoor'))
+    jobs.append(gradient_job(600, 600, food_warm[0], food_warm[1], 'pastry_chef.jpg', 'Pastry Chef'))
     
     # Cuisine Page Images
-    create_gradient_image(800, 600, (211, 84, 0), (230, 126, 34), 'cuisine_indian.jpg', 'Indian')
-    create_gradient_image(800, 600, (46, 204, 113), (39, 174, 96), 'cuisine_italian.jpg', 'Italian')
-    create_gradient_image(800, 600, elegant_gray[0], elegant_gray[1], 'cuisine_continental.jpg', 'Continental')
-    create_gradient_image(800, 600, warm_earth[0], warm_earth[1], 'cuisine_fusion.jpg', 'Fusion')
-    create_gradient_image(800, 600, green_brown[0], green_brown[1], 'chef_at_work.jpg', 'Chef')
+    jobs.append(gradient_job(800, 600, (211, 84, 0), (230, 126, 34), 'cuisine_indian.jpg', 'Indian'))
+    jobs.append(gradient_job(800, 600, (46, 204, 113), (39, 174, 96), 'cuisine_italian.jpg', 'Italian'))
+    jobs.append(gradient_job(800, 600, elegant_gray[0], elegant_gray[1], 'cuisine_continental.jpg', 'Continental'))
+    jobs.append(gradient_job(800, 600, warm_earth[0], warm_earth[1], 'cuisine_fusion.jpg', 'Fusion'))
+    jobs.append(gradient_job(800, 600, green_brown[0], green_brown[1], 'chef_at_work.jpg', 'Chef'))
     
     # Why Us Page Images
-    create_gradient_image(800, 600, cool_green[0], cool_green[1], 'brand_identity.jpg', 'Brand')
+    jobs.append(gradient_job(800, 600, cool_green[0], cool_green[1], 'brand_identity.jpg', 'Brand'))
     
     # Instagram Feed
     for i in range(1, 7):
-        create_gradient_image(500, 500, warm_earth[0], warm_earth[1], f'insta_{i}.jpg', f'Post {i}')
+        jobs.append(gradient_job(500, 500, warm_earth[0], warm_earth[1], f'insta_{i}.jpg', f'Post {i}'))
     
+    report = run_jobs(jobs, 'generate_images', workers=workers, force=force)
+    report.print_summary()
+    if report.failed:
+        return False
+
     print("\n✅ All images generated successfully!")
     print(f"Total images created in 'static/images/' directory")
+    return True
 
 if __name__ == "__main__":
-    generate_all_images()
+    args = build_arguments("Generate placeholder images").parse_args()
+    if not generate_all_images(force=args.force, workers=args.jobs):
+        raise SystemExit(1)
@@ -0,0 +1,151 @@
+"""
+RootStatix Cuisine - Ingestion
+Write-behind queue that batches submissions and flushes them off the request thread
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BatchWriter:
+    """Collects items on a queue and hands them to `flush` in batches
+
+    A batch is flushed once `max_batch` items are waiting or `max_delay`
+    seconds have passed since its first item, whichever comes first. A batch
+    whose flush fails is retried up to `max_attempts` times in all, with
+    exponential backoff, before its items are counted as dropped; items
+    arriving meanwhile wait on the queue.
+    """
+
+    def __init__(self, flush, name='ingest', max_batch=100, max_delay=0.5, max_queue=10000,
+                 max_attempts=5, backoff=0.5, max_backoff=10.0):
+        self.flush = flush
+        self.name = name
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._flushed = 0
+        self._retried = 0
+        self._dropped = 0
+        self._batches = 0
+        self._flush_seconds = 0.0
+        self._last_flush_seconds = 0.0
+        atexit.register(self.close)
+
+    def _ensure_worker(self):
+        """Start the flush thread lazily, and again in each forked worker process"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name=f'{self.name}-writer', daemon=True)
+            self._thread.start()
+
+    def submit(self, item):
+        """Queue an item for the next batch; never waits on storage"""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Keep the request fast; fall back to a direct write when the writer is saturated,
+            # tried once since the request thread must not sleep through backoff
+            logger.warning('%s queue full, writing synchronously', self.name)
+            self._write([item], max_attempts=1)
+
+    def _write(self, batch, max_attempts=None):
+        """Flush a batch, retrying failures with backoff; False once it has been dropped"""
+        max_attempts = max_attempts or self.max_attempts
+        attempt = 0
+        while True:
+            attempt += 1
+            started = time.perf_counter()
+            try:
+                self.flush(batch)
+                break
+            except Exception:
+                if attempt >= max_attempts:
+                    logger.exception('%s dropped %d item(s) after %d attempt(s)', self.name, len(batch), attempt)
+                    with self._stats_lock:
+                        self._dropped += len(batch)
+                    return False
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                logger.warning('%s failed to flush %d item(s), retrying in %.1fs',
+                               self.name, len(batch), delay, exc_info=True)
+                with self._stats_lock:
+                    self._retried += 1
+            # close() cuts the wait short so shutdown is not held up; the attempts stay bounded
+            self._stopping.wait(delay)
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._flushed += len(batch)
+            self._batches += 1
+            self._flush_seconds += elapsed
+            self._last_flush_seconds = elapsed
+        return True
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            stopping = False
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stopping:
+                return
+
+    def close(self, timeout=5.0):
+        """Flush everything still queued and stop the worker"""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        self._stopping.set()
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
+
+    def stats(self):
+        """Queue depth and flush latency figures"""
+        with self._stats_lock:
+            batches = self._batches
+            return {
+                'queue_depth': self._queue.qsize(),
+                'flushed': self._flushed,
+                'retried': self._retried,
+                'dropped': self._dropped,
+                'batches': batches,
+                'avg_flush_ms': round(self._flush_seconds / batches * 1000, 3) if batches else 0.0,
+                'last_flush_ms': round(self._last_flush_seconds * 1000, 3),
+            }
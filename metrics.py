@@ -0,0 +1,345 @@
+"""
+RootStatix Cuisine - Metrics
+Per-endpoint latency histograms, Server-Timing headers, Prometheus exposition
+and an opt-in sampling profiler for slow requests
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+
+from flask import Response, before_render_template, g, has_request_context, request, template_rendered
+
+# Seconds; fine enough at the low end to separate cache hits from renders
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+PHASES = ('route', 'view', 'render', 'storage')
+
+
+class Histogram:
+    """Cumulative-bucket histogram for one label set"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class HistogramFamily:
+    """Histograms sharing a name, split by label values"""
+
+    def __init__(self, name, help, labels, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            child = self._children.get(label_values)
+            if child is None:
+                child = self._children[label_values] = Histogram(self.buckets)
+            child.observe(value)
+
+    def clear(self):
+        with self._lock:
+            self._children.clear()
+
+    def render(self):
+        """Prometheus text exposition of every label set"""
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            children = sorted((values, list(child.counts), child.sum, child.count)
+                              for values, child in self._children.items())
+        for values, counts, total, count in children:
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, values))
+            prefix = labels + ',' if labels else ''
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total:.9g}')
+            lines.append(f'{self.name}_count{{{labels}}} {count}')
+        return '\n'.join(lines)
+
+
+class CounterFamily:
+    """Monotonic counters sharing a name, split by label values"""
+
+    def __init__(self, name, help, labels):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = Counter()
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            labels = ','.join(f'{name}="{_escape(v)}"' for name, v in zip(self.labels, label_values))
+            lines.append(f'{self.name}{{{labels}}} {value}')
+        return '\n'.join(lines)
+
+
+class Metrics:
+    """The metric families recorded for each process
+
+    Every worker process keeps its own numbers; scrape each worker, or sum
+    them in Prometheus.
+    """
+
+    def __init__(self):
+        self.requests = HistogramFamily(
+            'rootstatix_request_duration_seconds', 'Time from WSGI entry to response headers',
+            ('endpoint', 'method', 'status'))
+        self.phases = HistogramFamily(
+            'rootstatix_request_phase_seconds', 'Time per request phase (route, view, render, storage)',
+            ('endpoint', 'phase'))
+        self.response_size = HistogramFamily(
+            'rootstatix_response_size_bytes', 'Response body size', ('endpoint',), SIZE_BUCKETS)
+        self.templates = HistogramFamily(
+            'rootstatix_template_render_seconds', 'Jinja render time per template', ('template',))
+        self.storage = HistogramFamily(
+            'rootstatix_storage_call_seconds', 'Storage call latency', ('store', 'method'))
+        self.rate_limited = CounterFamily(
+            'rootstatix_rate_limited_total', 'Submissions rejected by the rate limiter', ('scope', 'key'))
+        self.emails = CounterFamily(
+            'rootstatix_emails_total', 'Outbox delivery attempts by outcome (sent, retry, dead)', ('kind', 'outcome'))
+
+    def families(self):
+        return (self.requests, self.phases, self.response_size, self.templates, self.storage,
+                self.rate_limited, self.emails)
+
+    def reset(self):
+        """Forget every observation, e.g. the warm-up requests of a preloading server"""
+        for family in self.families():
+            family.clear()
+
+    def render(self):
+        return '\n'.join(family.render() for family in self.families()) + '\n'
+
+
+metrics = Metrics()
+
+
+def _add_request_time(key, seconds):
+    if has_request_context():
+        g.setdefault('_timings', Counter())[key] += seconds
+
+
+class TimedStore:
+    """Proxy that times every method call on a reservation or feedback store"""
+
+    def __init__(self, store, name):
+        self._store = store
+        self._name = name
+
+    def __getattr__(self, attr):
+        value = getattr(self._store, attr)
+        if not callable(value):
+            return value
+
+        @wraps(value)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return value(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                metrics.storage.observe(elapsed, self._name, attr)
+                _add_request_time('storage', elapsed)
+        return timed
+
+
+def instrument(store, name):
+    """Wrap a store so its calls show up in the storage histogram and Server-Timing"""
+    return TimedStore(store, name)
+
+
+class SamplingProfiler:
+    """Samples the stacks of threads serving requests and dumps slow ones as folded stacks
+
+    Output files hold one `frame;frame;frame count` line per distinct stack,
+    the input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, output_dir, threshold=0.25, interval=0.005):
+        self.output_dir = output_dir
+        self.threshold = threshold
+        self.interval = interval
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def _ensure_sampler(self):
+        """Start the sampling thread lazily, and again in each forked worker process"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+            self._thread.start()
+
+    def start(self):
+        self._ensure_sampler()
+        with self._lock:
+            self._samples[threading.get_ident()] = Counter()
+
+    def stop(self, label, duration):
+        """Stop sampling this thread; write its stacks if the request was slow"""
+        with self._lock:
+            stacks = self._samples.pop(threading.get_ident(), None)
+        if not stacks or duration < self.threshold:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        path = os.path.join(self.output_dir, f'{stamp}-{label}-{int(duration * 1000)}ms.folded')
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f'{stack} {count}\n')
+        return path
+
+    @staticmethod
+    def _fold(frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._samples:
+                    continue
+                frames = sys._current_frames()
+                for ident, stacks in self._samples.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        stacks[self._fold(frame)] += 1
+
+
+def init_app(app):
+    """Time every request by phase, add Server-Timing headers and serve /metrics"""
+    app.config.setdefault('METRICS_ENABLED', True)
+    threshold = app.config.get('PROFILE_SLOW_REQUESTS_MS')
+    profiler = None
+    if threshold:
+        profiler = SamplingProfiler(os.path.join(app.instance_path, 'profiles'), float(threshold) / 1000)
+
+    wsgi_app = app.wsgi_app
+
+    def timed_wsgi_app(environ, start_response):
+        environ['rootstatix.started'] = time.perf_counter()
+        return wsgi_app(environ, start_response)
+
+    app.wsgi_app = timed_wsgi_app
+
+    @app.before_request
+    def start_timing():
+        g._view_started = time.perf_counter()
+        if profiler is not None:
+            profiler.start()
+
+    def render_started(sender, template, context, **extra):
+        g.setdefault('_render_started', []).append(time.perf_counter())
+
+    def render_finished(sender, template, context, **extra):
+        started = g.get('_render_started')
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        metrics.templates.observe(elapsed, template.name or '<string>')
+        # Only the outermost template counts, since it includes the rest
+        if not started:
+            _add_request_time('render', elapsed)
+
+    before_render_template.connect(render_started, app, weak=False)
+    template_rendered.connect(render_finished, app, weak=False)
+
+    @app.after_request
+    def record_timing(response):
+        if not app.config['METRICS_ENABLED']:
+            return response
+        now = time.perf_counter()
+        started = request.environ.get('rootstatix.started', now)
+        view_started = g.get('_view_started', now)
+        timings = g.get('_timings', Counter())
+        total = now - started
+        endpoint = request.endpoint or 'unmatched'
+
+        phases = {
+            'route': view_started - started,
+            'view': max(0.0, now - view_started - timings['render'] - timings['storage']),
+            'render': timings['render'],
+            'storage': timings['storage'],
+        }
+        for phase in PHASES:
+            metrics.phases.observe(phases[phase], endpoint, phase)
+        metrics.requests.observe(total, endpoint, request.method, str(response.status_code))
+        length = None if response.direct_passthrough else response.calculate_content_length()
+        if length is not None:
+            metrics.response_size.observe(length, endpoint)
+
+        response.headers['Server-Timing'] = ', '.join(
+            [f'{phase};dur={phases[phase] * 1000:.2f}' for phase in PHASES]
+            + [f'total;dur={total * 1000:.2f}'])
+
+        if profiler is not None:
+            path = profiler.stop(endpoint, total)
+            if path:
+                app.logger.warning('Slow request %s %s (%.0f ms), profile written to %s',
+                                   request.method, request.path, total * 1000, path)
+        return response
+
+    @app.teardown_request
+    def discard_profile(exc):
+        # Requests that never reach after_request must not leave their thread registered
+        if profiler is not None:
+            profiler.stop('aborted', 0.0)
+
+    app.extensions['metrics'] = metrics
+    return metrics
+
+
+def metrics_response():
+    """Prometheus text exposition of this process's metrics"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
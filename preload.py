@@ -0,0 +1,115 @@
+"""
+RootStatix Cuisine - Preload Hints
+Sends each page's LCP image, stylesheet and fonts as `Link: rel=preload` headers, and as
+103 Early Hints when the server offers them, from the registry build_preloads.py writes
+"""
+
+import json
+import os
+import threading
+
+from flask import request, url_for
+
+import static_assets
+from webfonts import self_hosted_fonts
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(BASE_DIR, 'build', 'preload.json')
+
+# Google Fonts files come from this origin when the fonts are not self-hosted
+GOOGLE_FONTS_ORIGIN = 'https://fonts.gstatic.com'
+
+
+class PreloadRegistry:
+    """Per-endpoint static assets to preload, reloaded when the build replaces the file"""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self._data = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def data(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return {}
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    with open(self.path, encoding='utf-8') as f:
+                        self._data = json.load(f)
+                    self._mtime = mtime
+        return self._data
+
+    def assets(self, endpoint):
+        """[{'filename': ..., 'as': ...}] for an endpoint, or [] when it has none"""
+        entry = self.data().get(endpoint)
+        return entry['assets'] if entry else []
+
+
+registry = PreloadRegistry()
+
+
+def links(endpoint):
+    """Link header values for a page, in the order the browser should fetch them
+
+    Memoised per endpoint until the registry, the static asset manifest or
+    the font manifest is reloaded.
+    """
+    static_assets.manifest.refresh()
+    # Reloaded manifests are new objects; the font list and script root are small enough to compare
+    manifests = (registry.data(), static_assets.manifest.assets)
+    settings = (self_hosted_fonts(), request.script_root)
+    cached = _links.get(endpoint)
+    if (cached is not None and cached[0][0] is manifests[0] and cached[0][1] is manifests[1]
+            and cached[1] == settings):
+        return cached[2]
+    values = _build_links(endpoint)
+    _links[endpoint] = (manifests, settings, values)
+    return values
+
+
+_links = {}
+
+
+def _build_links(endpoint):
+    assets = registry.assets(endpoint)
+    if not assets:
+        return []
+    values = []
+    for asset in assets:
+        value = f"<{url_for('static', filename=asset['filename'])}>; rel=preload; as={asset['as']}"
+        if asset['as'] == 'image':
+            value += '; fetchpriority=high'
+        values.append(value)
+    fonts = self_hosted_fonts()
+    if fonts:
+        values += [f"<{url_for('static', filename=font['src'])}>; rel=preload; as=font; type=\"font/woff2\"; "
+                   f"crossorigin" for font in fonts if font.get('preload')]
+    else:
+        values.append(f'<{GOOGLE_FONTS_ORIGIN}>; rel=preconnect; crossorigin')
+    return values
+
+
+def init_app(app):
+    """Send preload hints for every page that has a registry entry"""
+
+    @app.before_request
+    def send_early_hints():
+        # Servers that can send interim responses expose a callable (see serve.py --early-hints)
+        early_hints = request.environ.get('wsgi.early_hints')
+        if early_hints is None or request.method != 'GET':
+            return
+        values = links(request.endpoint)
+        if values:
+            early_hints([('Link', value) for value in values])
+
+    @app.after_request
+    def add_preload_links(response):
+        if (request.method == 'GET' and response.status_code == 200 and response.mimetype == 'text/html'
+                and 'Link' not in response.headers):
+            values = links(request.endpoint)
+            if values:
+                response.headers['Link'] = ', '.join(values)
+        return response
@@ -0,0 +1,204 @@
+"""
+RootStatix Cuisine - Rate Limiting
+Token buckets in a fixed-size shared-memory table, so limits hold across every worker process
+"""
+
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from functools import wraps
+from hashlib import blake2b
+
+from flask import abort, request
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: buckets are only shared between threads of one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'RSRL0001'
+HEADER = struct.Struct('<8sII')      # magic, sets, ways
+SLOT = struct.Struct('<Qdd')         # key hash, tokens, last refill (unix time)
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(value):
+    """'5/minute' or '10/2hours' -> (burst, tokens per second)"""
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*', value)
+    if not match:
+        raise ValueError(f'Invalid rate limit {value!r}; expected e.g. "5/minute"')
+    count, multiple, unit = int(match.group(1)), int(match.group(2) or 1), match.group(3)
+    return count, count / (multiple * PERIODS[unit])
+
+
+class BucketTable:
+    """Set-associative table of token buckets in a shared memory map
+
+    A key hashes to one set of `ways` slots; a full set evicts the bucket
+    refilled longest ago, which has most likely refilled completely anyway.
+    Each set is guarded by an fcntl byte-range lock, so processes only
+    contend when they touch the same set, plus a thread lock within the
+    process, since fcntl locks do not exclude threads of the same process.
+    """
+
+    def __init__(self, path=None, sets=2048, ways=4):
+        self.path = path
+        self.sets = sets
+        self.ways = ways
+        self.size = HEADER.size + sets * ways * SLOT.size
+        self._map = None
+        self._fd = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """Map the table on first use, and again in each forked worker process"""
+        if self._map is not None and self._pid == os.getpid():
+            return self._map
+        with self._lock:
+            if self._map is not None and self._pid == os.getpid():
+                return self._map
+            fd = None
+            if self.path:
+                try:
+                    os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                    fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                except OSError as e:
+                    logger.warning('Rate limits are per process; cannot open %s: %s', self.path, e)
+            if fd is None:
+                self._map, self._fd = mmap.mmap(-1, self.size), None
+            else:
+                self._lock_range(fd, 0, HEADER.size, True)
+                try:
+                    if os.fstat(fd).st_size != self.size:
+                        os.ftruncate(fd, 0)
+                        os.ftruncate(fd, self.size)
+                    table = mmap.mmap(fd, self.size)
+                    if HEADER.unpack_from(table, 0) != (MAGIC, self.sets, self.ways):
+                        table[:] = bytes(self.size)
+                        HEADER.pack_into(table, 0, MAGIC, self.sets, self.ways)
+                finally:
+                    self._lock_range(fd, 0, HEADER.size, False)
+                self._map, self._fd = table, fd
+            self._pid = os.getpid()
+            return self._map
+
+    @staticmethod
+    def _lock_range(fd, start, length, exclusive):
+        if fcntl is not None and fd is not None:
+            fcntl.lockf(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_UN, length, start)
+
+    def _locate(self, key):
+        """`key`'s hash and the byte range of its set"""
+        digest = int.from_bytes(blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+        start = HEADER.size + (digest % self.sets) * self.ways * SLOT.size
+        return digest, start, self.ways * SLOT.size
+
+    def take(self, key, burst, rate, now=None):
+        """Take one token from `key`'s bucket; 0.0 when allowed, else seconds until a token frees up"""
+        table = self._open()
+        digest, start, length = self._locate(key)
+        now = time.time() if now is None else now
+        with self._lock:
+            self._lock_range(self._fd, start, length, True)
+            try:
+                victim, oldest = start, None
+                for offset in range(start, start + length, SLOT.size):
+                    slot_key, tokens, updated = SLOT.unpack_from(table, offset)
+                    if slot_key == digest:
+                        tokens = min(burst, tokens + (now - updated) * rate)
+                        break
+                    if oldest is None or updated < oldest:
+                        victim, oldest = offset, updated
+                else:
+                    offset, tokens = victim, float(burst)
+                if tokens >= 1.0:
+                    SLOT.pack_into(table, offset, digest, tokens - 1.0, now)
+                    return 0.0
+                SLOT.pack_into(table, offset, digest, tokens, now)
+                return (1.0 - tokens) / rate
+            finally:
+                self._lock_range(self._fd, start, length, False)
+
+    def refund(self, key, burst):
+        """Give back a token taken from `key`'s bucket for a request that was rejected anyway"""
+        table = self._open()
+        digest, start, length = self._locate(key)
+        with self._lock:
+            self._lock_range(self._fd, start, length, True)
+            try:
+                for offset in range(start, start + length, SLOT.size):
+                    slot_key, tokens, updated = SLOT.unpack_from(table, offset)
+                    if slot_key == digest:
+                        SLOT.pack_into(table, offset, digest, min(float(burst), tokens + 1.0), updated)
+                        return
+            finally:
+                self._lock_range(self._fd, start, length, False)
+
+
+class RateLimiter:
+    """Per-client limits for form submissions, shared by all workers through one BucketTable"""
+
+    def __init__(self, app=None, table=None):
+        self.table = table
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RATE_LIMIT_ENABLED', True)
+        app.config.setdefault('RATE_LIMIT_FILE', os.path.join(app.instance_path, 'ratelimit.bin'))
+        if self.table is None:
+            self.table = BucketTable(app.config['RATE_LIMIT_FILE'])
+        self.app = app
+        app.extensions['rate_limit'] = self
+
+    def limit(self, scope, per_ip=None, per_email=None, methods=('POST',)):
+        """Decorator rejecting requests over a limit with 429 and Retry-After
+
+        `per_ip` limits each client address; `per_email` each address typed
+        into the form's email field, so one sender cannot rotate IPs to spam.
+        """
+        limits = []
+        if per_ip:
+            limits.append(('ip', *parse_limit(per_ip)))
+        if per_email:
+            limits.append(('email', *parse_limit(per_email)))
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method in methods and self.app.config['RATE_LIMIT_ENABLED']:
+                    self.check(scope, limits)
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def check(self, scope, limits):
+        taken = []
+        for kind, burst, rate in limits:
+            if kind == 'ip':
+                value = request.remote_addr or ''
+            else:
+                value = (request.form.get('email') or '').strip().lower()
+                if not value:
+                    continue
+            key = f'{scope}:{kind}:{value}'
+            retry_after = self.table.take(key, burst, rate)
+            if retry_after:
+                # A rejected request costs nothing: a client whose form is refused for a
+                # flooded email address keeps its own allowance for other submissions
+                for taken_key, taken_burst in taken:
+                    self.table.refund(taken_key, taken_burst)
+                metrics.metrics.rate_limited.inc(scope, kind)
+                abort(429, retry_after=max(1, int(retry_after + 0.999)))
+            taken.append((key, burst))
@@ -0,0 +1,131 @@
+"""
+RootStatix Cuisine - Render Cache
+Keeps the rendered HTML of read-only pages and answers conditional GETs
+"""
+
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import request, session
+
+
+class CachedPage:
+    """Rendered bytes of one page plus its validators"""
+
+    __slots__ = ('body', 'mimetype', 'etag', 'last_modified')
+
+    def __init__(self, body, mimetype, last_modified):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.last_modified = last_modified
+
+
+class RenderCache:
+    """Full-page cache for views whose output only depends on templates and data files"""
+
+    def __init__(self, app=None, watch=(), check_interval=1.0):
+        self.watch = list(watch)
+        self.check_interval = check_interval
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+        self._callbacks = []
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Attach the cache to an app and watch its template folder"""
+        app.config.setdefault('RENDER_CACHE_ENABLED', True)
+        self.app = app
+        app.extensions['render_cache'] = self
+
+    def _watched_files(self):
+        template_dir = os.path.join(self.app.root_path, self.app.template_folder)
+        for root, _dirs, files in os.walk(template_dir):
+            for name in files:
+                yield os.path.join(root, name)
+        for path in self.watch:
+            if os.path.isdir(path):
+                # The directory's own mtime catches added and removed files
+                yield path
+                for root, _dirs, files in os.walk(path):
+                    for name in files:
+                        yield os.path.join(root, name)
+            else:
+                yield path
+
+    def _current_version(self):
+        """Newest mtime across watched files, re-checked at most every check_interval seconds"""
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return self._version
+        newest = 0.0
+        for path in self._watched_files():
+            try:
+                newest = max(newest, os.stat(path).st_mtime)
+            except OSError:
+                continue
+        self._checked_at = now
+        if newest != self._version:
+            with self._lock:
+                self._pages.clear()
+                self._version = newest
+            for callback in self._callbacks:
+                callback()
+        return newest
+
+    def on_change(self, callback):
+        """Call `callback` whenever a watched file changes, e.g. to drop data cached elsewhere"""
+        self._callbacks.append(callback)
+        return callback
+
+    def clear(self):
+        """Drop every cached page"""
+        with self._lock:
+            self._pages.clear()
+            self._version = None
+
+    def _respond(self, page):
+        response = self.app.response_class(page.body, mimetype=page.mimetype)
+        response.set_etag(page.etag)
+        response.last_modified = page.last_modified
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def cached(self, view=None, *, query=()):
+        """Decorator serving a view's output from the cache
+
+        Query parameters are ignored unless named in `query`, so arbitrary
+        query strings cannot fill the cache with copies of the same page.
+        """
+        if view is None:
+            return lambda view: self.cached(view, query=query)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Flashed messages are rendered into the page once, so never cache them
+            if (not self.app.config['RENDER_CACHE_ENABLED'] or request.method != 'GET'
+                    or '_flashes' in session):
+                return view(*args, **kwargs)
+
+            version = self._current_version()
+            key = (request.endpoint, request.script_root, request.path,
+                   tuple(request.args.get(name) for name in query))
+            page = self._pages.get(key)
+            if page is None:
+                response = self.app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough:
+                    return response
+                last_modified = datetime.fromtimestamp(int(version), tz=timezone.utc)
+                page = CachedPage(response.get_data(), response.mimetype, last_modified)
+                with self._lock:
+                    self._pages[key] = page
+            return self._respond(page)
+        return wrapper
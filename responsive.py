@@ -0,0 +1,99 @@
+"""
+RootStatix Cuisine - Responsive Images
+Template helper that turns build_images.py output into <picture> markup
+"""
+
+import json
+import os
+import threading
+
+from flask import url_for
+from markupsafe import Markup, escape
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(BASE_DIR, 'static', 'images', 'responsive', 'manifest.json')
+
+# MIME type for each manifest format, in the order browsers should try them
+SOURCE_TYPES = (('avif', 'image/avif'), ('webp', 'image/webp'))
+
+
+class ImageManifest:
+    """Lazily loaded view of the responsive image manifest, reloaded when the file changes"""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self._entries = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def entries(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return {}
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    with open(self.path, encoding='utf-8') as f:
+                        self._entries = json.load(f)
+                    self._mtime = mtime
+        return self._entries
+
+    def get(self, filename):
+        return self.entries().get(filename)
+
+
+manifest = ImageManifest()
+
+
+def _srcset(variants):
+    return ', '.join(f"{url_for('static', filename=v['src'])} {v['width']}w" for v in variants)
+
+
+def _attrs(**attrs):
+    return ''.join(f' {name.rstrip("_")}="{escape(value)}"'
+                   for name, value in attrs.items() if value is not None)
+
+
+def picture(filename, alt='', sizes='100vw', class_=None, loading='lazy', defer=False):
+    """Render an image as <picture> with srcset/sizes, or a plain <img> when it has no variants
+
+    With `defer`, the image shows its inline placeholder and script.js swaps
+    in the real sources when it scrolls into view; a <noscript> copy keeps
+    it visible without JavaScript.
+    """
+    entry = manifest.get(filename)
+    if entry is None:
+        src = url_for('static', filename='images/' + filename)
+        return Markup(f'<img{_attrs(src=src, alt=alt, class_=class_, loading=loading)}>')
+
+    placeholder = entry.get('placeholder') if defer else None
+    prefix = 'data-' if placeholder else ''
+    variants = entry['variants']
+    fallback = variants['jpeg']
+    sources = ''.join(
+        f'<source{_attrs(**{"type": mime, prefix + "srcset": _srcset(variants[fmt]), "sizes": sizes})}>'
+        for fmt, mime in SOURCE_TYPES if fmt in variants
+    )
+    src = url_for('static', filename=fallback[-1]['src'])
+    if placeholder:
+        urls = {'src': placeholder, 'data-src': src, 'data-srcset': _srcset(fallback)}
+        classes = ' '.join(filter(None, (class_, 'lqip')))
+        loading = None
+    else:
+        urls = {'src': src, 'srcset': _srcset(fallback)}
+        classes = class_
+    img = _attrs(
+        **urls,
+        sizes=sizes,
+        width=entry['width'],
+        height=entry['height'],
+        alt=alt,
+        class_=classes,
+        loading=loading,
+        decoding='async',
+    )
+    html = f'<picture>{sources}<img{img}></picture>'
+    if placeholder:
+        html += f'<noscript>{picture(filename, alt, sizes, class_, "lazy")}</noscript>'
+    return Markup(html)
@@ -0,0 +1,323 @@
+"""
+RootStatix Cuisine - Production Server
+Preloads and warms the app once in a master process, then forks workers that share
+that state copy-on-write. SIGHUP starts a new master and hands over without dropping
+connections; SIGTERM drains the workers.
+
+    python serve.py --bind 0.0.0.0:8000 --workers 4 --worker-class threaded
+"""
+
+import argparse
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+
+logger = logging.getLogger('rootstatix.serve')
+
+WORKER_CLASSES = ('threaded', 'gevent')
+
+# Set on a new master started by SIGHUP: the inherited listening socket, and a pipe to report readiness on
+LISTEN_FD_ENV = 'ROOTSTATIX_LISTEN_FD'
+READY_FD_ENV = 'ROOTSTATIX_READY_FD'
+
+
+def parse_bind(value):
+    """'host:port' or ':port' -> (host, port)"""
+    host, _, port = value.rpartition(':')
+    return host.strip('[]') or '0.0.0.0', int(port)
+
+
+def listen(host, port, backlog=2048):
+    """The listening socket, inherited from the previous master on a reload"""
+    fd = os.environ.pop(LISTEN_FD_ENV, None)
+    if fd is not None:
+        return socket.socket(fileno=int(fd))
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+
+def load_app(preload=True):
+    """Import the app and, when preloading, do the work every worker's first requests would do"""
+    from app import app
+
+    app.config['READY'] = False
+    # Workers start their own outbox senders; the master must not fork while its sender
+    # thread may hold a lock, nor send mail itself
+    mail_outbox = app.extensions.get('outbox')
+    if mail_outbox is not None:
+        mail_outbox.close()
+    if not preload:
+        return app
+
+    import metrics
+    from catalog import catalogs
+    from freeze import frozen_pages
+
+    started = time.perf_counter()
+    for slug in [None] + catalogs.slugs():
+        catalogs.get(slug)
+    for name in app.jinja_env.list_templates(filter_func=lambda name: not name.startswith('.')):
+        app.jinja_env.get_template(name)
+    # Rendered read-only pages land in the page cache that every worker inherits
+    client = app.test_client(use_cookies=False)
+    for url, _endpoint, _template, _location in frozen_pages(app):
+        client.get(url)
+    metrics.metrics.reset()
+    # Objects that survive warm-up are never collected, so the collector leaves their pages shared
+    gc.collect()
+    gc.freeze()
+    logger.info('Preloaded app in %.0f ms', (time.perf_counter() - started) * 1000)
+    return app
+
+
+# ========================================
+# WORKERS
+# ========================================
+
+def serve_threaded(app, sock, options, stopping):
+    from werkzeug.serving import ThreadedWSGIServer, WSGIRequestHandler
+
+    class RequestHandler(WSGIRequestHandler):
+        # Idle keep-alive connections are closed, so a draining worker is not held open by them
+        timeout = options.keepalive
+
+        def log_request(self, *args, **kwargs):
+            if options.access_log:
+                super().log_request(*args, **kwargs)
+
+        def make_environ(self):
+            environ = super().make_environ()
+            # Clients older than HTTP/1.1 would take an interim response for the real one
+            if options.early_hints and self.request_version >= 'HTTP/1.1':
+                environ['wsgi.early_hints'] = self.send_early_hints
+            return environ
+
+        def send_early_hints(self, headers):
+            lines = ['HTTP/1.1 103 Early Hints'] + [f'{key}: {value}' for key, value in headers]
+            self.wfile.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+    class WorkerServer(ThreadedWSGIServer):
+        # Non-daemon request threads are joined on close, so in-flight requests finish
+        daemon_threads = False
+
+    host, port = sock.getsockname()[:2]
+    server = WorkerServer(host, port, app, handler=RequestHandler, fd=sock.fileno())
+    thread = threading.Thread(target=server.serve_forever, name='accept', daemon=True)
+    thread.start()
+    app.config['READY'] = True
+    master = os.getppid()
+    while not stopping.wait(1.0):
+        if os.getppid() != master:
+            logger.warning('Master %d went away; worker %d stopping', master, os.getpid())
+            break
+    app.config['READY'] = False
+    server.shutdown()
+    server.server_close()
+
+
+def serve_gevent(app, sock, options, stopping):
+    from gevent import monkey
+    monkey.patch_all()
+    import gevent
+    from gevent.pywsgi import WSGIServer
+
+    server = WSGIServer(sock, app, log=logger if options.access_log else None)
+
+    def stop():
+        app.config['READY'] = False
+        server.stop(timeout=options.graceful_timeout)
+
+    gevent.signal_handler(signal.SIGTERM, stop)
+    gevent.signal_handler(signal.SIGINT, stop)
+    app.config['READY'] = True
+    server.serve_forever()
+
+
+WORKERS = {'threaded': serve_threaded, 'gevent': serve_gevent}
+
+
+def run_worker(app, sock, options):
+    stopping = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda signum, frame: stopping.set())
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    # Pending and retried reservation emails are picked up without waiting for a new booking
+    mail_outbox = app.extensions.get('outbox')
+    if mail_outbox is not None:
+        mail_outbox.start()
+    WORKERS[options.worker_class](app, sock, options, stopping)
+
+
+# ========================================
+# MASTER
+# ========================================
+
+class Master:
+    """Keeps `workers` forked worker processes alive until told to stop or reload"""
+
+    def __init__(self, app, sock, options):
+        self.app = app
+        self.sock = sock
+        self.options = options
+        self.workers = {}
+        self.signals = []
+        self.pid = os.getpid()
+
+    def spawn(self):
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.monotonic()
+            return pid
+        # Worker: the exit status propagates as SystemExit so atexit handlers (queued
+        # feedback, store connections) still run in this process
+        try:
+            run_worker(self.app, self.sock, self.options)
+            code = 0
+        except Exception:
+            logger.exception('Worker %d crashed', os.getpid())
+            code = 1
+        sys.exit(code)
+
+    def reap(self):
+        """Collect exited children; returns the pids that were workers"""
+        exited = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return exited
+            if pid == 0:
+                return exited
+            if self.workers.pop(pid, None) is not None:
+                exited.append((pid, status))
+
+    def stop_workers(self, timeout):
+        """SIGTERM every worker, then SIGKILL whichever has not drained within `timeout`"""
+        for pid in self.workers:
+            _kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in self.workers:
+            logger.warning('Worker %d did not drain in %.0fs; killing it', pid, timeout)
+            _kill(pid, signal.SIGKILL)
+        while self.workers:
+            self.reap()
+            time.sleep(0.05)
+
+    def handover(self):
+        """Start a new master on the same socket; True once it serves and this one may exit"""
+        read_fd, write_fd = os.pipe()
+        os.set_inheritable(self.sock.fileno(), True)
+        os.set_inheritable(write_fd, True)
+        env = dict(os.environ, **{LISTEN_FD_ENV: str(self.sock.fileno()), READY_FD_ENV: str(write_fd)})
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.execve(sys.executable, [sys.executable] + sys.argv, env)
+        os.close(write_fd)
+        readable, _, _ = select.select([read_fd], [], [], self.options.reload_timeout)
+        ready = bool(readable) and os.read(read_fd, 1) == b'1'
+        os.close(read_fd)
+        if not ready:
+            logger.error('New master %d did not become ready; keeping the current workers', pid)
+            _kill(pid, signal.SIGTERM)
+            return False
+        logger.info('New master %d is serving; draining the old workers', pid)
+        return True
+
+    def run(self):
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, lambda signum, frame: self.signals.append(signum))
+        for _ in range(self.options.workers):
+            self.spawn()
+        logger.info('Master %d serving on %s with %d %s workers', self.pid, _address(self.sock),
+                    self.options.workers, self.options.worker_class)
+        ready_fd = os.environ.pop(READY_FD_ENV, None)
+        if ready_fd is not None:
+            os.write(int(ready_fd), b'1')
+            os.close(int(ready_fd))
+
+        while True:
+            time.sleep(0.2)
+            signals, self.signals = self.signals, []
+            if signal.SIGTERM in signals or signal.SIGINT in signals:
+                logger.info('Shutting down; draining %d workers', len(self.workers))
+                self.stop_workers(self.options.graceful_timeout)
+                return 0
+            if signal.SIGHUP in signals and self.handover():
+                self.stop_workers(self.options.graceful_timeout)
+                return 0
+            for pid, status in self.reap():
+                logger.warning('Worker %d exited with status %d; replacing it', pid, status)
+            while len(self.workers) < self.options.workers:
+                self.spawn()
+
+
+def _kill(pid, signum):
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def _address(sock):
+    host, port = sock.getsockname()[:2]
+    return f'{host}:{port}'
+
+
+def build_arguments():
+    parser = argparse.ArgumentParser(description='Serve RootStatix with preloaded, forked workers')
+    parser.add_argument('--bind', default=f"0.0.0.0:{os.environ.get('PORT', '8000')}",
+                        help='host:port to listen on (default: 0.0.0.0:$PORT or 8000)')
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('WEB_CONCURRENCY', 0)) or os.cpu_count() or 1,
+                        help='worker processes (default: $WEB_CONCURRENCY or one per core)')
+    parser.add_argument('--worker-class', choices=WORKER_CLASSES, default='threaded',
+                        help='threaded (Werkzeug) or gevent (needs `pip install gevent`)')
+    parser.add_argument('--no-preload', dest='preload', action='store_false',
+                        help='skip warm-up in the master; each worker warms up on its first requests')
+    parser.add_argument('--graceful-timeout', type=float, default=30.0,
+                        help='seconds a stopping worker may spend finishing requests')
+    parser.add_argument('--early-hints', action='store_true',
+                        help='send 103 Early Hints with preload links (threaded workers; for proxies that forward them)')
+    parser.add_argument('--keepalive', type=float, default=5.0, help='idle keep-alive timeout in seconds')
+    parser.add_argument('--reload-timeout', type=float, default=60.0,
+                        help='seconds a new master may take to start on SIGHUP')
+    parser.add_argument('--pid', help='write the master pid to this file')
+    parser.add_argument('--access-log', action='store_true', help='log every request')
+    return parser
+
+
+def main(argv=None):
+    options = build_arguments().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(process)d] %(levelname)s %(message)s')
+    if options.worker_class == 'gevent':
+        try:
+            import gevent  # noqa: F401
+        except ImportError:
+            logger.error('The gevent worker class needs gevent: pip install gevent')
+            return 1
+
+    sock = listen(*parse_bind(options.bind))
+    app = load_app(options.preload)
+    if options.pid:
+        with open(options.pid, 'w', encoding='utf-8') as f:
+            f.write(f'{os.getpid()}\n')
+    return Master(app, sock, options).run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
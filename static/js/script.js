@@ -212,19 +212,7 @@ document.addEventListener('DOMContentLoaded', function() {
     // IMAGE LAZY LOADING (Fallback)
     // ========================================
     
-    const images = document.querySelectorAll('img[data-src]');
-    const imageObserver = new IntersectionObserver((entries, observer) => {
-        entries.forEach(entry => {
-            if (entry.isIntersecting) {
-                const img = entry.target;
-                img.src = img.dataset.src;
-                img.removeAttribute('data-src');
-                imageObserver.unobserve(img);
-            }
-        });
-    });
-    
-    images.forEach(img => imageObserver.observe(img));
+    observeDeferredImages();
     
     // ========================================
     // PREVENT FORM DOUBLE SUBMISSION
@@ -236,7 +224,7 @@ document.addEventListener('DOMContentLoaded', function() {
             const submitBtn = this.querySelector('button[type="submit"]');
             if (submitBtn) {
                 submitBtn.disabled = true;
-                submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Processing...';
+                submitBtn.innerHTML = icon('spinner', 'fa-spin') + ' Processing...';
                 
                 // Re-enable after 3 seconds as fallback
                 setTimeout(() => {
@@ -363,6 +351,63 @@ function formatDate(dateString) {
     return new Date(dateString).toLocaleDateString('en-IN', options);
 }
 
+/**
+ * Swap a deferred image's placeholder for its real sources, unblurring it once loaded
+ */
+function loadDeferredImage(img) {
+    const picture = img.parentElement;
+    if (picture && picture.tagName === 'PICTURE') {
+        picture.querySelectorAll('source[data-srcset]').forEach(source => {
+            source.srcset = source.dataset.srcset;
+            source.removeAttribute('data-srcset');
+        });
+    }
+    img.addEventListener('load', () => img.classList.remove('lqip'), { once: true });
+    if (img.dataset.srcset) {
+        img.srcset = img.dataset.srcset;
+        img.removeAttribute('data-srcset');
+    }
+    img.src = img.dataset.src;
+    img.removeAttribute('data-src');
+}
+
+let deferredImageObserver = null;
+
+/**
+ * Load img[data-src] under `root` as it approaches the viewport; also used for appended gallery pages
+ */
+function observeDeferredImages(root = document) {
+    const images = root.querySelectorAll('img[data-src]');
+    if (!('IntersectionObserver' in window)) {
+        images.forEach(loadDeferredImage);
+        return;
+    }
+    if (!deferredImageObserver) {
+        deferredImageObserver = new IntersectionObserver((entries, observer) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    observer.unobserve(entry.target);
+                    loadDeferredImage(entry.target);
+                }
+            });
+        }, { rootMargin: '200px 0px' });
+    }
+    images.forEach(img => deferredImageObserver.observe(img));
+}
+
+/**
+ * Icon markup matching the icon() template helper: the sprite when it is built, Font Awesome otherwise
+ */
+function icon(name, extraClass = '') {
+    const classes = `fas fa-${name}${extraClass ? ' ' + extraClass : ''}`;
+    const sprite = document.body.dataset.iconSprite;
+    if (!sprite) {
+        return `<i class="${classes}"></i>`;
+    }
+    // Symbols carry their own viewBox and are centred within this square one
+    return `<i class="${classes}"><svg class="icon" viewBox="0 0 512 512" aria-hidden="true"><use href="${sprite}#icon-${name}"></use></svg></i>`;
+}
+
 /**
  * Animate number counter
  */
@@ -0,0 +1,106 @@
+"""
+RootStatix Cuisine - Static Assets
+Resolves url_for('static') to fingerprinted files and serves them precompressed with immutable caching
+"""
+
+import json
+import mimetypes
+import os
+import threading
+import time
+
+from flask import request, send_from_directory
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(BASE_DIR, 'static', 'dist', 'manifest.json')
+
+ONE_YEAR = 31536000
+
+# Preferred order when the client accepts several encodings
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class AssetManifest:
+    """Maps logical static paths to fingerprinted ones, reloading when the build changes"""
+
+    def __init__(self, path=MANIFEST_PATH, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.assets = {}
+        self.hashed = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            assets = {}
+            if mtime is not None:
+                with open(self.path, encoding='utf-8') as f:
+                    assets = json.load(f)
+            self.assets = assets
+            self.hashed = {entry['path']: entry for entry in assets.values()}
+            self._mtime = mtime
+
+    def resolve(self, filename):
+        """Fingerprinted path for a logical filename, or None when it is not built"""
+        self.refresh()
+        entry = self.assets.get(filename)
+        return entry['path'] if entry else None
+
+    def lookup_hashed(self, hashed_path):
+        """Manifest entry for an already fingerprinted path"""
+        self.refresh()
+        return self.hashed.get(hashed_path)
+
+
+manifest = AssetManifest()
+
+
+def init_app(app):
+    """Rewrite static URLs to fingerprinted names and serve them with far-future caching"""
+    dist_dir = os.path.join(app.static_folder, 'dist')
+
+    @app.url_defaults
+    def fingerprint_static(endpoint, values):
+        if endpoint == 'static' and 'filename' in values:
+            hashed = manifest.resolve(values['filename'])
+            if hashed is not None:
+                values['filename'] = 'dist/' + hashed
+
+    def static(filename):
+        if not filename.startswith('dist/'):
+            return app.send_static_file(filename)
+        hashed = filename[len('dist/'):]
+        entry = manifest.lookup_hashed(hashed)
+        if entry is None:
+            return app.send_static_file(filename)
+
+        mimetype = mimetypes.guess_type(hashed)[0] or 'application/octet-stream'
+        served, encoding = hashed, None
+        for name, suffix in ENCODINGS:
+            if name in entry['encodings'] and request.accept_encodings.quality(name) > 0:
+                served, encoding = hashed + suffix, name
+                break
+
+        response = send_from_directory(dist_dir, served, mimetype=mimetype, max_age=ONE_YEAR)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if entry['encodings']:
+            response.vary.add('Accept-Encoding')
+        # The URL changes whenever the content does, so browsers never need to revalidate
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    app.view_functions['static'] = static
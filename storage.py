@@ -0,0 +1,509 @@
+"""
+RootStatix Cuisine - Storage
+Pluggable reservation and feedback storage backends (in-memory and SQLite)
+"""
+
+import itertools
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import Counter
+from datetime import datetime
+
+from analytics import FeedbackAggregates, day_of, normalize_rating
+
+RESERVATION_FIELDS = ('name', 'email', 'phone', 'date', 'time', 'guests', 'special_requests')
+FEEDBACK_FIELDS = ('name', 'email', 'rating', 'comments')
+
+
+class ReservationStore:
+    """Interface every reservation backend implements"""
+
+    def add(self, reservation, notifications=(), admit=None):
+        """Persist a reservation dict and return it with its new 'id'
+
+        `notifications` are (kind, recipient) pairs queued in the outbox in
+        the same transaction, so no email goes out for a booking that was not
+        stored and none is lost for one that was.
+
+        `admit`, when given, is called with the bookings already on the
+        reservation's date while the store holds its write lock; when it
+        returns False nothing is stored and None is returned. Every process
+        sharing the store checks capacity and inserts atomically this way.
+        """
+        raise NotImplementedError
+
+    def get(self, reservation_id):
+        """Return a single reservation or None"""
+        raise NotImplementedError
+
+    def for_date(self, date):
+        """Return all reservations on a date, ordered by time"""
+        raise NotImplementedError
+
+    def for_slot(self, date, time):
+        """Return all reservations at an exact date and time"""
+        return [r for r in self.for_date(date) if r['time'] == time]
+
+    def count(self):
+        """Total number of stored reservations"""
+        raise NotImplementedError
+
+    def claim_notifications(self, limit, lease):
+        """Lease up to `limit` due outbox rows, each with its 'reservation'
+
+        Leased rows are hidden from other senders for `lease` seconds, so
+        several worker processes can drain one outbox without sending twice.
+        """
+        raise NotImplementedError
+
+    def complete_notification(self, notification_id):
+        """Mark a notification as delivered"""
+        raise NotImplementedError
+
+    def fail_notification(self, notification_id, error, retry_at=None):
+        """Record a failed delivery; retry at `retry_at` (unix time), or dead-letter it when None"""
+        raise NotImplementedError
+
+    def notification_counts(self):
+        """Number of outbox rows per status ('pending', 'sent', 'dead')"""
+        raise NotImplementedError
+
+    def dead_notifications(self, limit=50):
+        """Most recent dead-lettered notifications"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any held resources"""
+
+
+def _outbox_row(notification_id, reservation_id, kind, recipient, now):
+    return {'id': notification_id, 'reservation_id': reservation_id, 'kind': kind, 'recipient': recipient,
+            'status': 'pending', 'attempts': 0, 'next_attempt_at': now, 'locked_until': None,
+            'last_error': None, 'created_at': datetime.now().isoformat(), 'sent_at': None}
+
+
+class MemoryReservationStore(ReservationStore):
+    """Process-local store, used by tests and the development server"""
+
+    def __init__(self):
+        self._rows = {}
+        self._ids = itertools.count(1)
+        self._outbox = {}
+        self._outbox_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, reservation, notifications=(), admit=None):
+        now = time.time()
+        with self._lock:
+            if admit is not None and not admit(self.for_date(reservation.get('date'))):
+                return None
+            row = dict(reservation, id=next(self._ids))
+            row.setdefault('booked_at', datetime.now())
+            self._rows[row['id']] = row
+            for kind, recipient in notifications:
+                notification_id = next(self._outbox_ids)
+                self._outbox[notification_id] = _outbox_row(notification_id, row['id'], kind, recipient, now)
+        return dict(row)
+
+    def get(self, reservation_id):
+        row = self._rows.get(reservation_id)
+        return dict(row) if row else None
+
+    def for_date(self, date):
+        rows = [dict(r) for r in self._rows.values() if r['date'] == date]
+        return sorted(rows, key=lambda r: (r['time'] or '', r['id']))
+
+    def count(self):
+        return len(self._rows)
+
+    def claim_notifications(self, limit, lease):
+        now = time.time()
+        claimed = []
+        with self._lock:
+            for row in self._outbox.values():
+                if len(claimed) == limit:
+                    break
+                if (row['status'] == 'pending' and row['next_attempt_at'] <= now
+                        and (row['locked_until'] is None or row['locked_until'] < now)):
+                    row['locked_until'] = now + lease
+                    claimed.append(dict(row, reservation=dict(self._rows[row['reservation_id']])))
+        return claimed
+
+    def complete_notification(self, notification_id):
+        with self._lock:
+            row = self._outbox[notification_id]
+            row.update(status='sent', attempts=row['attempts'] + 1, locked_until=None,
+                       sent_at=datetime.now().isoformat())
+
+    def fail_notification(self, notification_id, error, retry_at=None):
+        with self._lock:
+            row = self._outbox[notification_id]
+            row.update(status='pending' if retry_at is not None else 'dead', attempts=row['attempts'] + 1,
+                       last_error=error, locked_until=None,
+                       next_attempt_at=retry_at if retry_at is not None else row['next_attempt_at'])
+
+    def notification_counts(self):
+        return dict(Counter(row['status'] for row in self._outbox.values()))
+
+    def dead_notifications(self, limit=50):
+        dead = [dict(row) for row in self._outbox.values() if row['status'] == 'dead']
+        return dead[-limit:][::-1]
+
+
+class StorageError(RuntimeError):
+    """A store's backing database cannot be opened"""
+
+
+class _ThreadConnection:
+    """A thread's connection; released with the thread's locals when the thread exits"""
+
+    __slots__ = ('conn', 'pid', '__weakref__')
+
+    def __init__(self, conn, pid):
+        self.conn = conn
+        self.pid = pid
+
+
+def _release_connection(conn, pid, connections, lock):
+    # A forked child must leave the connections it inherited to the parent that uses them
+    if os.getpid() != pid:
+        return
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
+
+class SQLiteDatabase:
+    """Connection handling shared by the SQLite stores: WAL mode, one connection per thread
+
+    Nothing touches the disk until the first query, so importing the app
+    works on a read-only filesystem; an unwritable path fails there with a
+    StorageError naming it. A thread's connection is closed when the thread
+    exits, so servers that start a thread per request do not leak them.
+    """
+
+    SCHEMA = ()
+
+    def __init__(self, path, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = set()
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _initialize(self):
+        """Create the database file and schema on first use"""
+        with self._lock:
+            if self._ready:
+                return
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = self._open()
+                conn.execute('PRAGMA journal_mode=WAL')
+                with conn:
+                    for statement in self.SCHEMA:
+                        conn.execute(statement)
+                self._setup(conn)
+                conn.close()
+            except (OSError, sqlite3.Error) as e:
+                raise StorageError(f"Cannot open the SQLite database at {self.path}: {e}. "
+                                   f"Point the store URL at a writable, persistent path.") from e
+            self._ready = True
+
+    def _setup(self, conn):
+        """Hook for one-off migrations once the schema exists"""
+
+    def _open(self):
+        # Statements are compiled once per connection and reused from sqlite3's statement cache
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=64)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        return conn
+
+    def _connect(self):
+        """Return this thread's connection, opening one after a fork or on first use"""
+        held = getattr(self._local, 'held', None)
+        if held is not None and held.pid == os.getpid():
+            return held.conn
+        if not self._ready:
+            self._initialize()
+        conn = self._open()
+        held = _ThreadConnection(conn, os.getpid())
+        weakref.finalize(held, _release_connection, conn, held.pid, self._connections, self._lock)
+        self._local.held = held
+        with self._lock:
+            self._connections.add(conn)
+        return conn
+
+    def _execute(self, sql, params=()):
+        return self._connect().execute(sql, params)
+
+    def close(self):
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+class SQLiteReservationStore(SQLiteDatabase, ReservationStore):
+    """Durable reservation store backed by a SQLite file"""
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS reservations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT, email TEXT, phone TEXT,
+            date TEXT, time TEXT, guests TEXT,
+            special_requests TEXT,
+            booked_at TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_reservations_slot ON reservations (date, time)",
+        # Transactional outbox: notification rows commit together with their reservation
+        """CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reservation_id INTEGER NOT NULL REFERENCES reservations (id),
+            kind TEXT NOT NULL,
+            recipient TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            locked_until REAL,
+            last_error TEXT,
+            created_at TEXT NOT NULL,
+            sent_at TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)",
+    )
+
+    INSERT = ("INSERT INTO reservations (name, email, phone, date, time, guests, special_requests, booked_at) "
+              "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+    INSERT_OUTBOX = ("INSERT INTO outbox (reservation_id, kind, recipient, next_attempt_at, created_at) "
+                     "VALUES (?, ?, ?, ?, ?)")
+    SELECT = "SELECT * FROM reservations"
+
+    @staticmethod
+    def _to_dict(row):
+        data = dict(row)
+        data['booked_at'] = datetime.fromisoformat(data['booked_at'])
+        return data
+
+    def add(self, reservation, notifications=(), admit=None):
+        booked_at = reservation.get('booked_at') or datetime.now()
+        values = [reservation.get(field) for field in RESERVATION_FIELDS]
+        conn = self._connect()
+        # IMMEDIATE takes the write lock before the capacity check, so two workers
+        # cannot both see the last table free
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if admit is not None:
+                rows = conn.execute(self.SELECT + " WHERE date = ? ORDER BY time, id", (reservation.get('date'),))
+                if not admit([self._to_dict(row) for row in rows]):
+                    conn.rollback()
+                    return None
+            cursor = conn.execute(self.INSERT, values + [booked_at.isoformat()])
+            conn.executemany(self.INSERT_OUTBOX, [
+                (cursor.lastrowid, kind, recipient, time.time(), booked_at.isoformat())
+                for kind, recipient in notifications
+            ])
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return dict(reservation, id=cursor.lastrowid, booked_at=booked_at)
+
+    def get(self, reservation_id):
+        row = self._execute(self.SELECT + " WHERE id = ?", (reservation_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def for_date(self, date):
+        rows = self._execute(self.SELECT + " WHERE date = ? ORDER BY time, id", (date,))
+        return [self._to_dict(row) for row in rows]
+
+    def for_slot(self, date, time):
+        rows = self._execute(self.SELECT + " WHERE date = ? AND time = ? ORDER BY id", (date, time))
+        return [self._to_dict(row) for row in rows]
+
+    def count(self):
+        return self._execute("SELECT COUNT(*) FROM reservations").fetchone()[0]
+
+    def claim_notifications(self, limit, lease):
+        now = time.time()
+        conn = self._connect()
+        # IMMEDIATE takes the write lock up front, so two senders cannot lease the same rows
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = [dict(row) for row in conn.execute(
+                "SELECT * FROM outbox WHERE status = 'pending' AND next_attempt_at <= ? "
+                "AND (locked_until IS NULL OR locked_until < ?) ORDER BY id LIMIT ?", (now, now, limit))]
+            conn.executemany("UPDATE outbox SET locked_until = ? WHERE id = ?",
+                             [(now + lease, row['id']) for row in rows])
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        for row in rows:
+            row['reservation'] = self.get(row['reservation_id'])
+        return rows
+
+    def complete_notification(self, notification_id):
+        with self._connect() as conn:
+            conn.execute("UPDATE outbox SET status = 'sent', attempts = attempts + 1, locked_until = NULL, "
+                         "sent_at = ? WHERE id = ?", (datetime.now().isoformat(), notification_id))
+
+    def fail_notification(self, notification_id, error, retry_at=None):
+        with self._connect() as conn:
+            if retry_at is None:
+                conn.execute("UPDATE outbox SET status = 'dead', attempts = attempts + 1, locked_until = NULL, "
+                             "last_error = ? WHERE id = ?", (error, notification_id))
+            else:
+                conn.execute("UPDATE outbox SET attempts = attempts + 1, locked_until = NULL, last_error = ?, "
+                             "next_attempt_at = ? WHERE id = ?", (error, retry_at, notification_id))
+
+    def notification_counts(self):
+        rows = self._execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")
+        return {status: count for status, count in rows}
+
+    def dead_notifications(self, limit=50):
+        rows = self._execute("SELECT * FROM outbox WHERE status = 'dead' ORDER BY id DESC LIMIT ?", (limit,))
+        return [dict(row) for row in rows]
+
+
+class FeedbackStore:
+    """Interface every feedback backend implements"""
+
+    def add_many(self, feedbacks):
+        """Persist a batch of feedback dicts in one write"""
+        raise NotImplementedError
+
+    def count(self):
+        """Total number of stored feedback entries"""
+        raise NotImplementedError
+
+    def aggregates(self):
+        """FeedbackAggregates kept up to date on every insert"""
+        raise NotImplementedError
+
+    def iter_rows(self):
+        """Yield every stored feedback dict in id order without loading them all"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any held resources"""
+
+
+class MemoryFeedbackStore(FeedbackStore):
+    """Process-local feedback store, used by tests and the development server"""
+
+    def __init__(self):
+        self._rows = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._aggregates = FeedbackAggregates()
+
+    def add_many(self, feedbacks):
+        with self._lock:
+            for feedback in feedbacks:
+                self._rows.append(dict(feedback, id=next(self._ids)))
+                self._aggregates.add_feedback(feedback)
+
+    def count(self):
+        return len(self._rows)
+
+    def aggregates(self):
+        return self._aggregates
+
+    def iter_rows(self):
+        for row in list(self._rows):
+            yield dict(row)
+
+
+class SQLiteFeedbackStore(SQLiteDatabase, FeedbackStore):
+    """Durable feedback store backed by a SQLite file"""
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS feedback (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT, email TEXT, rating TEXT, comments TEXT,
+            submitted_at TEXT NOT NULL
+        )""",
+        # Running counts per day and rating (0 = unrated), updated with every insert
+        """CREATE TABLE IF NOT EXISTS feedback_daily (
+            day TEXT NOT NULL,
+            rating INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, rating)
+        )""",
+    )
+
+    INSERT = "INSERT INTO feedback (name, email, rating, comments, submitted_at) VALUES (?, ?, ?, ?, ?)"
+    UPSERT_DAILY = ("INSERT INTO feedback_daily (day, rating, count) VALUES (?, ?, ?) "
+                    "ON CONFLICT (day, rating) DO UPDATE SET count = count + excluded.count")
+    BACKFILL_DAILY = (
+        "INSERT INTO feedback_daily (day, rating, count) "
+        "SELECT substr(submitted_at, 1, 10), "
+        "CASE WHEN rating IN ('1', '2', '3', '4', '5') THEN CAST(rating AS INTEGER) ELSE 0 END, COUNT(*) "
+        "FROM feedback GROUP BY 1, 2"
+    )
+
+    def _setup(self, conn):
+        with conn:
+            # Databases created before the aggregate table existed are backfilled once
+            if conn.execute("SELECT 1 FROM feedback_daily LIMIT 1").fetchone() is None:
+                conn.execute(self.BACKFILL_DAILY)
+
+    def add_many(self, feedbacks):
+        rows = [
+            [feedback.get(field) for field in FEEDBACK_FIELDS] + [feedback['submitted_at'].isoformat()]
+            for feedback in feedbacks
+        ]
+        daily = Counter(
+            (day_of(feedback['submitted_at']), normalize_rating(feedback.get('rating')) or 0)
+            for feedback in feedbacks
+        )
+        conn = self._connect()
+        with conn:
+            conn.executemany(self.INSERT, rows)
+            conn.executemany(self.UPSERT_DAILY, [(day, rating, count) for (day, rating), count in daily.items()])
+
+    def count(self):
+        return self._execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+
+    def aggregates(self):
+        aggregates = FeedbackAggregates()
+        for row in self._execute("SELECT day, rating, count FROM feedback_daily"):
+            aggregates.add(row['day'], row['rating'] or None, row['count'])
+        return aggregates
+
+    def iter_rows(self):
+        # A dedicated cursor streams rows from SQLite as the caller consumes them
+        cursor = self._connect().execute("SELECT * FROM feedback ORDER BY id")
+        try:
+            for row in cursor:
+                yield dict(row)
+        finally:
+            cursor.close()
+
+
+def create_reservation_store(url):
+    """Build a store from a URL such as 'memory://' or 'sqlite:///path/to/file.db'"""
+    if url in ('memory', 'memory://'):
+        return MemoryReservationStore()
+    if url.startswith('sqlite:///'):
+        return SQLiteReservationStore(url[len('sqlite:///'):])
+    raise ValueError(f"Unsupported reservation store URL: {url!r}")
+
+
+def create_feedback_store(url):
+    """Build a feedback store from the same URL scheme as create_reservation_store"""
+    if url in ('memory', 'memory://'):
+        return MemoryFeedbackStore()
+    if url.startswith('sqlite:///'):
+        return SQLiteFeedbackStore(url[len('sqlite:///'):])
+    raise ValueError(f"Unsupported feedback store URL: {url!r}")
@@ -0,0 +1,68 @@
+"""
+RootStatix Cuisine - Template Bytecode Cache
+Loads Jinja templates from the bytecode compiled by build_templates.py, so a
+cold start skips parsing and compiling every page it renders
+"""
+
+import os
+from hashlib import sha1
+
+from jinja2 import FileSystemBytecodeCache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, 'build', 'jinja')
+
+
+class ShippedBytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache that is built once and deployed alongside the templates
+
+    Entries are keyed by template name alone, because the absolute source path
+    differs between the build machine and the server. Jinja still compares a
+    checksum of the source, so an edited template is simply recompiled. Writes
+    are best effort since serverless filesystems are read-only.
+    """
+
+    def get_cache_key(self, name, filename=None):
+        return sha1(name.encode('utf-8')).hexdigest()
+
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+def cache_path(cache, name):
+    """File the bytecode for a template is stored in"""
+    return os.path.join(cache.directory, cache.pattern % cache.get_cache_key(name))
+
+
+def compile_templates(env, cache_dir=CACHE_DIR, force=False):
+    """Compile every template the environment can find into the bytecode cache
+
+    Returns {template name: bytes written}; a template whose cached bytecode
+    already matches its source is reported with None.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    cache = ShippedBytecodeCache(cache_dir)
+    if force:
+        cache.clear()
+    results = {}
+    for name in env.list_templates(filter_func=lambda name: not name.startswith('.')):
+        path = cache_path(cache, name)
+        before = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        source, filename, _ = env.loader.get_source(env, name)
+        bucket = cache.get_bucket(env, name, filename, source)
+        if bucket.code is None:
+            bucket.code = env.compile(source, name, filename)
+            cache.set_bucket(bucket)
+        after = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        results[name] = os.path.getsize(path) if after != before else None
+    return results
+
+
+def init_app(app):
+    """Use the shipped bytecode cache when TEMPLATE_CACHE_DIR exists (set it empty to disable)"""
+    cache_dir = app.config.setdefault('TEMPLATE_CACHE_DIR', CACHE_DIR)
+    if cache_dir and os.path.isdir(cache_dir):
+        app.jinja_env.bytecode_cache = ShippedBytecodeCache(cache_dir)
@@ -0,0 +1,96 @@
+"""Build cache invalidation when job code changes"""
+
+import importlib
+import sys
+
+import pytest
+
+import asset_build
+from asset_build import Job, run_jobs
+
+HELPERS = '''
+def shout(text):
+    return text.upper()
+'''
+
+BUILDER = '''
+import os
+
+from cachetest_helpers import shout
+
+SUFFIX = '!'
+
+
+def build(source, output):
+    with open(source) as f:
+        text = f.read()
+    with open(output, 'w') as f:
+        f.write(transform(text))
+    return os.path.getsize(output)
+
+
+def transform(text):
+    return shout(text) + SUFFIX
+'''
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / 'cachetest_helpers.py').write_text(HELPERS)
+    (tmp_path / 'cachetest_builder.py').write_text(BUILDER)
+    (tmp_path / 'page.txt').write_text('hello')
+    builder = importlib.import_module('cachetest_builder')
+    helpers = importlib.import_module('cachetest_helpers')
+    yield tmp_path, builder, helpers
+    # Each test writes its own copies of the modules
+    sys.modules.pop('cachetest_builder')
+    sys.modules.pop('cachetest_helpers')
+
+
+def build(project, code=()):
+    path, builder, _helpers = project
+    # Each build script run is a fresh process with an empty source hash memo
+    asset_build._source_hashes.clear()
+    job = Job('page', builder.build, args=(str(path / 'page.txt'), str(path / 'page.out')),
+              inputs=[str(path / 'page.txt')], outputs=[str(path / 'page.out')], code=code)
+    return run_jobs([job], 'test', workers=1, cache_path=str(path / 'cache.json'))
+
+
+def edit(path, old, new):
+    path.write_text(path.read_text().replace(old, new))
+
+
+def test_unchanged_job_is_skipped(project):
+    assert build(project).timings.keys() == {'page'}
+    assert build(project).skipped == ['page']
+
+
+def test_editing_a_helper_in_the_job_module_rebuilds(project):
+    path, _builder, _helpers = project
+    build(project)
+
+    edit(path / 'cachetest_builder.py', '+ SUFFIX', '+ SUFFIX + SUFFIX')
+
+    assert build(project).skipped == []
+
+
+def test_editing_a_module_constant_rebuilds(project):
+    path, _builder, _helpers = project
+    build(project)
+
+    edit(path / 'cachetest_builder.py', "SUFFIX = '!'", "SUFFIX = '?'")
+
+    assert build(project).skipped == []
+
+
+def test_declared_code_modules_feed_the_key(project):
+    path, _builder, helpers = project
+    build(project, code=(helpers.shout,))
+    assert build(project, code=(helpers.shout,)).skipped == ['page']
+
+    edit(path / 'cachetest_helpers.py', 'upper()', 'title()')
+
+    assert build(project, code=(helpers.shout,)).skipped == []
+    # Modules work as well as functions from them
+    assert build(project, code=(helpers,)).skipped == ['page']
@@ -0,0 +1,127 @@
+"""Table capacity: validation, the cached day index and concurrent bookings"""
+
+import multiprocessing
+import os
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from availability import AvailabilityEngine
+from storage import MemoryReservationStore, SQLiteReservationStore
+
+DAY = (date.today() + timedelta(days=7)).isoformat()
+ONE_TABLE = (('T1', 8),)
+TWO_TABLES = (('T1', 2), ('T2', 4))
+
+
+def reservation(n, guests=2, time='19:00', day=DAY):
+    return {'name': f'Guest {n}', 'email': f'guest{n}@example.test', 'phone': '+91 98765 43210',
+            'date': day, 'time': time, 'guests': str(guests), 'special_requests': ''}
+
+
+def test_validate_enforces_the_service_hours_and_party_size():
+    engine = AvailabilityEngine(MemoryReservationStore())
+
+    assert engine.validate(reservation(1)) == []
+    assert engine.validate(reservation(1, time=engine.last_seating)) == []
+    assert engine.validate(reservation(1, time='22:30')) == ['Please choose a time between 11:00 and 22:00.']
+    assert engine.validate(reservation(1, time='10:30')) != []
+    assert engine.validate(reservation(1, guests=0)) != []
+    assert engine.validate(reservation(1, guests='9+')) == []
+    assert engine.validate(reservation(1, day='2020-01-01')) == ['Please choose a date from today onwards.']
+
+
+def test_tables_fill_up_and_overlapping_seatings_are_refused():
+    engine = AvailabilityEngine(MemoryReservationStore(), tables=TWO_TABLES)
+
+    assert engine.book(reservation(1, guests=2)) is not None
+    assert engine.book(reservation(2, guests=2)) is not None  # takes the 4-seat table
+    assert engine.book(reservation(3, guests=1, time='19:30')) is None
+    assert engine.book(reservation(4, guests=1, time='20:30')) is not None
+    assert engine.free_slots(DAY, 2)[-1] == '22:00'
+    assert '19:00' not in engine.free_slots(DAY, 2)
+
+
+def test_bookings_from_another_worker_are_counted():
+    store = MemoryReservationStore()
+    ours, theirs = AvailabilityEngine(store, tables=ONE_TABLE), AvailabilityEngine(store, tables=ONE_TABLE)
+    assert ours.fits(DAY, '19:00', 2)  # caches the empty day
+
+    assert theirs.book(reservation(1)) is not None
+
+    assert ours.book(reservation(2)) is None
+
+
+def test_extending_the_cached_index_matches_a_rebuild():
+    store = MemoryReservationStore()
+    engine = AvailabilityEngine(store)
+    other = AvailabilityEngine(store)
+    for n in range(12):
+        (engine if n % 3 else other).book(reservation(n, guests=1 + n % 6, time=f'{18 + n % 4}:00'))
+
+    engine.ttl = 0
+    rebuilt = engine._day(DAY)
+    extended = engine._replay(store.for_date(DAY), engine._replay(store.for_date(DAY)[:5]))
+
+    assert extended.occupied == rebuilt.occupied
+    assert (extended.count, extended.last_id) == (rebuilt.count, rebuilt.last_id) == (12, 12)
+
+
+def test_threads_cannot_overbook_the_last_table():
+    engine = AvailabilityEngine(MemoryReservationStore(), tables=ONE_TABLE)
+    start = threading.Barrier(8)
+    results = []
+
+    def book(n):
+        start.wait()
+        results.append(engine.book(reservation(n, guests=8)))
+
+    threads = [threading.Thread(target=book, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert sum(result is not None for result in results) == 1
+
+
+def _book_in_worker(path, n, start, results):
+    # Each worker process has its own store connection and engine, as under serve.py
+    engine = AvailabilityEngine(SQLiteReservationStore(path), tables=ONE_TABLE)
+    engine.fits(DAY, '19:00', 8)  # every worker has seen the table free
+    start.wait()
+    results.put(engine.book(reservation(n, guests=8)) is not None)
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork')
+def test_processes_cannot_overbook_the_last_table(tmp_path):
+    path = str(tmp_path / 'reservations.db')
+    SQLiteReservationStore(path).count()
+    context = multiprocessing.get_context('fork')
+    start = context.Barrier(6)
+    results = context.Queue()
+    workers = [context.Process(target=_book_in_worker, args=(path, n, start, results)) for n in range(6)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+
+    booked = [results.get(timeout=5) for _ in workers]
+    assert booked.count(True) == 1
+    assert SQLiteReservationStore(path).count() == 1
+
+
+def test_reservation_form_offers_only_bookable_times(monkeypatch):
+    os.environ.setdefault('RESERVATION_STORE', 'memory://')
+    from app import app
+
+    # The limiter's buckets persist in the instance folder across runs
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_ENABLED', False)
+    client = app.test_client()
+    page = client.get('/reservation').get_data(as_text=True)
+    assert 'min="11:00" max="22:00"' in page
+
+    response = client.post('/reservation', data=reservation(1, time='23:00'))
+    assert response.status_code == 400
+    assert 'between 11:00 and 22:00' in response.get_data(as_text=True)
@@ -0,0 +1,36 @@
+"""CSS and JS minifiers"""
+
+from build_assets import minify_css, minify_js
+
+
+def test_css_whitespace_and_comments_are_dropped():
+    source = '/* header */\n.nav > a ,\n.nav  b {\n    color : red ;\n    margin: 0  auto;\n}\n'
+
+    assert minify_css(source) == '.nav>a,.nav b{color :red;margin:0 auto}\n'
+
+
+def test_css_strings_are_kept_verbatim():
+    source = '''.quote::before { content: "  ;  {  } /* not a comment */ "; }
+.menu { font-family: 'Playfair   Display', serif; }
+'''
+
+    assert minify_css(source) == ('.quote::before{content:"  ;  {  } /* not a comment */ "}'
+                                  ".menu{font-family:'Playfair   Display',serif}\n")
+
+
+def test_css_urls_are_kept_verbatim():
+    source = '.hero { background: url( "images/hero  1.jpg" ) center, URL(images/a,b.png) ; }\n'
+
+    assert minify_css(source) == '.hero{background:url( "images/hero  1.jpg" ) center,URL(images/a,b.png)}\n'
+
+
+def test_css_escaped_quotes_end_strings_correctly():
+    source = '''a { content: "say \\"hi  there\\""; } b { content: 'it\\'s  ok'; }'''
+
+    assert minify_css(source) == '''a{content:"say \\"hi  there\\""}b{content:'it\\'s  ok'}\n'''
+
+
+def test_js_keeps_lines_and_template_literals():
+    source = '// setup\nconst a = 1;\n\n    const t = `\n  keep  this\n`;\n'
+
+    assert minify_js(source).splitlines()[:4] == ['const a = 1;', 'const t = `', '  keep  this', '`;']
@@ -0,0 +1,70 @@
+"""CatalogRegistry reloading and its handling of broken data files"""
+
+import json
+import shutil
+
+import pytest
+
+from catalog import DATA_FILE, CatalogRegistry, load_catalog
+
+
+@pytest.fixture
+def registry(tmp_path):
+    default_path = tmp_path / 'catalog.json'
+    shutil.copy(DATA_FILE, default_path)
+    locations = tmp_path / 'locations'
+    locations.mkdir()
+    (locations / 'pune.json').write_text(json.dumps({'contact': {'address': 'Koregaon Park, Pune'}}))
+    return CatalogRegistry(load_catalog(str(default_path)), default_path=str(default_path),
+                           locations_dir=str(locations), ttl=60)
+
+
+def edit(path, data):
+    path.write_text(json.dumps(data))
+
+
+def test_outlet_inherits_the_default_sections(registry):
+    pune = registry.get('pune')
+
+    assert pune.contact['address'] == 'Koregaon Park, Pune'
+    assert pune.dishes == registry.get().dishes
+
+
+def test_edits_are_picked_up_after_clear(registry, tmp_path):
+    first = registry.get('pune')
+    edit(tmp_path / 'locations' / 'pune.json', {'contact': {'address': 'Baner, Pune'}})
+
+    assert registry.get('pune') is first  # within the TTL
+    registry.clear()
+    assert registry.get('pune').contact['address'] == 'Baner, Pune'
+
+
+def test_broken_outlet_file_keeps_the_previous_catalog(registry, tmp_path):
+    first = registry.get('pune')
+    (tmp_path / 'locations' / 'pune.json').write_text('{"contact": {"addr')
+    registry.ttl = 0
+
+    assert registry.get('pune') is first
+
+    edit(tmp_path / 'locations' / 'pune.json', {'contact': {'address': 'Baner, Pune'}})
+    assert registry.get('pune').contact['address'] == 'Baner, Pune'
+
+
+def test_broken_outlet_file_never_loaded_is_not_found(registry, tmp_path):
+    (tmp_path / 'locations' / 'goa.json').write_text('not json')
+
+    with pytest.raises(KeyError):
+        registry.get('goa')
+
+
+def test_broken_default_file_keeps_the_previous_catalog(registry, tmp_path):
+    first = registry.get()
+    (tmp_path / 'catalog.json').write_text('{')
+    registry.clear()
+
+    assert registry.get() is first
+
+
+def test_unknown_outlet_is_not_found(registry):
+    with pytest.raises(KeyError):
+        registry.get('nowhere')
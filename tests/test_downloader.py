@@ -0,0 +1,218 @@
+"""Downloader against a local HTTP stand-in for the image hosts"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from downloader import Downloader
+
+BODY = bytes(range(256)) * 800  # 200 KB, several chunks
+ETAG = '"v1"'
+
+
+class ImageHost:
+    """Serves `files` with ETags and byte ranges; `failures[path]` lists what to do instead, in order
+
+    A failure is ('status', code) for an error reply, or ('truncate', n) to
+    promise the whole body and hang up after n bytes.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.failures = {}
+        self.requests = []
+        self.close_connections = False
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                host.requests.append({'path': self.path, 'headers': dict(self.headers),
+                                      'client': self.client_address})
+                failures = host.failures.get(self.path)
+                if failures:
+                    kind, value = failures.pop(0)
+                    if kind == 'status':
+                        self.send_response(value)
+                        self.send_header('Retry-After', '0')
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                    body, etag = host.files[self.path]
+                    self.send_response(200)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body[:value])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+
+                body, etag = host.files[self.path]
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                start = 0
+                requested = self.headers.get('Range')
+                if requested and self.headers.get('If-Range') == etag:
+                    start = int(requested.split('=')[1].split('-')[0])
+                self.send_response(206 if start else 200)
+                self.send_header('ETag', etag)
+                if start:
+                    self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+                self.send_header('Content-Length', str(len(body) - start))
+                if host.close_connections:
+                    self.send_header('Connection', 'close')
+                    self.close_connection = True
+                self.end_headers()
+                self.wfile.write(body[start:])
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def host():
+    host = ImageHost()
+    host.files['/dish.jpg'] = (BODY, ETAG)
+    yield host
+    host.close()
+
+
+def downloader(dest, **options):
+    options = dict({'workers': 1, 'min_interval': 0, 'retries': 0, 'backoff': 0, 'timeout': 5}, **options)
+    return Downloader(str(dest), **options)
+
+
+def test_interrupted_download_resumes_in_a_new_run(host, tmp_path):
+    host.failures['/dish.jpg'] = [('truncate', 100_000)]
+    images = {'dish.jpg': host.url + '/dish.jpg'}
+
+    assert downloader(tmp_path).download_all(images) == {'dish.jpg': 'failed'}
+    part = tmp_path / 'dish.jpg.part'
+    assert part.stat().st_size == 100_000
+    # The validator is on disk before the run ends, not only in the run's memory
+    assert json.loads((tmp_path / 'dish.jpg.part.json').read_text())['validator'] == ETAG
+
+    assert downloader(tmp_path).download_all(images) == {'dish.jpg': 'resumed'}
+    assert (tmp_path / 'dish.jpg').read_bytes() == BODY
+    assert host.requests[-1]['headers']['Range'] == 'bytes=100000-'
+    assert host.requests[-1]['headers']['If-Range'] == ETAG
+    assert not part.exists() and not (tmp_path / 'dish.jpg.part.json').exists()
+
+
+def test_changed_file_restarts_instead_of_splicing(host, tmp_path):
+    (tmp_path / 'dish.jpg.part').write_bytes(b'x' * 5000)
+    (tmp_path / 'dish.jpg.part.json').write_text(json.dumps(
+        {'url': host.url + '/dish.jpg', 'validator': '"v0"'}))
+
+    result = downloader(tmp_path).download_all({'dish.jpg': host.url + '/dish.jpg'})
+
+    assert result == {'dish.jpg': 'downloaded'}
+    assert host.requests[0]['headers']['If-Range'] == '"v0"'
+    assert (tmp_path / 'dish.jpg').read_bytes() == BODY
+
+
+def test_partial_from_another_url_is_not_resumed(host, tmp_path):
+    (tmp_path / 'dish.jpg.part').write_bytes(b'x' * 5000)
+    (tmp_path / 'dish.jpg.part.json').write_text(json.dumps(
+        {'url': host.url + '/elsewhere.jpg', 'validator': ETAG}))
+
+    assert downloader(tmp_path).download_all({'dish.jpg': host.url + '/dish.jpg'}) == {'dish.jpg': 'downloaded'}
+    assert 'Range' not in host.requests[0]['headers']
+    assert (tmp_path / 'dish.jpg').read_bytes() == BODY
+
+
+def test_server_errors_are_retried(host, tmp_path):
+    host.failures['/dish.jpg'] = [('status', 503), ('status', 429)]
+
+    result = downloader(tmp_path, retries=2).download_all({'dish.jpg': host.url + '/dish.jpg'})
+
+    assert result == {'dish.jpg': 'downloaded'}
+    assert len(host.requests) == 3
+    assert (tmp_path / 'dish.jpg').read_bytes() == BODY
+
+
+def test_gives_up_after_the_last_retry(host, tmp_path):
+    host.failures['/dish.jpg'] = [('status', 503)] * 3
+    reported = []
+
+    downloader(tmp_path, retries=1).download_all({'dish.jpg': host.url + '/dish.jpg'},
+                                                 on_result=lambda *result: reported.append(result))
+
+    assert reported == [('dish.jpg', 'failed', 'HTTP 503')]
+    assert len(host.requests) == 2
+    assert not (tmp_path / 'dish.jpg').exists()
+
+
+def test_client_errors_are_not_retried(host, tmp_path):
+    host.failures['/dish.jpg'] = [('status', 404)]
+
+    assert downloader(tmp_path, retries=3).download_all({'dish.jpg': host.url + '/dish.jpg'}) == {'dish.jpg': 'failed'}
+    assert len(host.requests) == 1
+
+
+def test_unchanged_file_is_not_downloaded_again(host, tmp_path):
+    images = {'dish.jpg': host.url + '/dish.jpg'}
+    downloader(tmp_path).download_all(images)
+
+    assert downloader(tmp_path).download_all(images) == {'dish.jpg': 'not_modified'}
+    assert host.requests[-1]['headers']['If-None-Match'] == ETAG
+
+
+def test_keep_alive_connection_is_reused(host, tmp_path):
+    host.files['/gallery.jpg'] = (BODY[:1000], '"g1"')
+
+    downloader(tmp_path).download_all({'dish.jpg': host.url + '/dish.jpg',
+                                       'gallery.jpg': host.url + '/gallery.jpg'})
+
+    assert len({request['client'] for request in host.requests}) == 1
+
+
+def test_connection_closed_by_the_server_is_closed_and_replaced(host, tmp_path):
+    host.files['/gallery.jpg'] = (BODY[:1000], '"g1"')
+    host.close_connections = True
+    d = downloader(tmp_path)
+    used = []
+    connection = d._connection
+    d._connection = lambda scheme, netloc: used.append(connection(scheme, netloc)) or used[-1]
+
+    assert d.fetch('dish.jpg', host.url + '/dish.jpg')[1] == 'downloaded'
+    assert d.fetch('gallery.jpg', host.url + '/gallery.jpg')[1] == 'downloaded'
+
+    assert used[0] is not used[1]
+    assert all(conn.sock is None for conn in used)
+    assert d._local.connections == {}
+    assert (tmp_path / 'gallery.jpg').read_bytes() == BODY[:1000]
+
+
+def test_manifest_is_saved_as_each_download_completes(host, tmp_path):
+    host.files['/gallery.jpg'] = (BODY[:1000], '"g1"')
+    images = {'dish.jpg': host.url + '/dish.jpg', 'gallery.jpg': host.url + '/gallery.jpg'}
+    seen = []
+
+    def interrupt(filename, status, detail):
+        seen.append(json.loads((tmp_path / '.downloads.json').read_text()))
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        downloader(tmp_path).download_all(images, on_result=interrupt)
+
+    # With one worker the first file lands first, and was on record before the run was cut short
+    assert list(seen[0]) == ['dish.jpg']
+    assert seen[0]['dish.jpg']['bytes'] == len(BODY)
+    assert not (tmp_path / '.downloads.json.tmp').exists()
@@ -0,0 +1,53 @@
+"""Placeholder gradient rendering (the script itself is never run here: it overwrites the photos)"""
+
+import pytest
+
+from generate_images import _normalize_stops, render_gradient
+
+RED, BLUE, WHITE = (255, 0, 0), (0, 0, 255), (255, 255, 255)
+
+
+def test_vertical_gradient_matches_the_row_by_row_renderer():
+    image = render_gradient(4, 10, (RED, BLUE))
+
+    for y in range(10):
+        ratio = y / 10
+        expected = tuple(int(a * (1 - ratio) + b * ratio) for a, b in zip(RED, BLUE))
+        assert image.getpixel((0, y)) == image.getpixel((3, y)) == expected
+
+
+def test_horizontal_gradient_varies_along_the_width():
+    image = render_gradient(10, 3, (RED, BLUE), 'horizontal')
+
+    assert image.size == (10, 3)
+    assert image.getpixel((0, 0)) == image.getpixel((0, 2)) == RED
+    assert image.getpixel((9, 1))[2] > image.getpixel((5, 1))[2] > 0
+
+
+def test_diagonal_gradient_runs_corner_to_corner():
+    image = render_gradient(7, 4, (RED, BLUE), 'diagonal')
+
+    assert image.getpixel((0, 0)) == RED
+    assert image.getpixel((6, 3)) == BLUE
+    # Same x + y, same colour
+    assert image.getpixel((3, 0)) == image.getpixel((2, 1)) == image.getpixel((0, 3))
+
+
+@pytest.mark.parametrize('direction', ['vertical', 'horizontal', 'diagonal'])
+def test_a_single_stop_is_a_solid_fill(direction):
+    image = render_gradient(5, 3, (WHITE,), direction)
+
+    assert image.getcolors() == [(15, WHITE)]
+
+
+def test_single_pixel_and_positioned_stops():
+    assert render_gradient(1, 1, (RED, BLUE), 'diagonal').getpixel((0, 0)) == RED
+    assert _normalize_stops([(1, BLUE), (0, RED)]) == [(0.0, RED), (1.0, BLUE)]
+    assert _normalize_stops([RED]) == [(0.0, RED)]
+
+
+def test_bad_arguments_are_rejected():
+    with pytest.raises(ValueError):
+        render_gradient(2, 2, ())
+    with pytest.raises(ValueError):
+        render_gradient(2, 2, (RED, BLUE), 'radial')
@@ -0,0 +1,104 @@
+"""BatchWriter retries and drops"""
+
+import sqlite3
+import threading
+import time
+
+from ingest import BatchWriter
+
+
+class FlakyStore:
+    """Fails the first `failures` flushes the way a locked database does"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+        self.rows = []
+        self.flushed = threading.Event()
+
+    def add_many(self, batch):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise sqlite3.OperationalError('database is locked')
+        self.rows += batch
+        self.flushed.set()
+
+
+def writer(store, **options):
+    options = dict({'max_delay': 0.01, 'backoff': 0.01, 'max_backoff': 0.05}, **options)
+    return BatchWriter(store.add_many, name='test', **options)
+
+
+def test_failed_batch_is_retried_until_it_is_written():
+    store = FlakyStore(failures=2)
+    w = writer(store)
+    for n in range(3):
+        w.submit({'n': n})
+    w.close()
+
+    assert store.rows == [{'n': 0}, {'n': 1}, {'n': 2}]
+    stats = w.stats()
+    assert (stats['flushed'], stats['retried'], stats['dropped'], stats['batches']) == (3, 2, 0, 1)
+
+
+def test_batch_is_dropped_only_when_the_attempts_run_out():
+    store = FlakyStore(failures=100)
+    w = writer(store, max_attempts=3)
+    w.submit({'n': 1})
+    w.submit({'n': 2})
+    w.close()
+
+    assert store.calls == 3
+    stats = w.stats()
+    assert (stats['flushed'], stats['retried'], stats['dropped']) == (0, 2, 2)
+
+
+def test_items_queued_during_backoff_are_written_afterwards():
+    store = FlakyStore(failures=1)
+    w = writer(store, backoff=0.2, max_batch=1)
+    w.submit({'n': 1})
+    time.sleep(0.05)
+    w.submit({'n': 2})
+
+    assert store.flushed.wait(2)
+    w.close()
+    assert store.rows == [{'n': 1}, {'n': 2}]
+
+
+def test_close_does_not_sit_out_the_backoff():
+    store = FlakyStore(failures=100)
+    w = writer(store, backoff=30, max_backoff=30, max_attempts=3)
+    w.submit({'n': 1})
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    w.close()
+
+    assert time.monotonic() - started < 2
+    assert w.stats()['dropped'] == 1
+
+
+def test_synchronous_fallback_does_not_retry_on_the_request_thread():
+    store = FlakyStore(failures=100)
+    writer_busy = threading.Event()
+    release = threading.Event()
+
+    def flush(batch):
+        if not writer_busy.is_set():
+            writer_busy.set()
+            release.wait(5)
+        store.add_many(batch)
+
+    w = BatchWriter(flush, name='test', max_delay=0, max_queue=1, backoff=30, max_backoff=30)
+    w.submit({'n': 0})  # taken by the writer, which then hangs on the store
+    assert writer_busy.wait(2)
+    w.submit({'n': 1})  # fills the queue
+
+    started = time.monotonic()
+    w.submit({'n': 2})  # written on this thread
+
+    assert time.monotonic() - started < 1
+    assert store.calls == 1
+    assert (w.stats()['dropped'], w.stats()['retried']) == (1, 0)
+    release.set()
+    w.close()
@@ -0,0 +1,30 @@
+"""/api/menu query validation"""
+
+import os
+
+import pytest
+
+os.environ.setdefault('RESERVATION_STORE', 'memory://')
+from app import app  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.mark.parametrize('query', ['min_price=nan', 'max_price=inf', 'min_price=-inf', 'max_price=NaN',
+                                   'min_price=-1', 'max_price=abc'])
+def test_unusable_prices_are_rejected(client, query):
+    assert client.get(f'/api/menu?{query}').status_code == 400
+
+
+def test_price_range_filters_the_menu(client):
+    everything = client.get('/api/menu').get_json()
+    prices = sorted(item['amount'] for item in everything['items'])
+    low, high = prices[len(prices) // 4], prices[3 * len(prices) // 4]
+
+    items = client.get(f'/api/menu?min_price={low}&max_price={high}').get_json()['items']
+
+    assert 0 < len(items) < everything['count']
+    assert all(low <= item['amount'] <= high for item in items)
@@ -0,0 +1,302 @@
+"""Reservation emails against an in-process SMTP server"""
+
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+from email import message_from_bytes
+
+import pytest
+from aiosmtpd.controller import Controller
+
+import outbox
+from storage import MemoryReservationStore, SQLiteReservationStore
+
+# Rendering needs the app's templates and filters; keep it off the real database
+os.environ.setdefault('RESERVATION_STORE', 'memory://')
+from app import app  # noqa: E402
+
+STAFF = 'host@rootstatix.test'
+
+
+class Mailbox:
+    """aiosmtpd handler that keeps what it accepts and replies as scripted
+
+    `rcpt_replies[address]` rejects a recipient; `data_replies` are used, in
+    order, for the next messages instead of accepting them.
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.rcpt_replies = {}
+        self.data_replies = []
+        self.data_delay = 0
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        reply = self.rcpt_replies.get(address)
+        if reply:
+            return reply
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.data_delay:
+            await asyncio.sleep(self.data_delay)
+        if self.data_replies:
+            return self.data_replies.pop(0)
+        self.messages.append(message_from_bytes(envelope.content))
+        return '250 Message accepted for delivery'
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp():
+    mailbox = Mailbox()
+    controller = Controller(mailbox, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    mailbox.url = f'smtp://127.0.0.1:{controller.port}'
+    yield mailbox
+    controller.stop()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'reservations.db')
+
+
+@pytest.fixture
+def store(db_path):
+    store = SQLiteReservationStore(db_path)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def mail_config(smtp, monkeypatch):
+    monkeypatch.setitem(app.config, 'MAIL_URL', smtp.url)
+    monkeypatch.setitem(app.config, 'MAIL_FROM', 'RootStatix Cuisine <tables@rootstatix.test>')
+    monkeypatch.setitem(app.config, 'STAFF_EMAIL', STAFF)
+    monkeypatch.setitem(app.extensions, 'outbox', None)
+
+
+@pytest.fixture
+def build_message(mail_config):
+    sender = outbox.init_app(app, MemoryReservationStore())
+    sender.close()
+    return sender.build_message
+
+
+@pytest.fixture
+def make_sender(smtp, build_message):
+    senders = []
+
+    def make_sender(store, **options):
+        options = dict({'staff': [STAFF], 'backoff': 0.2, 'max_backoff': 1.0}, **options)
+        sender = outbox.OutboxSender(store, outbox.SMTPTransport(smtp.url), build_message, **options)
+        senders.append(sender)
+        return sender
+
+    yield make_sender
+    for sender in senders:
+        sender.transport.close()
+
+
+def book(store, sender, n=1, email=None):
+    reservation = {'name': f'Guest {n}', 'email': email or f'guest{n}@example.test', 'phone': '+91 98765 43210',
+                   'date': '2026-11-20', 'time': '19:00', 'guests': 2, 'special_requests': ''}
+    return store.add(reservation, notifications=sender.notifications_for(reservation))
+
+
+def outbox_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute('SELECT * FROM outbox ORDER BY id')]
+    finally:
+        conn.close()
+
+
+def test_guest_and_staff_emails_are_delivered_over_one_connection(smtp, store, make_sender):
+    sender = make_sender(store)
+    reservation = book(store, sender, email='asha@example.test')
+
+    assert sender.run_once() == 2
+
+    assert sorted(message['To'] for message in smtp.messages) == ['asha@example.test', STAFF]
+    guest = next(message for message in smtp.messages if message['To'] == 'asha@example.test')
+    assert guest['Subject'] == f"Your table at RootStatix Cuisine is booked (CPC-{reservation['id']:06d})"
+    assert f"CPC-{reservation['id']:06d}" in guest.get_payload()
+    staff = next(message for message in smtp.messages if message['To'] == STAFF)
+    assert staff['Reply-To'] == 'asha@example.test'
+    assert smtp.connections == 1
+    assert store.notification_counts() == {'sent': 2}
+
+
+def test_temporary_failure_is_retried_with_exponential_backoff(smtp, db_path, store, make_sender):
+    sender = make_sender(store, staff=[])
+    book(store, sender)
+    smtp.data_replies = ['451 Try again later', '451 Try again later']
+
+    started = time.time()
+    assert sender.run_once() == 1
+    row = outbox_rows(db_path)[0]
+    assert (row['status'], row['attempts']) == ('pending', 1)
+    assert row['next_attempt_at'] - started == pytest.approx(0.2, abs=0.1)
+    assert '451' in row['last_error']
+    # Not due yet
+    assert sender.run_once() == 0
+
+    time.sleep(0.25)
+    started = time.time()
+    assert sender.run_once() == 1
+    row = outbox_rows(db_path)[0]
+    assert row['attempts'] == 2
+    assert row['next_attempt_at'] - started == pytest.approx(0.4, abs=0.1)
+
+    time.sleep(0.45)
+    assert sender.run_once() == 1
+    assert store.notification_counts() == {'sent': 1}
+    assert len(smtp.messages) == 1
+
+
+def test_lost_connection_is_retried_on_a_new_one(smtp, store, make_sender):
+    sender = make_sender(store, staff=[])
+    book(store, sender, 1)
+    sender.run_once()
+    book(store, sender, 2)
+    # The connection dies between messages; the next one goes out on a fresh connection
+    sender.transport._smtp.sock.close()
+
+    assert sender.run_once() == 1
+    assert len(smtp.messages) == 2
+    assert store.notification_counts() == {'sent': 2}
+
+
+def test_rejected_recipient_is_dead_lettered_at_once(smtp, db_path, store, make_sender):
+    sender = make_sender(store, staff=[])
+    smtp.rcpt_replies['nobody@example.test'] = '550 No such user'
+    book(store, sender, email='nobody@example.test')
+
+    assert sender.run_once() == 1
+
+    assert store.notification_counts() == {'dead': 1}
+    dead = store.dead_notifications()
+    assert dead[0]['recipient'] == 'nobody@example.test' and '550' in dead[0]['last_error']
+    assert outbox_rows(db_path)[0]['attempts'] == 1
+
+
+def test_row_is_dead_lettered_when_its_attempts_run_out(smtp, store, make_sender):
+    sender = make_sender(store, staff=[], max_attempts=2, backoff=0.05)
+    book(store, sender)
+    smtp.data_replies = ['451 Try again later'] * 5
+
+    assert sender.run_once() == 1
+    time.sleep(0.1)
+    assert sender.run_once() == 1
+
+    assert store.notification_counts() == {'dead': 1}
+    assert smtp.messages == []
+
+
+def test_leased_rows_are_hidden_from_other_workers_until_the_lease_expires(db_path, store):
+    other = SQLiteReservationStore(db_path)
+    try:
+        for n in range(4):
+            store.add({'name': f'Guest {n}', 'date': '2026-11-20', 'time': '19:00', 'guests': 2},
+                      notifications=[(outbox.GUEST_CONFIRMATION, f'guest{n}@example.test')])
+
+        first = store.claim_notifications(3, lease=0.2)
+        second = other.claim_notifications(3, lease=0.2)
+        assert [row['id'] for row in first] == [1, 2, 3]
+        assert [row['id'] for row in second] == [4]
+        assert other.claim_notifications(3, lease=0.2) == []
+
+        # A worker that died mid-batch leaves its rows to be picked up once the lease runs out
+        time.sleep(0.25)
+        assert [row['id'] for row in other.claim_notifications(10, lease=0.2)] == [1, 2, 3, 4]
+    finally:
+        other.close()
+
+
+def test_two_workers_draining_one_outbox_send_each_email_once(smtp, db_path, store, make_sender):
+    other = SQLiteReservationStore(db_path)
+    senders = [make_sender(store, staff=[], batch_size=4), make_sender(other, staff=[], batch_size=4)]
+    for n in range(30):
+        book(store, senders[0], n)
+    start = threading.Barrier(2)
+
+    def drain(sender):
+        start.wait()
+        while sender.run_once():
+            pass
+
+    threads = [threading.Thread(target=drain, args=(sender,)) for sender in senders]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+    finally:
+        other.close()
+
+    recipients = [message['To'] for message in smtp.messages]
+    assert sorted(recipients) == sorted(f'guest{n}@example.test' for n in range(30))
+    assert store.notification_counts() == {'sent': 30}
+
+
+def test_init_app_drains_rows_left_by_an_earlier_process(smtp, mail_config):
+    store = MemoryReservationStore()
+    store.add({'name': 'Guest', 'email': 'early@example.test', 'date': '2026-11-20', 'time': '19:00',
+               'guests': 2}, notifications=[(outbox.GUEST_CONFIRMATION, 'early@example.test')])
+
+    sender = outbox.init_app(app, store)
+    try:
+        deadline = time.monotonic() + 5
+        while store.notification_counts() != {'sent': 1} and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        sender.close()
+
+    assert [message['To'] for message in smtp.messages] == ['early@example.test']
+
+
+def test_default_lease_outlasts_a_batch_of_timed_out_sends(store, build_message):
+    sender = outbox.OutboxSender(store, outbox.SMTPTransport('smtp://localhost', timeout=10.0), build_message)
+
+    assert sender.lease > sender.batch_size * 10.0 * 2
+
+
+def test_rows_whose_lease_could_expire_mid_send_are_not_sent(smtp, store, build_message):
+    smtp.data_delay = 0.15
+    transport = outbox.SMTPTransport(smtp.url, timeout=0.25)
+    sender = outbox.OutboxSender(store, transport, build_message, lease=0.6)
+    try:
+        for n in range(3):
+            book(store, sender, n)
+
+        assert sender.run_once() == 3
+        # 0.15s per message against a 0.5s send budget: only the first fits the 0.6s lease
+        assert store.notification_counts() == {'sent': 1, 'pending': 2}
+        assert store.claim_notifications(10, lease=1) == []
+
+        time.sleep(0.65)
+        smtp.data_delay = 0
+        while sender.run_once():
+            pass
+        assert store.notification_counts() == {'sent': 3}
+        assert len(smtp.messages) == 3
+    finally:
+        transport.close()
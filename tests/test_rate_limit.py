@@ -0,0 +1,71 @@
+"""Token buckets shared through the memory-mapped table, and the per-IP / per-email limits"""
+
+import pytest
+from flask import Flask
+
+from rate_limit import BucketTable, RateLimiter, parse_limit
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = Flask(__name__)
+    app.config['RATE_LIMIT_FILE'] = str(tmp_path / 'ratelimit.bin')
+    limiter = RateLimiter(app)
+
+    @app.route('/book', methods=['POST'])
+    @limiter.limit('book', per_ip='3/hour', per_email='1/day')
+    def book():
+        return 'ok'
+
+    return app.test_client()
+
+
+def post(client, email, ip='203.0.113.7'):
+    return client.post('/book', data={'email': email}, environ_base={'REMOTE_ADDR': ip}).status_code
+
+
+def test_parse_limit():
+    assert parse_limit('5/minute') == (5, 5 / 60)
+    assert parse_limit('10/2hours') == (10, 10 / 7200)
+    with pytest.raises(ValueError):
+        parse_limit('often')
+
+
+def test_buckets_refill_over_time(tmp_path):
+    table = BucketTable(str(tmp_path / 'ratelimit.bin'))
+
+    assert table.take('k', 2, 1.0, now=100.0) == 0.0
+    assert table.take('k', 2, 1.0, now=100.0) == 0.0
+    assert table.take('k', 2, 1.0, now=100.0) == pytest.approx(1.0)
+    assert table.take('k', 2, 1.0, now=101.0) == 0.0
+    # Another handle on the same file, as in another worker, sees the same bucket
+    assert BucketTable(str(tmp_path / 'ratelimit.bin')).take('k', 2, 1.0, now=101.0) > 0
+
+
+def test_refund_gives_a_token_back_up_to_the_burst(tmp_path):
+    table = BucketTable(str(tmp_path / 'ratelimit.bin'))
+    table.take('k', 1, 0.001, now=100.0)
+
+    table.refund('k', 1)
+    table.refund('k', 1)
+
+    assert table.take('k', 1, 0.001, now=100.0) == 0.0
+    assert table.take('k', 1, 0.001, now=100.0) > 0
+
+
+def test_email_limit_rejection_does_not_charge_the_client_address(client):
+    assert post(client, 'flood@example.test') == 200
+    for _ in range(5):
+        assert post(client, 'flood@example.test') == 429
+
+    # The refused attempts left this address's allowance untouched
+    assert post(client, 'a@example.test') == 200
+    assert post(client, 'b@example.test') == 200
+    assert post(client, 'c@example.test') == 429
+
+
+def test_address_limit_still_applies_across_emails(client):
+    statuses = [post(client, f'guest{n}@example.test') for n in range(4)]
+
+    assert statuses == [200, 200, 200, 429]
+    assert post(client, 'guest9@example.test', ip='198.51.100.2') == 200
@@ -0,0 +1,118 @@
+"""SQLite stores: lazy opening, per-thread connections and concurrent writers"""
+
+import gc
+import os
+import threading
+
+import pytest
+
+from storage import SQLiteReservationStore, StorageError
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'reservations.db')
+
+
+def reservation(n, date='2026-11-20'):
+    return {'name': f'Guest {n}', 'email': f'guest{n}@example.test', 'phone': '+91 98765 43210',
+            'date': date, 'time': '19:00', 'guests': 2, 'special_requests': ''}
+
+
+def open_fds():
+    return len(os.listdir('/proc/self/fd'))
+
+
+def run_threads(target, count, *args):
+    threads = [threading.Thread(target=target, args=(n,) + args) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+
+def test_nothing_touches_the_disk_until_the_first_query(tmp_path):
+    path = tmp_path / 'nested' / 'reservations.db'
+    store = SQLiteReservationStore(str(path))
+    assert not path.parent.exists()
+
+    assert store.count() == 0
+    assert path.exists()
+    assert store._execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    store.close()
+
+
+def test_unwritable_path_fails_on_first_use_with_a_clear_error():
+    store = SQLiteReservationStore('/dev/null/reservations.db')
+
+    with pytest.raises(StorageError, match='/dev/null/reservations.db'):
+        store.count()
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason='needs /proc to count descriptors')
+def test_connections_are_closed_when_their_threads_exit(db_path):
+    store = SQLiteReservationStore(db_path)
+    store.count()
+    baseline = open_fds()
+
+    for _ in range(2):
+        run_threads(lambda n: store.count(), 200)
+        gc.collect()
+
+        assert len(store._connections) == 1
+        # SQLite may park a few descriptors of closed connections for reuse, but they do not pile up
+        assert open_fds() < baseline + 10
+    store.close()
+
+
+def test_each_thread_keeps_its_own_connection(db_path):
+    store = SQLiteReservationStore(db_path)
+    seen = {}
+
+    def use(n):
+        seen[n] = (store._connect(), store._connect())
+
+    run_threads(use, 2)
+
+    assert all(first is second for first, second in seen.values())
+    assert seen[0][0] is not seen[1][0]
+    store.close()
+
+
+def test_concurrent_writers_get_unique_ids(db_path):
+    # Two stores on one file stand in for two worker processes
+    stores = [SQLiteReservationStore(db_path), SQLiteReservationStore(db_path)]
+    ids = []
+    lock = threading.Lock()
+
+    def add(n):
+        row = stores[n % 2].add(reservation(n), notifications=[('guest_confirmation', f'guest{n}@example.test')])
+        with lock:
+            ids.append(row['id'])
+
+    run_threads(add, 40)
+
+    assert sorted(ids) == list(range(1, 41))
+    assert stores[0].count() == 40
+    assert stores[1].notification_counts() == {'pending': 40}
+    for store in stores:
+        store.close()
+
+
+def test_refused_admission_stores_nothing(db_path):
+    store = SQLiteReservationStore(db_path)
+    store.add(reservation(1))
+    seen = []
+
+    def admit(bookings):
+        seen.append([booking['name'] for booking in bookings])
+        return False
+
+    assert store.add(reservation(2), notifications=[('guest_confirmation', 'guest2@example.test')],
+                     admit=admit) is None
+    assert seen == [['Guest 1']]
+    assert store.count() == 1
+    assert store.notification_counts() == {}
+    # The write lock was released
+    assert store.add(reservation(3))['id'] == 2
+    store.close()
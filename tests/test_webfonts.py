@@ -0,0 +1,71 @@
+"""Icon sprite helpers: rendering from the sprite and reporting icons it lacks"""
+
+import functools
+import json
+import logging
+
+import pytest
+from flask import Flask
+
+import build_webfonts
+import webfonts
+
+
+@pytest.fixture
+def sprite_manifest(tmp_path, monkeypatch):
+    path = tmp_path / 'manifest.json'
+    path.write_text(json.dumps({'fonts': [], 'sprite': 'fonts/icons.svg',
+                                'icons': {'star': {'prefix': 'fas', 'viewBox': '0 0 576 512'}}}))
+    manifest = webfonts.WebFontManifest(str(path))
+    monkeypatch.setattr(webfonts, 'manifest', manifest)
+    with Flask(__name__).test_request_context():
+        yield manifest
+
+
+def test_icon_in_the_sprite_references_its_symbol(sprite_manifest):
+    html = webfonts.icon('star', class_='gold')
+
+    assert html.startswith('<i class="fas fa-star gold"><svg class="icon" viewBox="0 0 576 512"')
+    assert '/static/fonts/icons.svg#icon-star' in html
+
+
+def test_icon_missing_from_the_sprite_is_logged_once(sprite_manifest, caplog):
+    with caplog.at_level(logging.WARNING, logger='webfonts'):
+        assert webfonts.icon('moon') == '<i class="fas fa-moon"></i>'
+        webfonts.icon('moon')
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Icon 'moon' is not in the sprite fonts/icons.svg; rebuild with build_webfonts.py"]
+
+
+def test_without_a_sprite_icons_fall_back_silently(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(webfonts, 'manifest', webfonts.WebFontManifest(str(tmp_path / 'none.json')))
+    with Flask(__name__).test_request_context(), caplog.at_level(logging.WARNING, logger='webfonts'):
+        assert webfonts.icon('moon') == '<i class="fas fa-moon"></i>'
+    assert caplog.records == []
+
+
+def test_build_fails_when_the_sprite_lacks_a_used_icon(tmp_path, monkeypatch, capsys):
+    icons_dir = tmp_path / 'sources' / 'icons' / 'solid'
+    icons_dir.mkdir(parents=True)
+    (icons_dir / 'star.svg').write_text('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 576 512">'
+                                        '<path d="M0 0"/></svg>')
+    monkeypatch.setattr(build_webfonts, 'SOURCE_DIR', str(tmp_path / 'sources'))
+    monkeypatch.setattr(build_webfonts, 'OUTPUT_DIR', str(tmp_path / 'fonts'))
+    monkeypatch.setattr(build_webfonts, 'SPRITE_PATH', str(tmp_path / 'fonts' / 'icons.svg'))
+    monkeypatch.setattr(build_webfonts, 'MANIFEST_PATH', str(tmp_path / 'fonts' / 'manifest.json'))
+    monkeypatch.setattr(build_webfonts, 'run_jobs',
+                        functools.partial(build_webfonts.run_jobs, cache_path=str(tmp_path / 'cache.json')))
+    monkeypatch.setattr(build_webfonts, 'font_subset', None)
+    monkeypatch.setattr(build_webfonts, 'fetch_sources', lambda icons, fonts: None)
+    monkeypatch.setattr(build_webfonts, 'used_icons', lambda: {'star': 'fas', 'moon': 'fas'})
+    monkeypatch.chdir(tmp_path)
+
+    assert build_webfonts.build_webfonts(force=True, workers=1) is False
+    assert 'Icon moon is used by a template but missing from the sprite' in capsys.readouterr().out
+    # The CDN stays in place rather than a sprite with holes
+    assert json.loads((tmp_path / 'fonts' / 'manifest.json').read_text())['sprite'] is None
+
+    monkeypatch.setattr(build_webfonts, 'used_icons', lambda: {'star': 'fas'})
+    assert build_webfonts.build_webfonts(force=True, workers=1) is True
+    assert json.loads((tmp_path / 'fonts' / 'manifest.json').read_text())['sprite'] == 'fonts/icons.svg'
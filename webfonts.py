@@ -0,0 +1,89 @@
+"""
+RootStatix Cuisine - Web Fonts and Icons
+Template helpers for the self-hosted fonts and icon sprite built by build_webfonts.py
+"""
+
+import json
+import logging
+import os
+import threading
+
+from flask import url_for
+from markupsafe import Markup, escape
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(BASE_DIR, 'static', 'fonts', 'manifest.json')
+
+logger = logging.getLogger(__name__)
+
+
+class WebFontManifest:
+    """Lazily loaded view of the font/icon manifest, reloaded when the file changes"""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self._data = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+        # Icons already reported missing from the current sprite, so each is logged once
+        self.missing = set()
+
+    def data(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return {}
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    with open(self.path, encoding='utf-8') as f:
+                        self._data = json.load(f)
+                    self._mtime = mtime
+                    self.missing = set()
+        return self._data
+
+    @property
+    def fonts(self):
+        return self.data().get('fonts') or []
+
+    @property
+    def sprite(self):
+        return self.data().get('sprite')
+
+    def icon(self, name):
+        return (self.data().get('icons') or {}).get(name)
+
+
+manifest = WebFontManifest()
+
+
+def self_hosted_fonts():
+    """Font faces to declare with @font-face, or an empty list to use Google Fonts"""
+    return manifest.fonts
+
+
+def icon_sprite_url():
+    """URL of the icon sprite, or None when Font Awesome should load from the CDN"""
+    sprite = manifest.sprite
+    return url_for('static', filename=sprite) if sprite else None
+
+
+def icon(name, class_=None, title=None, prefix='fas'):
+    """Render a Font Awesome icon from the sprite, or as a Font Awesome <i> before it is built
+
+    The <i> wrapper keeps its fa-* classes either way, so existing CSS that
+    sizes and colours icons through `... i` selectors keeps applying.
+    """
+    classes = f'{prefix} fa-{name}' + (f' {class_}' if class_ else '')
+    attrs = f' class="{escape(classes)}"' + (f' title="{escape(title)}"' if title else '')
+    entry = manifest.icon(name)
+    if entry is None:
+        if manifest.sprite and name not in manifest.missing:
+            # The CDN stylesheet is not loaded alongside a sprite, so this renders empty
+            manifest.missing.add(name)
+            logger.warning('Icon %r is not in the sprite %s; rebuild with build_webfonts.py',
+                           name, manifest.sprite)
+        return Markup(f'<i{attrs}></i>')
+    href = f"{url_for('static', filename=manifest.sprite)}#icon-{name}"
+    return Markup(f'<i{attrs}><svg class="icon" viewBox="{escape(entry["viewBox"])}" aria-hidden="true">'
+                  f'<use href="{escape(href)}"></use></svg></i>')
@@ -1,4 +1,10 @@
+"""
+RootStatix Cuisine - WSGI Entry Point
+`wsgi:app` for any WSGI server; `python wsgi.py` runs the preforking server in serve.py
+"""
+
 from app import app
 
 if __name__ == "__main__":
-    app.run()
+    import serve
+    raise SystemExit(serve.main())